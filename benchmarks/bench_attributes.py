@@ -0,0 +1,59 @@
+""" =================================================================
+| bench_attributes.py -- Python/MayaMedic/benchmarks/bench_attributes.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+Per-property access vs. `MayaNode.get_many` / `set_many` on Arnold lights.
+"""
+
+import maya.cmds as cmds
+
+import nodes.node as nd
+from nodes.arnold import AiLight
+from benchmarks.common import CommandCounter, timed, report
+
+ATTRIBUTES = ("intensity", "exposure", "normalize")
+
+
+
+def per_property(lights):
+    values = [{attr: getattr(light, attr) for attr in ATTRIBUTES} for light in lights]
+    for light in lights:
+        light.intensity = 2.0
+        light.exposure  = 1.5
+        light.normalize = False
+    return values
+
+
+def bulk(lights):
+    values = AiLight.get_many(lights, ATTRIBUTES)
+    AiLight.set_many(lights, {"intensity": 2.0, "exposure": 1.5, "normalize": False})
+    return values
+
+
+def reset(lights):
+    "back to defaults so both passes write the same number of changes"
+    for light in lights:
+        light.intensity, light.exposure, light.normalize = 1.0, 0.0, True
+
+
+def run(count: int = 300):
+    cmds.file(new=True, force=True)
+    lights = [AiLight(nd.NodeNames.aiAreaLight, f"benchLight{i}") for i in range(count)]
+    
+    rows = []
+    for label, func in (("per-property", per_property), ("get_many / set_many", bulk)):
+        reset(lights)
+        with CommandCounter("getAttr", "setAttr") as counter:
+            _, seconds = timed(func, lights)
+        rows.append((label, counter.total, seconds))
+    
+    report(f"Read 3 + write 3 attributes on {count} lights", rows)
+
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,49 @@
+""" =================================================================
+| bench_create_lights.py -- Python/MayaMedic/benchmarks/bench_create_lights.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+One `AiLight(...)` per light vs. `AiLight.create_many` at 100, 1k and 10k lights.
+"""
+
+import maya.cmds as cmds
+
+import nodes.node as nd
+from nodes.arnold import AiLight
+from benchmarks.common import CommandCounter, timed, report
+
+COMMANDS = ("createNode", "move", "rotate", "setAttr", "getAttr", "connectAttr")
+
+
+
+def one_by_one(count: int):
+    return [AiLight(nd.NodeNames.aiAreaLight, f"rigLight{i}", position=(i, 10, 0), rotation=(-90, 0, 0))
+            for i in range(count)]
+
+
+def bulk(count: int):
+    return AiLight.create_many(
+        nd.NodeNames.aiAreaLight,
+        names       = [f"rigLight{i}"   for i in range(count)],
+        positions   = [(i, 10, 0)       for i in range(count)],
+        rotations   = [(-90, 0, 0)]     * count,
+    )
+
+
+def run(counts=(100, 1_000, 10_000)):
+    for count in counts:
+        rows = []
+        for label, func in (("AiLight(...) per light", one_by_one), ("AiLight.create_many", bulk)):
+            cmds.file(new=True, force=True)
+            with CommandCounter(*COMMANDS) as counter:
+                _, seconds = timed(func, count)
+            rows.append((label, counter.total, seconds))
+        report(f"Create {count} area lights", rows)
+
+
+
+if __name__ == "__main__":
+    run()
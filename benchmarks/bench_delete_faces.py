@@ -0,0 +1,52 @@
+""" =================================================================
+| bench_delete_faces.py -- Python/MayaMedic/benchmarks/bench_delete_faces.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+`Face.delete` per face vs. `Polygons.delete_faces` on a ~100k-face plane.
+"""
+
+import maya.cmds as cmds
+
+from components.polygon import Face, Polygons
+from benchmarks.common import CommandCounter, timed, report
+
+SUBDIVISIONS = (316, 317) # 100,172 faces
+
+
+
+def build_plane() -> Polygons:
+    cmds.file(new=True, force=True)
+    plane, _ = cmds.polyPlane(name="benchPlane", sx=SUBDIVISIONS[0], sy=SUBDIVISIONS[1])
+    return Polygons(plane)
+
+
+def one_by_one(plane: Polygons, indices):
+    # highest index first, otherwise every delete shifts the faces still to go
+    for index in sorted(indices, reverse=True):
+        Face(f"{plane.name}.f[{index}]").delete()
+
+
+def bulk(plane: Polygons, indices):
+    plane.delete_faces(indices)
+
+
+def run(counts=(100, 1_000, 10_000)):
+    for count in counts:
+        rows = []
+        for label, func in (("Face.delete per face", one_by_one), ("Polygons.delete_faces", bulk)):
+            plane   = build_plane()
+            indices = range(0, count * 3, 3) # every third face, nothing to merge
+            with CommandCounter("delete", "objExists") as counter:
+                _, seconds = timed(func, plane, indices)
+            rows.append((label, counter.total, seconds))
+            assert cmds.polyEvaluate(plane.name, face=True) == SUBDIVISIONS[0] * SUBDIVISIONS[1] - count
+        report(f"Delete {count} faces from a {SUBDIVISIONS[0] * SUBDIVISIONS[1]}-face plane", rows)
+
+
+
+if __name__ == "__main__":
+    run()
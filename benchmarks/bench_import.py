@@ -0,0 +1,64 @@
+""" =================================================================
+| bench_import.py -- Python/MayaMedic/benchmarks/bench_import.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+Import time of the MayaMedic entry points, each measured in a fresh
+interpreter. Run it with `mayapy` from the MayaMedic folder:
+
+    mayapy -m benchmarks.bench_import
+"""
+
+import os
+import subprocess
+import sys
+from typing import *
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = (
+    "nodes",
+    "components",
+    "utility.outline",
+    "utility.transform",
+    "interface",
+    "interface.lightmanager",
+)
+
+_SNIPPET = """
+import sys, time
+import maya.cmds                              # Maya itself is not what we measure
+start = time.perf_counter()
+import {module}
+loaded = [m for m in sys.modules if m.split('.')[0] in ('nodes', 'components', 'utility', 'interface')]
+print(time.perf_counter() - start, len(loaded))
+"""
+
+
+
+def measure(module: str, repeat: int = 5) -> Tuple[float, int]:
+    "Best import time over `repeat` fresh interpreters, and how many MayaMedic modules got loaded"
+    best, loaded = float("inf"), 0
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _SNIPPET.format(module=module)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+            env=dict(os.environ, MAYAMEDIC_MODE="prod"),
+        ).stdout.split()
+        best, loaded = min(best, float(out[0])), int(out[1])
+    return best, loaded
+
+
+def run():
+    print(f"{'import':<26}{'ms':>10}{'modules loaded':>16}")
+    for module in ENTRY_POINTS:
+        seconds, loaded = measure(module)
+        print(f"{module:<26}{seconds * 1000:>10.2f}{loaded:>16}")
+
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,49 @@
+""" =================================================================
+| bench_kelvin.py -- Python/MayaMedic/benchmarks/bench_kelvin.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+Scalar `kelvin_to_rgb` loop vs. `kelvin_to_rgb_array` (masked math and LUT).
+Does not need Maya:
+
+    python -m benchmarks.bench_kelvin
+"""
+
+import timeit
+
+import numpy as np
+
+from utility.parser import kelvin_to_rgb, kelvin_to_rgb_array, kelvin_lut, KELVIN_RANGE
+
+
+
+def check():
+    "Array results must be identical to the scalar function"
+    whole = np.arange(KELVIN_RANGE[0] - 500, KELVIN_RANGE[1] + 500)
+    scalar = np.array([kelvin_to_rgb(k) for k in whole])
+    assert np.array_equal(kelvin_to_rgb_array(whole), scalar)
+    assert np.array_equal(kelvin_to_rgb_array(whole, use_lut=True), scalar)
+
+    fractional = np.random.default_rng(0).uniform(*KELVIN_RANGE, 10_000)
+    assert np.array_equal(kelvin_to_rgb_array(fractional), np.array([kelvin_to_rgb(k) for k in fractional]))
+
+
+def run(counts=(1_000, 100_000, 1_000_000), repeat=3):
+    check()
+    kelvin_lut() # build outside of the timings
+
+    print(f"{'temperatures':>12}{'scalar loop':>14}{'array':>12}{'array + LUT':>14}")
+    for count in counts:
+        kelvin = np.random.default_rng(1).uniform(*KELVIN_RANGE, count).round()
+        scalar = min(timeit.repeat(lambda: [kelvin_to_rgb(k) for k in kelvin], number=1, repeat=repeat))
+        array  = min(timeit.repeat(lambda: kelvin_to_rgb_array(kelvin), number=1, repeat=repeat))
+        lut    = min(timeit.repeat(lambda: kelvin_to_rgb_array(kelvin, use_lut=True), number=1, repeat=repeat))
+        print(f"{count:>12}{scalar:>13.4f}s{array:>11.4f}s{lut:>13.4f}s")
+
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,94 @@
+""" =================================================================
+| bench_mascan.py -- Python/MayaMedic/benchmarks/bench_mascan.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+Throughput and memory of `utility.mascan` on synthetic `.ma` files, mostly
+mesh data like real scenes. No Maya needed:
+
+    python -m benchmarks.bench_mascan --gb 0.5 2 4
+"""
+
+import argparse
+import os
+import resource
+import tempfile
+import time
+from typing import *
+
+import utility.mascan as mascan
+
+VERTICES_PER_MESH = 20_000
+
+
+
+def write_synthetic(path: str, target_bytes: int, every: int = 10) -> Dict[str, int]:
+    '''
+    Write meshes until the file reaches `target_bytes`; every `every` meshes
+    also get an area light, a mesh light and a camera (one in two with depth of field).
+
+    Returns:
+    --------
+    - what was written: `{"meshes": ..., "lights": ..., "cameras": ..., "dof": ...}`
+    '''
+    points = "".join(f"\t\t {i * 0.01:.4f} {i * 0.02:.4f} {-i * 0.03:.4f}\n" for i in range(VERTICES_PER_MESH))
+    counts = {"meshes": 0, "lights": 0, "cameras": 0, "dof": 0}
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("//Maya ASCII 2024 scene\n//Name: synthetic.ma\n")
+        f.write('requires maya "2024";\nrequires "mtoa" "5.3.0";\ncurrentUnit -l centimeter -a degree -t film;\n')
+        f.write('select -ne :defaultLightSet;\n\tsetAttr -k on ".ihi";\n')
+        while f.tell() < target_bytes:
+            i = counts["meshes"]
+            f.write(f'createNode transform -n "prop{i}";\n\tsetAttr ".t" -type "double3" {i} 0 0 ;\n')
+            f.write(f'createNode mesh -n "propShape{i}" -p "prop{i}";\n\tsetAttr -k off ".v";\n')
+            f.write(f'\tsetAttr -s {VERTICES_PER_MESH} ".vt[0:{VERTICES_PER_MESH - 1}]"\n{points}\t\t;\n')
+            f.write('\tsetAttr ".uvst[0].uvsn" -type "string" "map1; not a statement end";\n')
+            counts["meshes"] += 1
+
+            if i % every == 0:
+                f.write(f'createNode transform -n "key{i}";\ncreateNode aiAreaLight -n "keyShape{i}" -p "key{i}";\n')
+                f.write('\tsetAttr ".intensity" 4;\n\tsetAttr ".ai_exposure" 2;\n')
+                f.write(f'createNode transform -n "glow{i}";\ncreateNode aiMeshLight -n "glowShape{i}" -p "glow{i}";\n')
+                dof = (i // every) % 2 == 0
+                f.write(f'createNode transform -n "cam{i}";\ncreateNode camera -n "camShape{i}" -p "cam{i}";\n')
+                f.write(f'\tsetAttr -k off ".v";\n\tsetAttr ".fl" 50;\n\tsetAttr ".dof" {"yes" if dof else "no"};\n')
+                counts["lights"]  += 2
+                counts["cameras"] += 1
+                counts["dof"]     += dof
+    return counts
+
+
+def run(sizes_gb: Sequence[float] = (0.5, 2.0), folder: str | None = None) -> None:
+    print(f"{'GB':>6}{'MB/s':>10}{'seconds':>10}{'max RSS MB':>12}{'lights':>9}{'cameras':>9}{'dof':>6}{'meshes':>9}  check")
+    for gb in sizes_gb:
+        with tempfile.TemporaryDirectory(dir=folder) as tmp:
+            path = os.path.join(tmp, "synthetic.ma")
+            expected = write_synthetic(path, int(gb * 2**30))
+
+            start   = time.perf_counter()
+            summary = mascan.scan(path)
+            seconds = time.perf_counter() - start
+
+            found = {
+                "meshes":   summary.meshes,
+                "lights":   sum(len(lights) for lights, _ in summary.light_sections().values()),
+                "cameras":  len(summary.cameras) ,
+                "dof":      len(summary.cameras_with_dof()),
+            }
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 # kB on Linux
+            print(f"{gb:>6.2f}{summary.bytes / 2**20 / seconds:>10.1f}{seconds:>10.2f}{rss:>12.1f}"
+                  f"{found['lights']:>9}{found['cameras']:>9}{found['dof']:>6}{found['meshes']:>9}  "
+                  f"{'ok' if found == expected else f'MISMATCH, expected {expected}'}")
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--gb", type=float, nargs="+", default=[0.5, 2.0])
+    parser.add_argument("--dir", default=None, help="where to write the synthetic scenes")
+    args = parser.parse_args()
+    run(args.gb, args.dir)
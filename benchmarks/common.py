@@ -0,0 +1,72 @@
+""" =================================================================
+| common.py -- Python/MayaMedic/benchmarks/common.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+Shared helpers for the benchmark scripts. Run them from Maya's script
+editor with the MayaMedic folder on `sys.path`.
+"""
+
+import time
+from collections import Counter
+from typing import *
+
+import maya.cmds as cmds
+
+
+
+class CommandCounter:
+    '''
+    Count calls to `maya.cmds` functions while the block is active.
+    
+    Examples:
+    ---------
+    >>> with CommandCounter("getAttr", "setAttr") as counter:
+    ...     light.intensity = 2
+    >>> counter.total
+    1
+    '''
+    def __init__(self, *commands: str) -> None:
+        self.commands = commands
+        self.counts   = Counter()
+        self._originals: Dict[str, Callable] = {}
+        
+    def __enter__(self) -> "CommandCounter":
+        for name in self.commands:
+            self._originals[name] = original = getattr(cmds, name)
+            setattr(cmds, name, self._wrap(name, original))
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        for name, original in self._originals.items():
+            setattr(cmds, name, original)
+        self._originals.clear()
+        
+    def _wrap(self, name: str, original: Callable) -> Callable:
+        def counted(*args, **kwargs):
+            self.counts[name] += 1
+            return original(*args, **kwargs)
+        return counted
+    
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+
+def timed(func: Callable, *args, **kwargs) -> Tuple[Any, float]:
+    "Run `func` once, return `(result, seconds)`"
+    start  = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def report(title: str, rows: Sequence[Tuple[str, int, float]]) -> None:
+    "Print `(label, command calls, seconds)` rows as a table"
+    print(f"\n{title}")
+    print(f"{'':<28}{'cmds calls':>12}{'seconds':>12}")
+    for label, calls, seconds in rows:
+        print(f"{label:<28}{calls:>12}{seconds:>12.4f}")
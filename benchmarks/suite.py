@@ -0,0 +1,276 @@
+""" =================================================================
+| suite.py -- Python/MayaMedic/benchmarks/suite.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+Headless benchmark suite: runs the MayaMedic hot paths on the in-memory
+`maya.cmds` from `headless`, so it needs no Maya and can run anywhere.
+Run it from the MayaMedic folder:
+
+    python -m benchmarks.suite                          # 10, 1k and 10k
+    python -m benchmarks.suite --sizes 10 1000 --latency 5e-6
+    python -m benchmarks.suite --record                 # append to the history
+    python -m benchmarks.suite --compare                # diff against the last other commit
+
+Command counts do not depend on the machine; compare timings only between
+runs made on the same one.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import *
+
+import headless
+headless.install(force=True) # before anything imports maya
+
+import maya.cmds as cmds
+import maya.utils as utils
+
+import nodes.node as nd
+import nodes.arnold as arnold
+import utility.outline as otl
+import utility.transform as transform
+import interface.lightmanager as lm
+from nodes.arnold import AiLight
+from nodes.camera import Camera
+from nodes.lightpreset import LightPreset
+from nodes.curvelibrary import CurveLibrary, Curve, FORM_PERIODIC
+from nodes.lightbake import LightBake, np
+from interface.callbacks import AttributeCallbackHub
+
+ROOT    = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY = os.path.join(ROOT, "benchmarks", "results", "history.jsonl")
+SIZES   = (10, 1_000, 10_000)
+
+
+class Scenario(NamedTuple):
+    name:   str
+    setup:  Callable[[int], Any]
+    "builds the scene for a size, returns what `run` needs; not measured"
+    run:    Callable[[Any], Any]
+
+
+class Result(NamedTuple):
+    scenario:   str
+    size:       int
+    seconds:    float
+    commands:   int
+    top:        Dict[str, int]
+    "most called commands"
+
+
+
+# =========================================================================
+# Scenarios
+# =========================================================================
+def _light_names(count: int) -> List[str]:
+    return [f"rigLight{i}" for i in range(count)]
+
+def _lights(count: int) -> List[AiLight]:
+    return AiLight.create_many(nd.NodeNames.aiAreaLight, _light_names(count))
+
+def _cameras(count: int) -> List[Camera]:
+    with contextlib.redirect_stdout(io.StringIO()): # Camera prints every creation
+        return [Camera(f"shotCam{i}") for i in range(count)]
+
+def _selected_plane(count: int) -> None:
+    plane, _ = cmds.polyPlane(name="selectionPlane", subdivisionsX=count, subdivisionsY=1)
+    cmds.select(f"{plane}.f[0:{count - 1}]")
+
+def _preset_change(count: int) -> LightPreset:
+    "A preset of `count` lights, with a third of them different from the scene"
+    lights = _lights(count)
+    preset = LightPreset.capture("day")
+    AiLight.set_many(lights[::3], {"intensity": 0.2, "color": (0.3, 0.4, 1.0)})
+    return preset
+
+def _curve_library(count: int) -> CurveLibrary:
+    "A fresh library of `count` two-curve controllers, nothing cached yet"
+    ring   = [coord for i in (0, 1, 2, 3, 0, 1, 2) for coord in ((1, 0, 0), (0, 0, 1), (-1, 0, 0), (0, 0, -1))[i % 4]]
+    curves = [Curve(3, FORM_PERIODIC, ring, list(range(-2, 7)))] * 2
+    library = CurveLibrary(tempfile.mkdtemp(prefix="curvelibrary"))
+    library.save_many((f"ctrl{i}", curves, "jasper", ["fk"]) for i in range(count))
+    return CurveLibrary(library.folder)
+
+def _light_bake(count: int) -> LightBake:
+    "Temperature, intensity and exposure of `count` lights over 100 frames"
+    bake = LightBake(1, 100)
+    for i, light in enumerate(_lights(count)):
+        bake.add(light, temperature=[(1, 1900), (50, 6500 + i % 100), (100, 1900)],
+                        intensity=lambda frames: 2 + np.sin(frames / 8), exposure=1.5)
+    return bake
+
+CAMERA_PROPERTIES = ("focalLength", "fStop", "focusDistance", "has_depthOfField")
+
+SCENARIOS: List[Scenario] = [
+    Scenario("AiLight per light",
+        setup = _light_names,
+        run   = lambda names: [AiLight(nd.NodeNames.aiAreaLight, name, position=(0, 10, 0)) for name in names],
+    ),
+    Scenario("AiLight.create_many",
+        setup = _light_names,
+        run   = lambda names: AiLight.create_many(nd.NodeNames.aiAreaLight, names, positions=[(0, 10, 0)] * len(names)),
+    ),
+    Scenario("getAllAiLights",
+        setup = _lights,
+        run   = lambda lights: AiLight.getAllAiLights(),
+    ),
+    Scenario("create_colored_group",
+        setup = lambda count: [cmds.createNode("transform", name=f"prop{i}") for i in range(count)],
+        run   = lambda objects: transform.create_colored_group("props_GRP", (0.30, 0.88, 0.71), *objects),
+    ),
+    Scenario("selected_faces",
+        setup = _selected_plane,
+        run   = lambda _: otl.selected_faces(),
+    ),
+    Scenario("selected_faces compact",
+        setup = _selected_plane,
+        run   = lambda _: otl.selected_faces(compact=True),
+    ),
+    Scenario("Camera properties",
+        setup = _cameras,
+        run   = lambda cams: [getattr(cam, prop) for cam in cams for prop in CAMERA_PROPERTIES],
+    ),
+    Scenario("Camera.get_many",
+        setup = _cameras,
+        run   = lambda cams: Camera.get_many(cams, CAMERA_PROPERTIES),
+    ),
+    Scenario("LightPreset.capture",
+        setup = _lights,
+        run   = lambda lights: LightPreset.capture("day"),
+    ),
+    Scenario("LightPreset.apply",
+        setup = _preset_change,
+        run   = lambda preset: preset.apply(),
+    ),
+    Scenario("CurveLibrary.import_many",
+        setup = _curve_library,
+        run   = lambda library: library.import_many(library.find(color="jasper", tag="fk")),
+    ),
+    Scenario("LightBake.bake",
+        setup = _light_bake,
+        run   = lambda bake: bake.bake(tolerance=1e-3),
+    ),
+    Scenario("Light manager window",
+        setup = _lights,
+        run   = lambda lights: (lm.ArnoldLightManager(page_size=20), utils.processIdleEvents()),
+    ),
+]
+
+
+
+# =========================================================================
+# Running
+# =========================================================================
+def _new_scene() -> None:
+    "Empty scene and no state left over from the previous scenario"
+    cmds.file(new=True, force=True)
+    if arnold._light_index is not None:
+        arnold._light_index.close()
+        arnold._light_index = None
+    AttributeCallbackHub._instance = None
+    lm._manager = None
+    utils.processIdleEvents()
+
+
+def measure(scenario: Scenario, size: int) -> Result:
+    _new_scene()
+    state = scenario.setup(size)
+    headless.SCENE.reset_calls()
+
+    start   = time.perf_counter()
+    scenario.run(state)
+    seconds = time.perf_counter() - start
+
+    calls = headless.SCENE.reset_calls()
+    return Result(scenario.name, size, seconds, sum(calls.values()), dict(calls.most_common(5)))
+
+
+def run(sizes: Sequence[int] = SIZES, scenarios: Sequence[Scenario] = SCENARIOS) -> List[Result]:
+    return [measure(scenario, size) for scenario in scenarios for size in sizes]
+
+
+
+# =========================================================================
+# History
+# =========================================================================
+def current_commit() -> str:
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def record(results: Sequence[Result], latency: float, path: str = HISTORY) -> Dict[str, Any]:
+    "Append one run to the history file (JSON lines)"
+    entry = {
+        "commit":   current_commit(),
+        "date":     datetime.now().isoformat(timespec="seconds"),
+        "machine":  platform.node(),
+        "python":   platform.python_version(),
+        "latency":  latency,
+        "results":  [result._asdict() for result in results],
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def load_history(path: str = HISTORY) -> List[Dict[str, Any]]:
+    if not os.path.exists(path): return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baseline(history: Sequence[Dict[str, Any]], commit: str) -> Dict[str, Any] | None:
+    "Latest recorded run of another commit"
+    return next((entry for entry in reversed(history) if entry["commit"] != commit), None)
+
+
+def report(results: Sequence[Result], previous: Dict[str, Any] | None = None) -> None:
+    before = {(r["scenario"], r["size"]): r for r in previous["results"]} if previous else {}
+    if previous: print(f"compared with {previous['commit']} ({previous['date']})")
+
+    print(f"{'scenario':<26}{'size':>8}{'ms':>12}{'commands':>12}{'ms before':>12}{'cmds before':>13}")
+    for result in results:
+        old  = before.get((result.scenario, result.size))
+        tail = f"{old['seconds'] * 1e3:>12.2f}{old['commands']:>13}" if old else ""
+        print(f"{result.scenario:<26}{result.size:>8}{result.seconds * 1e3:>12.2f}{result.commands:>12}{tail}")
+
+
+
+def main(argv: Sequence[str] | None = None) -> List[Result]:
+    parser = argparse.ArgumentParser(description="MayaMedic headless benchmarks")
+    parser.add_argument("--sizes",   type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--only",    nargs="+", default=None, help="scenario names to run")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every command call")
+    parser.add_argument("--record",  action="store_true", help=f"append the results to {os.path.relpath(HISTORY, ROOT)}")
+    parser.add_argument("--compare", action="store_true", help="show the latest run of another commit next to this one")
+    args = parser.parse_args(argv)
+
+    headless.SCENE.latency = args.latency
+    scenarios = [s for s in SCENARIOS if not args.only or s.name in args.only]
+    results   = run(args.sizes, scenarios)
+
+    history = load_history()
+    report(results, baseline(history, current_commit()) if args.compare else None)
+    if args.record: record(results, args.latency)
+    return results
+
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,35 @@
-from .polygon import *
\ No newline at end of file
+"""
+Submodules and their classes are imported on first attribute access, so
+`import components` costs nothing until a component is actually used.
+"""
+import importlib
+
+_LAZY = {
+    "BaseComponent":    "base",
+    "Face":             "polygon",
+    "Polygons":         "polygon",
+    "SmoothPlan":       "polygon",
+    "predict_smooth":   "polygon",
+    "ComponentSet":     "componentset",
+    "MeshStats":        "meshstats",
+    "MeshMetrics":      "meshstats",
+}
+"public name -> submodule defining it"
+_SUBMODULES = {"base", "polygon", "componentset", "meshstats"}
+
+for _name in _LAZY: # on reload, drop the classes cached from the previous load
+    globals().pop(_name, None)
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _LAZY:
+        value = getattr(importlib.import_module(f".{_LAZY[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES | set(_LAZY))
@@ -0,0 +1,218 @@
+""" =================================================================
+| componentset.py -- Python/MayaMedic/components/componentset.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+import re
+from array import array
+from bisect import bisect_right
+from typing import *
+
+import maya.cmds as cmds
+
+COMPONENT_KINDS = {
+    "f":    34,     # faces
+    "vtx":  31,     # vertices
+    "e":    32,     # edges
+    "map":  35,     # UVs
+}
+"component attribute -> `filterExpand` selection mask"
+
+_SPECIFIER = re.compile(r"^(?P<mesh>.+)\.(?P<kind>f|vtx|e|map)\[(?P<start>\d+)(?::(?P<stop>\d+))?\]$")
+
+
+
+class ComponentSet:
+    '''
+    Components of one kind on one mesh, stored as sorted index ranges
+    (`pCube1.f[0:99999]` is two integers, not 100000 objects).
+
+    Examples:
+    ---------
+    >>> faces = ComponentSet.from_indices("pCube1", "f", [0, 1, 2, 7])
+    >>> faces.specifiers()
+    ['pCube1.f[0:2]', 'pCube1.f[7]']
+    >>> len(faces | ComponentSet.from_indices("pCube1", "f", [3]))
+    5
+    >>> faces.delete()
+    '''
+    __slots__ = ("mesh", "kind", "_starts", "_stops")
+
+    def __init__(self, mesh: str, kind: str, ranges: Iterable[Tuple[int, int]] = ()) -> None:
+        '''
+        Params:
+        -------
+        - `mesh`:   mesh transform or shape name
+        - `kind`:   one of `COMPONENT_KINDS` (`"f"`, `"vtx"`, `"e"`, `"map"`)
+        - `ranges`: `(first, last)` inclusive index pairs, in any order, may overlap
+        '''
+        if kind not in COMPONENT_KINDS:
+            raise ValueError("Component kind must be one of {}: {}".format(list(COMPONENT_KINDS), kind))
+
+        self.mesh   = mesh
+        self.kind   = kind
+        self._starts, self._stops = _merge((first, last + 1) for first, last in ranges)
+
+    def __len__(self) -> int:
+        return sum(stop - start for start, stop in zip(self._starts, self._stops))
+
+    def __bool__(self) -> bool:
+        return len(self._starts) > 0
+
+    def __iter__(self) -> Iterator[int]:
+        for start, stop in zip(self._starts, self._stops):
+            yield from range(start, stop)
+
+    def __contains__(self, index: int) -> bool:
+        i = bisect_right(self._starts, index) - 1
+        return i >= 0 and index < self._stops[i]
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ComponentSet) and (self.mesh, self.kind, self._starts, self._stops) == \
+            (other.mesh, other.kind, other._starts, other._stops)
+
+    def __repr__(self) -> str:
+        return "ComponentSet({})".format(", ".join(self.specifiers()))
+
+    # ~~~~~~~~ set operations ~~~~~~~~
+    def __or__(self, other: "ComponentSet") -> "ComponentSet":
+        self._check_compatible(other)
+        return self._from_pairs(list(self._pairs()) + list(other._pairs()))
+
+    def __sub__(self, other: "ComponentSet") -> "ComponentSet":
+        self._check_compatible(other)
+        return self._from_pairs(_subtract(self._pairs(), list(other._pairs())))
+
+    def __and__(self, other: "ComponentSet") -> "ComponentSet":
+        self._check_compatible(other)
+        return self._from_pairs(_intersect(list(self._pairs()), list(other._pairs())))
+
+    union        = __or__
+    difference   = __sub__
+    intersection = __and__
+
+
+    # =============================
+    # functions
+    # =============================
+    def ranges(self) -> Iterator[Tuple[int, int]]:
+        "`(first, last)` inclusive pairs, sorted"
+        for start, stop in zip(self._starts, self._stops):
+            yield start, stop - 1
+
+    def specifiers(self) -> List[str]:
+        "Compact component names, one per range, e.g. `['pCube1.f[0:99]', 'pCube1.f[120]']`"
+        return [f"{self.mesh}.{self.kind}[{first}]" if first == last else f"{self.mesh}.{self.kind}[{first}:{last}]"
+                for first, last in self.ranges()]
+
+    def select(self, add: bool = False) -> None:
+        cmds.select(self.specifiers(), add=add, replace=not add)
+
+    def delete(self) -> None:
+        "Delete every component of the set with one command"
+        if self: cmds.delete(self.specifiers())
+
+
+    # =============================
+    # Constructors
+    # =============================
+    @classmethod
+    def from_indices(cls, mesh: str, kind: str, indices: Iterable[int]) -> "ComponentSet":
+        "Build from individual indices, consecutive ones are folded into ranges"
+        ranges = []
+        for index in sorted(set(indices)):
+            if ranges and index == ranges[-1][1] + 1: ranges[-1][1] = index
+            else:                                     ranges.append([index, index])
+        return cls(mesh, kind, ranges)
+
+
+    @classmethod
+    def from_specifiers(cls, specifiers: Iterable[str], kind: str | None = None) -> List["ComponentSet"]:
+        '''
+        Group compact component names (as returned by a non-flattened `cmds.ls`)
+        into one set per mesh and kind. Names of other kinds are skipped when `kind` is given.
+
+        Examples:
+        ---------
+        >>> ComponentSet.from_specifiers(["pCube1.f[0:3]", "pCube1.f[5]", "pSphere1.f[2]"])
+        [ComponentSet(pCube1.f[0:3], pCube1.f[5]), ComponentSet(pSphere1.f[2])]
+        '''
+        grouped: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        for specifier in specifiers:
+            if not (match := _SPECIFIER.match(specifier)): continue
+            if kind and match["kind"] != kind:             continue
+
+            start = int(match["start"])
+            stop  = int(match["stop"]) if match["stop"] else start
+            grouped.setdefault((match["mesh"], match["kind"]), []).append((start, stop))
+
+        return [cls(mesh, component_kind, ranges) for (mesh, component_kind), ranges in grouped.items()]
+
+
+    @classmethod
+    def from_selection(cls, kind: str) -> List["ComponentSet"]:
+        "Selected components of one kind, one set per mesh, read without flattening"
+        return cls.from_specifiers(cmds.ls(selection=True) or [], kind)
+
+
+    # =============================
+    # private
+    # =============================
+    def _pairs(self) -> Iterator[Tuple[int, int]]:
+        "`(start, stop)` half-open pairs"
+        return zip(self._starts, self._stops)
+
+    def _from_pairs(self, pairs: Iterable[Tuple[int, int]]) -> "ComponentSet":
+        "New set on the same mesh from half-open pairs"
+        result = ComponentSet.__new__(ComponentSet)
+        result.mesh, result.kind       = self.mesh, self.kind
+        result._starts, result._stops  = _merge(pairs)
+        return result
+
+    def _check_compatible(self, other: "ComponentSet") -> None:
+        if (self.mesh, self.kind) != (other.mesh, other.kind):
+            raise ValueError("Cannot combine {}.{} with {}.{}".format(self.mesh, self.kind, other.mesh, other.kind))
+
+
+
+# =============================
+# Range helpers (half-open pairs)
+# =============================
+def _merge(pairs: Iterable[Tuple[int, int]]) -> Tuple[array, array]:
+    "Sort and merge overlapping or touching pairs"
+    starts, stops = array('q'), array('q')
+    for start, stop in sorted(pairs):
+        if stops and start <= stops[-1]:
+            stops[-1] = max(stops[-1], stop)
+        else:
+            starts.append(start)
+            stops.append(stop)
+    return starts, stops
+
+
+def _subtract(pairs: Iterable[Tuple[int, int]], removed: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    "Both inputs sorted and disjoint"
+    result, j = [], 0
+    for start, stop in pairs:
+        while j < len(removed) and removed[j][1] <= start: j += 1
+
+        current, k = start, j
+        while k < len(removed) and removed[k][0] < stop:
+            if removed[k][0] > current: result.append((current, removed[k][0]))
+            current = max(current, removed[k][1])
+            k += 1
+        if current < stop: result.append((current, stop))
+    return result
+
+
+def _intersect(a: List[Tuple[int, int]], b: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    "Both inputs sorted and disjoint"
+    result, i, j = [], 0, 0
+    while i < len(a) and j < len(b):
+        start, stop = max(a[i][0], b[j][0]), min(a[i][1], b[j][1])
+        if start < stop: result.append((start, stop))
+        if a[i][1] < b[j][1]: i += 1
+        else:                 j += 1
+    return result
@@ -0,0 +1,206 @@
+""" =================================================================
+| meshstats.py -- Python/MayaMedic/components/meshstats.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+from typing import *
+
+import maya.cmds as cmds
+try:
+    import maya.api.OpenMaya as om
+except ImportError: # outside of a Maya session
+    om = None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+
+class MeshMetrics(NamedTuple):
+    "Everything `MeshStats` knows about one mesh"
+    faces:      int
+    triangles:  int
+    vertices:   int
+    area:       float
+    bbox_min:   Tuple[float, float, float]
+    bbox_max:   Tuple[float, float, float]
+    face_areas: "np.ndarray"
+
+
+
+class MeshStats:
+    '''
+    Scene-wide mesh statistics with a per-mesh cache.
+
+    Vertex and face arrays are read through `MFnMesh` and every metric is
+    computed with NumPy in one pass. Results stay cached until the mesh is
+    dirtied (or, in world space, its transform moves or it is reparented),
+    so a second report only recomputes the meshes that were edited in
+    between. Entries follow the node, not its path: renaming or reparenting
+    a mesh or one of its parents keeps them.
+
+    Examples:
+    ---------
+    >>> stats = MeshStats()
+    >>> report = stats.report()                 # every mesh in the scene
+    >>> report["|pCube1|pCubeShape1"].faces
+    6
+    >>> counts, edges = stats.histogram(bins=20)
+    >>> stats.close()
+    '''
+    def __init__(self, world_space: bool = False) -> None:
+        '''
+        Params:
+        -------
+        - `world_space`: measure after the transform is applied. Object space
+                         matches `Polygons.area` (`polyEvaluate -area`).
+        '''
+        if om is None or np is None:
+            raise ImportError("MeshStats needs maya.api.OpenMaya and numpy")
+
+        self.world_space = world_space
+        self.hits        = 0
+        self.misses      = 0
+
+        self._cache:        Dict[Tuple[int, int], MeshMetrics] = {}
+        self._callback_ids: Dict[Tuple[int, int], List[int]]   = {}
+        "both keyed by `_key`"
+
+    def __del__(self):
+        self.close()
+
+
+    # =============================
+    # functions
+    # =============================
+    def metrics(self, mesh: str) -> MeshMetrics:
+        "Metrics of one mesh shape (full path), computed on a cache miss only"
+        dag_path = om.MSelectionList().add(mesh).getDagPath(0)
+        key      = self._key(dag_path)
+        if (cached := self._cache.get(key)) is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        metrics = self._compute(dag_path)
+        self._cache[key] = metrics
+        self._watch(key, dag_path)
+        return metrics
+
+
+    def report(self, meshes: Sequence[str] | None = None) -> Dict[str, MeshMetrics]:
+        '''
+        Metrics for `meshes`, or for every non-intermediate mesh in the scene
+        (listed with a single `cmds.ls`).
+        '''
+        if meshes is None:
+            meshes = cmds.ls(type="mesh", long=True, noIntermediate=True) or []
+        return {mesh: self.metrics(mesh) for mesh in meshes}
+
+
+    def histogram(self,
+        meshes:         Sequence[str] | None  = None,
+        bins:           int                   = 10,
+        value_range:    Tuple[float, float]   = None,
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        "`np.histogram` of the face areas of `meshes` (all meshes by default)"
+        report = self.report(meshes)
+        areas  = np.concatenate([m.face_areas for m in report.values()]) if report else np.empty(0)
+        return np.histogram(areas, bins=bins, range=value_range)
+
+
+    def invalidate(self, mesh: str | None = None) -> None:
+        "Drop one mesh from the cache, or everything"
+        if mesh is None:
+            for key in list(self._cache): self._drop(key)
+            return
+        try:
+            self._drop(self._key(om.MSelectionList().add(mesh).getDagPath(0)))
+        except RuntimeError: # not in the scene, so not cached either
+            pass
+
+
+    def close(self) -> None:
+        "Remove every callback and empty the cache"
+        if om is not None and hasattr(self, "_cache"):
+            self.invalidate()
+
+
+    # =============================
+    # private
+    # =============================
+    def _compute(self, dag_path: "om.MDagPath") -> MeshMetrics:
+        mesh = om.MFnMesh(dag_path)
+        space = om.MSpace.kWorld if self.world_space else om.MSpace.kObject
+
+        points          = np.array(mesh.getPoints(space), dtype=float)[:, :3]
+        counts, indices = (np.array(a, dtype=np.int64) for a in mesh.getVertices())
+        face_areas      = face_areas_of(points, counts, indices)
+
+        return MeshMetrics(
+            faces      = len(counts),
+            triangles  = int((counts - 2).sum()),
+            vertices   = len(points),
+            area       = float(face_areas.sum()),
+            bbox_min   = tuple(points.min(axis=0)) if len(points) else (0.0, 0.0, 0.0),
+            bbox_max   = tuple(points.max(axis=0)) if len(points) else (0.0, 0.0, 0.0),
+            face_areas = face_areas,
+        )
+
+
+    def _key(self, dag_path: "om.MDagPath") -> Tuple[int, int]:
+        "The mesh node's `MObjectHandle` hash, the same however it is renamed or reparented, and in world space its instance"
+        return om.MObjectHandle(dag_path.node()).hashCode(), dag_path.instanceNumber() if self.world_space else 0
+
+
+    def _drop(self, key: Tuple[int, int]) -> None:
+        self._cache.pop(key, None)
+        if (ids := self._callback_ids.pop(key, None)):
+            om.MMessage.removeCallbacks(ids)
+
+
+    def _watch(self, key: Tuple[int, int], dag_path: "om.MDagPath") -> None:
+        "Invalidate the mesh when it gets dirty, is deleted, or (world space) moves or is reparented"
+        invalidate = lambda *args: self._drop(key)
+        node = dag_path.node()
+
+        ids = [
+            om.MNodeMessage.addNodeDirtyCallback(node, invalidate),
+            om.MNodeMessage.addNodeAboutToDeleteCallback(node, invalidate),
+        ]
+        if self.world_space: # the matrix callback follows this path, a new parent needs a new one
+            ids += [
+                om.MDagMessage.addWorldMatrixModifiedCallback(dag_path, invalidate),
+                om.MDagMessage.addParentAddedDagPathCallback(dag_path, invalidate),
+                om.MDagMessage.addParentRemovedDagPathCallback(dag_path, invalidate),
+            ]
+        self._callback_ids[key] = ids
+
+
+
+def face_areas_of(points: "np.ndarray", counts: "np.ndarray", indices: "np.ndarray") -> "np.ndarray":
+    '''
+    Area of every face: half the length of its Newell normal, the sum of
+    `cross(p[i], p[i + 1])` around the polygon, right for concave polygons too.
+
+    Params:
+    -------
+    - `points`:  (V, 3) vertex positions
+    - `counts`:  (F,) vertex count per face
+    - `indices`: (sum(counts),) vertex ids, face after face (`MFnMesh.getVertices`)
+    '''
+    if not len(counts): return np.zeros(0)
+
+    counts  = np.asarray(counts)
+    offsets = np.cumsum(counts) - counts
+    # each corner's successor around its face, the last one wrapping to the first
+    following = np.arange(1, len(indices) + 1)
+    following[offsets + counts - 1] = offsets
+
+    corners = points[indices]
+    corners = corners - np.repeat(corners[offsets], counts, axis=0) # relative to the face, keeps precision far from the origin
+    normals = np.add.reduceat(np.cross(corners, corners[following]), offsets, axis=0)
+    return 0.5 * np.linalg.norm(normals, axis=1)
@@ -5,9 +5,48 @@
 | Copyright © 2023 jacktogon. All rights reserved.
 ================================================================= """
 
+from typing import *
+
 import maya.cmds as cmds
 
+import utility.general as gen
 from .base import BaseComponent
+from .componentset import ComponentSet
+
+BYTES_PER_VERTEX        = 24
+BYTES_PER_FACE_VERTEX   = 28
+"rough mesh memory: a double3 point per vertex; id, normal and uv per face-vertex"
+
+class SmoothPlan(NamedTuple):
+    "What `Polygons.smooth_many` will do (or did) to one mesh"
+    mesh:           str
+    divisions:      int
+    faces_before:   int
+    faces_after:    int
+    vertices_after: int
+    bytes_after:    int
+
+
+
+def predict_smooth(vertices: int, edges: int, faces: int, face_vertices: int, divisions: int) -> Tuple[int, int, int]:
+    '''
+    Topology after `polySmooth` (Catmull-Clark): every n-sided face becomes
+    n quads, every edge gets a new point, every face a center point.
+    
+    Params:
+    -------
+    - `face_vertices`: sum of the vertex count of every face
+    
+    Returns:
+    --------
+    - `(vertices, faces, face_vertices)` after `divisions` levels
+    '''
+    for _ in range(divisions):
+        vertices, edges, faces, face_vertices = \
+            vertices + edges + faces, 2 * edges + face_vertices, face_vertices, 4 * face_vertices
+    return vertices, faces, face_vertices
+
+
 
 class Face(BaseComponent):
     "A polygon face"
@@ -19,6 +58,22 @@ class Face(BaseComponent):
     # =============================
     def delete(self):
         cmds.delete(self.name)
+    
+    @staticmethod
+    @gen.transaction("delete_many")
+    def delete_many(faces: Iterable["Face"]) -> None:
+        '''
+        Delete many faces with one `delete` per mesh instead of one per face,
+        all in one undo chunk.
+        Deleting face by face re-topologizes the mesh every time and shifts the
+        indices of the faces that are still waiting to be deleted.
+        
+        Examples:
+        ---------
+        >>> Face.delete_many(otl.selected_faces())
+        '''
+        for face_set in ComponentSet.from_specifiers((face.name for face in faces), "f"):
+            face_set.delete()
         
     
 class Polygons(BaseComponent):
@@ -41,6 +96,19 @@ class Polygons(BaseComponent):
         return face_areas
     
     
+    def delete_faces(self, indices: Iterable[int]) -> None:
+        '''
+        Delete faces by index with a single command. Indices are merged into
+        ranges first, so `[0, 1, 2, 7]` becomes `f[0:2]` and `f[7]`.
+        
+        Examples:
+        ---------
+        >>> Polygons("pPlane1").delete_faces(range(0, 100000, 2))
+        '''
+        ComponentSet.from_indices(self.name, "f", indices).delete()
+    
+    
+    @gen.transaction("apply_smooth")
     def apply_smooth(self, divisions: int, wipe_history=True):
         "Apply a smoothing operation (history) to the polygonal mesh."
         if divisions < 0:
@@ -51,5 +119,93 @@ class Polygons(BaseComponent):
         if wipe_history:
             cmds.delete(self.name, constructionHistory=True)
             # cmds.delete(history)
+    
+    
+    @staticmethod
+    def smooth_many(
+        meshes:         Sequence[Union["Polygons", str]],
+        face_budget:    int,
+        max_divisions:  int     = 2,
+        wipe_history:   bool    = True,
+        dry_run:        bool    = False,
+        verbose:        bool    = False,
+        undoable:       bool    = True,
+    ) -> List[SmoothPlan]:
+        '''
+        Smooth many meshes without going over a face budget.
+        
+        The result of every division level is predicted from the current
+        topology first. Levels are then handed out one at a time: every mesh
+        is offered level `n`, smallest face increase first, before any is
+        offered `n + 1`. A mesh whose next level would go over `face_budget`
+        stops there, and the meshes still cheap enough keep going, so the
+        divisions can differ by more than one between meshes. The total
+        face count of `meshes` always stays within `face_budget`.
+        All smooths (one `polySmooth` per division level) and the history
+        deletion run in a single undo chunk.
+        
+        Params:
+        -------
+        - `face_budget`:    maximum total face count of `meshes` after smoothing
+        - `max_divisions`:  no mesh gets more divisions than this
+        - `dry_run`:        only predict, nothing is changed in the scene
+        - `undoable`:       `False` turns the undo queue off while smoothing
+        
+        Returns:
+        --------
+        - One `SmoothPlan` per mesh with the predicted polycount and memory.
+        
+        Examples:
+        ---------
+        >>> plans = Polygons.smooth_many(cmds.ls(type="mesh"), face_budget=2_000_000, dry_run=True)
+        >>> sum(p.faces_after for p in plans), sum(p.bytes_after for p in plans)
+        '''
+        if max_divisions < 0:
+            raise ValueError("Divisions must be a non-negative integer.")
+        
+        names  = [mesh.name if isinstance(mesh, Polygons) else mesh for mesh in meshes]
+        counts = [cmds.polyEvaluate(name, vertex=True, edge=True, face=True, triangle=True) for name in names]
+        topology = [(c["vertex"], c["edge"], c["face"], c["triangle"] + 2 * c["face"]) for c in counts]
+        
+        divisions = [0] * len(names)
+        faces     = [topo[2] for topo in topology]
+        total     = sum(faces)
+        for level in range(1, max_divisions + 1):
+            next_faces = [predict_smooth(*topo, level)[1] for topo in topology]
+            for i in sorted(range(len(names)), key=lambda i: next_faces[i] - faces[i]):
+                if divisions[i] == level - 1 and total + next_faces[i] - faces[i] <= face_budget:
+                    total      += next_faces[i] - faces[i]
+                    faces[i]    = next_faces[i]
+                    divisions[i] = level
+        
+        plans = []
+        for name, topo, division in zip(names, topology, divisions):
+            vertices, faces_after, face_vertices = predict_smooth(*topo, division)
+            plans.append(SmoothPlan(
+                mesh            = name,
+                divisions       = division,
+                faces_before    = topo[2],
+                faces_after     = faces_after,
+                vertices_after  = vertices,
+                bytes_after     = vertices * BYTES_PER_VERTEX + face_vertices * BYTES_PER_FACE_VERTEX,
+            ))
+        
+        if verbose or dry_run:
+            print(f"{'[DRY RUN] ' if dry_run else ''}Smoothing {len(plans)} meshes: "
+                  f"{sum(p.faces_before for p in plans)} -> {sum(p.faces_after for p in plans)} faces "
+                  f"(budget {face_budget}), ~{sum(p.bytes_after for p in plans) / 2**20:.1f} MB")
+        if dry_run:
+            return plans
+        
+        by_divisions: Dict[int, List[str]] = {}
+        for plan in plans:
+            if plan.divisions: by_divisions.setdefault(plan.divisions, []).append(plan.mesh)
+        
+        with gen.transaction("smooth_many", suspend_undo=not undoable, suspend_refresh=True):
+            for division, level_meshes in by_divisions.items():
+                cmds.polySmooth(level_meshes, dv=division)
+            if wipe_history and by_divisions:
+                cmds.delete([mesh for level_meshes in by_divisions.values() for mesh in level_meshes], constructionHistory=True)
+        return plans
         
         
\ No newline at end of file
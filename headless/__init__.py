@@ -0,0 +1,59 @@
+"""
+In-memory stand-in for `maya.cmds` / `maya.utils`, so MayaMedic can run
+(and be benchmarked) on a machine without Maya.
+
+Examples:
+---------
+>>> import headless
+>>> headless.install(latency=5e-6)   # before anything imports maya
+>>> import nodes.arnold as arnold
+>>> headless.SCENE.calls.most_common(5)
+"""
+
+import importlib
+import sys
+from typing import *
+
+from headless.scene import SCENE, Scene
+
+_MODULES = ("maya", "maya.cmds", "maya.utils")
+
+
+def install(latency: float = 0.0, command_latency: Dict[str, float] | None = None, force: bool = False) -> bool:
+    '''
+    Make `import maya.cmds` resolve to the headless commands.
+
+    Params:
+    -------
+    - `latency`:            seconds added to every command call
+    - `command_latency`:    per command overrides of `latency`
+    - `force`:              replace Maya even if it can be imported
+
+    Returns:
+    --------
+    - `True` when the headless package is in place, `False` when the real Maya was kept
+    '''
+    SCENE.latency         = latency
+    SCENE.command_latency = dict(command_latency or {})
+
+    if not force and not is_installed():
+        try:
+            importlib.import_module("maya.cmds")
+            return False
+        except ImportError:
+            pass
+
+    for name in _MODULES:
+        sys.modules[name] = importlib.import_module("headless." + name)
+    return True
+
+
+def is_installed() -> bool:
+    return getattr(sys.modules.get("maya.cmds"), "__name__", "") == "headless.maya.cmds"
+
+
+def uninstall() -> None:
+    "Forget the headless modules; modules that already imported them keep their reference"
+    for name in _MODULES:
+        if sys.modules.get(name) is sys.modules.get("headless." + name):
+            del sys.modules[name]
@@ -0,0 +1,5 @@
+"""
+Headless stand-in for the `maya` package: `maya.cmds` and `maya.utils`
+only. `maya.api` is missing on purpose, so MayaMedic takes its
+`cmds`-only code paths.
+"""
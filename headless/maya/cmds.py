@@ -0,0 +1,646 @@
+""" =================================================================
+| cmds.py -- Python/MayaMedic/headless/maya/cmds.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+The `maya.cmds` commands MayaMedic uses, implemented over
+`headless.scene.SCENE`. Flags and return values follow Maya; commands
+that are not implemented do not exist (`hasattr(cmds, name)` is `False`).
+"""
+
+import fnmatch
+import functools
+import os
+import re
+from typing import *
+
+from headless.scene import SCENE, SHAPE_TYPES, Control
+
+
+class _Command:
+    "A command: counts its calls, applies the configured latency. Like Maya's builtins, it does not bind as a method"
+    def __init__(self, func: Callable) -> None:
+        functools.update_wrapper(self, func)
+        self.__name__ = func.__name__.rstrip("_")
+
+    def __call__(self, *args, **kwargs):
+        SCENE.wait(self.__name__)
+        return self.__wrapped__(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<headless command {self.__name__}>"
+
+
+def _names(args: Sequence[Any]) -> List[str]:
+    "Positional object arguments, lists flattened"
+    names = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)): names.extend(arg)
+        elif arg is not None:              names.append(arg)
+    return names
+
+
+def _flag(kwargs: Dict[str, Any], *names: str, default: Any = None) -> Any:
+    "Value of a flag given by its long or short name"
+    for name in names:
+        if name in kwargs: return kwargs[name]
+    return default
+
+
+
+# =========================================================================
+# Scene
+# =========================================================================
+@_Command
+def file(path: str | None = None, new=False, open=False, save=False, rename=None, force=False,
+         query=False, sceneName=False, **kwargs):
+    "`-new`, `-open` (an empty scene named after the file), `-rename`, `-save` (nothing is written) and `-q -sceneName`"
+    if query and sceneName: return SCENE.scene_name
+    if new:
+        SCENE.new()
+        return "untitled"
+    if open:
+        if not os.path.exists(path):
+            raise RuntimeError("file: Cannot open file: {}".format(path))
+        SCENE.new()
+        SCENE.scene_name = os.path.abspath(path)
+        return SCENE.scene_name
+    if rename is not None:
+        SCENE.scene_name = os.path.abspath(rename)
+        return SCENE.scene_name
+    if save:
+        if not SCENE.scene_name:
+            raise RuntimeError("file: Scene has no name, rename it before saving")
+        SCENE.saves += 1
+        return SCENE.scene_name
+    raise RuntimeError("file: only -new, -open, -rename, -save and -query -sceneName are available headless")
+
+
+@_Command
+def loadPlugin(*args, quiet=False, **kwargs) -> List[str]:
+    return [os.path.splitext(os.path.basename(name))[0] for name in _names(args)]
+
+
+@_Command
+def pluginInfo(name: str, query=False, loaded=False, **kwargs) -> bool:
+    return True
+
+
+@_Command
+def undoInfo(openChunk=False, closeChunk=False, chunkName=None, state=None, stateWithoutFlush=None, query=False, **kwargs):
+    if query: return SCENE.undo_enabled
+    if openChunk:  SCENE.undo_chunks += 1
+    if closeChunk: SCENE.undo_chunks = max(0, SCENE.undo_chunks - 1)
+    for value in (state, stateWithoutFlush):
+        if value is not None: SCENE.undo_enabled = bool(value)
+
+
+@_Command
+def refresh(suspend=None, force=False, currentView=False, **kwargs):
+    if suspend is not None: SCENE.refresh_suspended = bool(suspend)
+
+
+@_Command
+def currentUnit(query=False, linear=None, angle=None, time=None, **kwargs):
+    flags = {"linear": linear, "angle": angle, "time": time}
+    if query:
+        return SCENE.units[next((flag for flag, value in flags.items() if value), "linear")]
+    for flag, value in flags.items():
+        if value: SCENE.units[flag] = value
+
+
+@_Command
+def help(command: str, **kwargs) -> str:
+    return f"Synopsis: {command} [flags] (headless)"
+
+
+@_Command
+def scriptJob(**kwargs):
+    if "exists" in kwargs: return kwargs["exists"] in SCENE.script_jobs
+    if "kill" in kwargs:
+        SCENE.script_jobs.pop(kwargs["kill"], None)
+        return None
+    if kwargs.get("listJobs"): return [f"{i}: {job}" for i, job in SCENE.script_jobs.items()]
+    job_id = max(SCENE.script_jobs, default=0) + 1
+    SCENE.script_jobs[job_id] = kwargs
+    return job_id
+
+
+
+# =========================================================================
+# Nodes
+# =========================================================================
+@_Command
+def createNode(node_type: str, name: str | None = None, parent: str | None = None, skipSelect=False, **kwargs) -> str:
+    name   = _flag(kwargs, "n", default=name)
+    parent = _flag(kwargs, "p", default=parent)
+    parent_node = SCENE.node(parent) if parent else None
+    if node_type in SHAPE_TYPES and parent_node is None: # shapes always live under a transform
+        parent_node = SCENE.create(node_type + "#", "transform")
+        name = name or parent_node.name.replace(node_type, node_type + "Shape")
+    return SCENE.create(name, node_type, parent_node).name
+
+
+@_Command
+def objExists(name: str) -> bool:
+    if name in SCENE.nodes or name.rsplit("|", 1)[-1] in SCENE.nodes:
+        return True
+    if SCENE.component(name) is not None:
+        return True
+    if "." in name:
+        try:                return SCENE.plug(name) is not None
+        except ValueError:  return False
+    return any(fnmatch.fnmatchcase(node, name) for node in SCENE.nodes) if any(c in name for c in "*?[") else False
+
+
+@_Command
+def objectType(name: str, isType: str | None = None, **kwargs):
+    node_type = SCENE.node(name).type
+    return node_type == isType if isType is not None else node_type
+
+
+@_Command
+def nodeType(name: str, **kwargs) -> str:
+    return SCENE.node(name).type
+
+
+@_Command
+def ls(*args, type=None, showType=False, selection=False, long=False, dag=False, flatten=False,
+       transforms=False, shapes=False, **kwargs) -> List[str]:
+    selection = _flag(kwargs, "sl", default=selection)
+    long      = _flag(kwargs, "l",  default=long)
+    flatten   = _flag(kwargs, "fl", default=flatten)
+
+    if selection:
+        items = [item for spec in SCENE.selection for item in (SCENE.flatten(spec) if flatten else [spec])]
+        return items
+
+    patterns = _names(args)
+    types    = [type] if isinstance(type, str) else list(type or [])
+    result   = []
+    listed   = SCENE.nodes.values()
+    if dag: # DAG order, parents before their children
+        listed = [n for root in listed if root.is_dag and root.parent is None for n in root.walk()]
+    for node in list(listed):
+        if types      and node.type not in types:           continue
+        if dag        and not node.is_dag:                  continue
+        if transforms and node.type != "transform":         continue
+        if shapes     and node.type not in SHAPE_TYPES:     continue
+        if patterns   and not any(fnmatch.fnmatchcase(node.name, p.rsplit("|", 1)[-1]) for p in patterns): continue
+        result.append(node.path() if long else node.name)
+        if showType: result.append(node.type)
+
+    if patterns: # components are listed as given
+        result.extend(item for p in patterns if SCENE.component(p) is not None
+                      for item in (SCENE.flatten(p) if flatten else [p]))
+    return result
+
+
+@_Command
+def listRelatives(*args, parent=False, children=False, shapes=False, allDescendents=False,
+                  fullPath=False, type=None, **kwargs) -> List[str] | None:
+    parent = _flag(kwargs, "p", default=parent)
+    found  = []
+    for name in _names(args):
+        node = SCENE.node(name)
+        if parent:
+            related = [node.parent] if node.parent is not None else []
+        elif allDescendents:
+            related = list(node.walk())[1:]
+        else:
+            related = list(node.children)
+        if shapes: related = [n for n in related if n.type in SHAPE_TYPES]
+        if type:   related = [n for n in related if n.type == type]
+        found.extend(n.path() if fullPath else n.name for n in related)
+    return found or None
+
+
+@_Command
+def delete(*args, constructionHistory=False, **kwargs) -> None:
+    if _flag(kwargs, "ch", default=constructionHistory): return
+    by_mesh: Dict[str, Set[int]] = {}
+    nodes = {}
+    for name in _names(args):
+        component = SCENE.component(name)
+        if component is not None:
+            mesh, kind, start, stop = component
+            if kind == "f": by_mesh.setdefault(mesh.name, set()).update(range(start, stop + 1))
+        elif name.rsplit("|", 1)[-1] in SCENE.nodes:
+            node = SCENE.node(name)
+            nodes[node.name] = node
+        else:
+            raise ValueError("No object matches name: {}".format(name))
+    if nodes: SCENE.delete(*nodes.values())
+
+    for mesh_name, faces in by_mesh.items():
+        topology = SCENE.nodes[mesh_name].topology
+        sides = topology["faceVertex"] // max(topology["face"], 1)
+        topology["face"]       -= len(faces)
+        topology["faceVertex"] -= len(faces) * sides
+        SCENE.selection = [s for s in SCENE.selection if s.split(".", 1)[0] not in (mesh_name, SCENE.nodes[mesh_name].parent.name)]
+
+
+@_Command
+def select(*args, add=False, replace=True, clear=False, deselect=False, **kwargs) -> None:
+    if clear or _flag(kwargs, "cl", default=False):
+        SCENE.selection = []
+        return
+    items = _names(args)
+    for item in items:
+        if not objExists.__wrapped__(item): raise ValueError("No object matches name: {}".format(item))
+    if deselect:
+        SCENE.selection = [s for s in SCENE.selection if s not in items]
+    elif add:
+        SCENE.selection.extend(i for i in items if i not in SCENE.selection)
+    else:
+        SCENE.selection = list(dict.fromkeys(items))
+
+
+@_Command
+def filterExpand(*args, selectionMask=None, expand=True, **kwargs) -> List[str] | None:
+    mask  = _flag(kwargs, "sm", default=selectionMask)
+    masks = set(mask) if isinstance(mask, (list, tuple)) else {mask}
+    kinds = {31: "vtx", 32: "e", 34: "f", 35: "map"}
+    found = []
+    for name in _names(args):
+        component = SCENE.component(name)
+        if component is not None:
+            if any(kinds.get(m) == component[1] for m in masks):
+                found.extend(SCENE.flatten(name) if expand else [name])
+        elif 12 in masks and name.rsplit("|", 1)[-1] in SCENE.nodes:
+            node = SCENE.node(name)
+            if any(child.type == "mesh" for child in node.walk()): found.append(name)
+    return found or None
+
+
+
+# =========================================================================
+# Attributes
+# =========================================================================
+@_Command
+def getAttr(path: str, multiIndices=False, **kwargs) -> Any:
+    value = SCENE.get(path)
+    if multiIndices or _flag(kwargs, "mi", default=False):
+        return value or None
+    return value
+
+
+_KEYS = re.compile(r"^(?P<curve>[^.]+)\.(?:ktv|keyTimeValue)\[(?P<first>\d+)(?::\d+)?\]$")
+
+@_Command
+def setAttr(path: str, *values, type=None, **kwargs) -> None:
+    if not values:
+        raise RuntimeError("setAttr: no value given for {}".format(path))
+    if (keys := _KEYS.match(path)):
+        return SCENE.set_keys(SCENE.node(keys["curve"]), int(keys["first"]), values)
+    SCENE.set(path, values)
+
+
+@_Command
+def connectAttr(source: str, destination: str, nextAvailable=False, force=False, **kwargs) -> None:
+    SCENE.connect(source, destination, _flag(kwargs, "na", default=nextAvailable), _flag(kwargs, "f", default=force))
+
+
+@_Command
+def listConnections(*args, source=True, destination=True, type=None, plugs=False, **kwargs) -> List[str] | None:
+    "Only incoming connections (`-source`) are known here; `type` matches derived types (`animCurve`)"
+    source = _flag(kwargs, "s", default=source)
+    found  = []
+    for name in _names(args):
+        if not source: continue
+        if "." in name: sources = [SCENE.source(name)]
+        else:           sources = [src for dst, src in SCENE.connections.items() if dst.split(".", 1)[0] == SCENE.node(name).name]
+        for plug in filter(None, sources):
+            node = SCENE.node(plug.split(".", 1)[0])
+            if type is None or node.type.startswith(type):
+                found.append(plug if plugs else node.name)
+    return found or None
+
+
+@_Command
+def disconnectAttr(source: str, destination: str, **kwargs) -> None:
+    if SCENE.connections.get(destination) != source:
+        raise RuntimeError("disconnectAttr: '{}' is not connected to '{}'".format(source, destination))
+    del SCENE.connections[destination]
+    node, attr, index, _ = SCENE.plug(destination)
+    if isinstance(node.attrs[attr], dict): node.attrs[attr].pop(index, None)
+
+
+
+# =========================================================================
+# Transforms
+# =========================================================================
+@_Command
+def group(*args, empty=False, name=None, world=False, parent=None, **kwargs) -> str:
+    name  = _flag(kwargs, "n", default=name)
+    group = SCENE.create(name or "group#", "transform", SCENE.node(parent) if parent else None)
+    for child in _names(args):
+        SCENE.reparent(SCENE.node(child), group)
+    return group.name
+
+
+@_Command
+def parent(*args, world=False, add=False, shape=False, relative=False, absolute=False, **kwargs) -> List[str]:
+    names = _names(args)
+    if world or _flag(kwargs, "w", default=False):
+        new_parent, children = None, names
+    else:
+        new_parent, children = SCENE.node(names[-1]), names[:-1]
+    for child in children:
+        SCENE.reparent(SCENE.node(child), new_parent)
+    return [SCENE.node(child).name for child in children]
+
+
+def _transform_edit(attr: str, args: Sequence[Any]) -> None:
+    values, objects = args[:3], _names(args[3:]) or list(SCENE.selection)
+    for name in objects:
+        node = SCENE.node(name)
+        if node.type in SHAPE_TYPES: node = node.parent
+        node.attrs[attr] = tuple(float(v) for v in values)
+
+@_Command
+def move(*args, **kwargs) -> None:
+    _transform_edit("translate", args)
+
+@_Command
+def rotate(*args, **kwargs) -> None:
+    _transform_edit("rotate", args)
+
+@_Command
+def scale(*args, **kwargs) -> None:
+    _transform_edit("scale", args)
+
+
+@_Command
+def xform(name: str, query=False, worldSpace=False, translation=False, rotation=False, scale=False, **kwargs):
+    node = SCENE.node(name)
+    if not query:
+        for attr, value in (("translate", translation), ("rotate", rotation), ("scale", scale)):
+            if value: node.attrs[attr] = tuple(float(v) for v in value)
+        return None
+
+    attr  = "translate" if translation else "rotate" if rotation else "scale"
+    value = list(node.attrs[attr])
+    if worldSpace and attr == "translate":
+        parent = node.parent
+        while parent is not None:
+            value = [a + b for a, b in zip(value, parent.attrs.get("translate", (0.0, 0.0, 0.0)))]
+            parent = parent.parent
+    return value
+
+
+@_Command
+def hide(*args, **kwargs) -> None:
+    for name in _names(args) or list(SCENE.selection):
+        SCENE.node(name).attrs["visibility"] = False
+
+
+@_Command
+def makeIdentity(*args, apply=False, translate=False, rotate=False, scale=False, **kwargs) -> None:
+    for name in _names(args):
+        attrs = SCENE.node(name).attrs
+        if translate: attrs["translate"] = (0.0, 0.0, 0.0)
+        if rotate:    attrs["rotate"]    = (0.0, 0.0, 0.0)
+        if scale:     attrs["scale"]     = (1.0, 1.0, 1.0)
+
+
+@_Command
+def camera(name=None, orthographic=False, **kwargs) -> List[str]:
+    transform = SCENE.create(name or "camera#", "transform")
+    shape     = SCENE.create(transform.name + "Shape", "camera", transform)
+    shape.attrs["orthographic"] = bool(orthographic)
+    return [transform.name, shape.name]
+
+
+
+# =========================================================================
+# Polygons
+# =========================================================================
+def _mesh(name: str, faces: int, vertices: int, edges: int, face_vertices: int) -> List[str]:
+    transform = SCENE.create(name, "transform")
+    mesh      = SCENE.create(transform.name + "Shape", "mesh", transform)
+    mesh.topology = {"vertex": vertices, "edge": edges, "face": faces, "faceVertex": face_vertices}
+    return [transform.name, mesh.name]
+
+@_Command
+def polyPlane(name=None, subdivisionsX=10, subdivisionsY=10, constructionHistory=True, **kwargs) -> List[str]:
+    x = _flag(kwargs, "sx", default=subdivisionsX)
+    y = _flag(kwargs, "sy", default=subdivisionsY)
+    return _mesh(name or "pPlane#", x * y, (x + 1) * (y + 1), x * (y + 1) + y * (x + 1), 4 * x * y)
+
+@_Command
+def polyCube(name=None, constructionHistory=True, **kwargs) -> List[str]:
+    return _mesh(name or "pCube#", 6, 8, 12, 24)
+
+
+@_Command
+def polyEvaluate(*args, vertex=False, edge=False, face=False, triangle=False, area=False, **kwargs):
+    name = _names(args)[0] if args else SCENE.selection[0]
+    component = SCENE.component(name)
+    mesh = component[0] if component else SCENE.shape_of(SCENE.node(name))
+    if mesh.topology is None:
+        raise RuntimeError("polyEvaluate: {} is not a polygon mesh".format(name))
+    topology = mesh.topology
+
+    values = {
+        "vertex":   topology["vertex"],
+        "edge":     topology["edge"],
+        "face":     topology["face"],
+        "triangle": topology["faceVertex"] - 2 * topology["face"],
+        "area":     float(component[3] - component[2] + 1 if component else topology["face"]),
+    }
+    asked = [flag for flag, on in (("vertex", vertex), ("edge", edge), ("face", face), ("triangle", triangle), ("area", area)) if on]
+    if len(asked) == 1: return values[asked[0]]
+    return {flag: values[flag] for flag in (asked or values)}
+
+
+@_Command
+def polySmooth(*args, divisions=1, **kwargs) -> List[str]:
+    divisions = _flag(kwargs, "dv", default=divisions)
+    history = []
+    for name in _names(args):
+        topology = SCENE.shape_of(SCENE.node(name)).topology
+        for _ in range(divisions):
+            v, e, f, fv = topology["vertex"], topology["edge"], topology["face"], topology["faceVertex"]
+            topology.update(vertex=v + e + f, edge=2 * e + fv, face=fv, faceVertex=4 * fv)
+        history.append(SCENE.create("polySmoothFace#", "polySmoothFace").name)
+    return history
+
+
+
+# =========================================================================
+# Curves
+# =========================================================================
+@_Command
+def curve(name=None, degree=3, point=(), knot=(), periodic=False, **kwargs) -> str:
+    degree, point = _flag(kwargs, "d", default=degree), _flag(kwargs, "p", default=point)
+    knot,   periodic = _flag(kwargs, "k", default=knot), _flag(kwargs, "per", default=periodic)
+    if len(point) <= degree:
+        raise RuntimeError("curve: a degree {} curve needs at least {} points".format(degree, degree + 1))
+    if knot and len(knot) != len(point) + degree - 1:
+        raise RuntimeError("curve: expected {} knots, got {}".format(len(point) + degree - 1, len(knot)))
+    transform = SCENE.create(_flag(kwargs, "n", default=name) or "curve#", "transform")
+    shape     = SCENE.create(transform.name + "Shape", "nurbsCurve", transform)
+    shape.attrs.update(degree=degree, spans=len(point) - degree, form=2 if periodic else 0)
+    return transform.name
+
+
+
+# =========================================================================
+# Animation
+# =========================================================================
+def _curve_of(name: str, attribute: str | None = None):
+    "The anim curve node itself, or the one driving `name.attribute`"
+    plug = f"{name}.{attribute}" if attribute else name
+    if "." not in plug: return SCENE.node(plug)
+    source = SCENE.source(plug)
+    return SCENE.node(source.split(".", 1)[0]) if source else None
+
+
+@_Command
+def setKeyframe(*args, attribute=None, time=None, value=None, **kwargs) -> int:
+    "One key per plug; the anim curve is created and connected on the first key"
+    attribute, time = _flag(kwargs, "at", default=attribute), _flag(kwargs, "t", default=time)
+    value = _flag(kwargs, "v", default=value)
+    for name in _names(args):
+        plug  = f"{name}.{attribute}" if attribute else name
+        curve = _curve_of(plug)
+        if curve is None:
+            curve = SCENE.create(plug.replace(".", "_"), "animCurveTU")
+            SCENE.connect(curve.name + ".output", plug)
+        SCENE.set_key(curve, time if time is not None else 1.0, value if value is not None else SCENE.get(plug))
+    return len(_names(args))
+
+
+@_Command
+def keyframe(*args, attribute=None, query=False, keyframeCount=False, valueChange=False, timeChange=False, **kwargs):
+    "`-q` with `-keyframeCount`, `-valueChange` or `-timeChange`, keys of all the curves given in a row"
+    keys = [key for name in _names(args) if (curve := _curve_of(name, attribute)) for key in SCENE.keys(curve)]
+    if keyframeCount: return len(keys)
+    if valueChange:   return [value for _, value in keys]
+    if timeChange:    return [time for time, _ in keys]
+    return len(keys)
+
+
+@_Command
+def keyTangent(*args, inTangentType=None, outTangentType=None, **kwargs) -> None:
+    for name in _names(args):
+        if SCENE.node(name).type != "animCurveTU":
+            raise RuntimeError("keyTangent: {} is not an anim curve".format(name))
+
+
+
+# =========================================================================
+# UI
+# =========================================================================
+_UI_DEFAULTS = {
+    "width": 100, "height": 20, "enable": True, "manage": True, "visible": True,
+    "collapse": False, "label": "", "annotation": "", "value": False,
+    "backgroundColor": (0.27, 0.27, 0.27), "font": "plainLabelFont",
+}
+
+def _ui_command(kind: str, is_layout: bool) -> Callable:
+    def ui(name: str | None = None, exists=False, query=False, edit=False, **flags):
+        if exists:
+            return SCENE.control(name) is not None if name else False
+
+        if query or edit:
+            control = SCENE.control(name or "")
+            if control is None:
+                raise RuntimeError("{}: Object '{}' not found.".format(kind, name))
+            if edit:
+                control.flags.update(flags)
+                return None
+            flag = next(iter(flags))
+            if flag == "childArray":       return [child.name for child in control.children] or None
+            if flag == "numberOfChildren": return len(control.children)
+            if flag == "fullPathName":     return control.path()
+            return control.flags.get(flag, _UI_DEFAULTS.get(flag))
+
+        parent_name = flags.pop("parent", None) or flags.pop("p", None)
+        parent = SCENE.control(parent_name) if parent_name else SCENE.current_parent
+        if parent is None:
+            raise RuntimeError("{}: Controls must have a layout. No layout found.".format(kind))
+        control = Control(SCENE.unique_name(name, kind, SCENE.controls), kind, parent, flags, is_layout)
+        SCENE.controls[control.name] = control
+        parent.children.append(control)
+        if is_layout: SCENE.current_parent = control
+        return control.path()
+
+    ui.__name__ = kind
+    return _Command(ui)
+
+
+for _kind in ("columnLayout", "rowLayout", "scrollLayout", "frameLayout", "formLayout", "paneLayout", "gridLayout", "tabLayout"):
+    globals()[_kind] = _ui_command(_kind, is_layout=True)
+for _kind in ("text", "button", "checkBox", "canvas", "attrColorSliderGrp", "attrFieldSliderGrp",
+              "floatSliderGrp", "intSliderGrp", "textField", "separator", "iconTextButton", "optionMenu", "menuItem"):
+    globals()[_kind] = _ui_command(_kind, is_layout=False)
+del _kind
+
+_control = _ui_command("control", is_layout=False)
+_layout  = _ui_command("layout",  is_layout=True)
+
+@_Command
+def control(name: str, **flags):
+    if not flags.get("exists") and not SCENE.control(name):
+        raise RuntimeError("control: Object '{}' not found.".format(name))
+    return _control.__wrapped__(name, **flags)
+
+@_Command
+def layout(name: str, **flags):
+    return _layout.__wrapped__(name, **flags)
+
+
+@_Command
+def window(name: str | None = None, exists=False, query=False, edit=False, **flags):
+    if exists: return SCENE.control(name) is not None if name else False
+    if query or edit:
+        control = SCENE.control(name)
+        if control is None:
+            raise RuntimeError("window: Object '{}' not found.".format(name))
+        if edit:
+            control.flags.update(flags)
+            return None
+        return control.flags.get(next(iter(flags)), _UI_DEFAULTS.get(next(iter(flags))))
+
+    if name and SCENE.control(name):
+        raise RuntimeError("window: Object's name '{}' is not unique.".format(name))
+    control = Control(SCENE.unique_name(name, "window", SCENE.controls), "window", None, flags, True)
+    SCENE.controls[control.name] = control
+    SCENE.current_parent = control
+    return control.name
+
+
+@_Command
+def showWindow(name: str | None = None) -> None:
+    control = SCENE.control(name) if name else None
+    if control is not None: control.flags["visible"] = True
+
+
+@_Command
+def deleteUI(*args, window=False, control=False, layout=False, **kwargs) -> None:
+    for name in _names(args):
+        found = SCENE.control(name)
+        if found is None:
+            raise RuntimeError("deleteUI: Object '{}' not found.".format(name))
+        SCENE.delete_control(found)
+
+
+@_Command
+def setParent(name: str | None = None, query=False, upLevel=False, **kwargs):
+    if query:
+        return SCENE.current_parent.path() if SCENE.current_parent else "NONE"
+    if name == ".." or upLevel:
+        current = SCENE.current_parent
+        if current is not None and current.parent is not None:
+            SCENE.current_parent = current.parent
+    else:
+        control = SCENE.control(name)
+        if control is None:
+            raise RuntimeError("setParent: Object '{}' not found.".format(name))
+        SCENE.current_parent = control
+    return SCENE.current_parent.path()
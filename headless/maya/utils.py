@@ -0,0 +1,34 @@
+""" =================================================================
+| utils.py -- Python/MayaMedic/headless/maya/utils.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+`maya.utils` without an event loop: deferred calls wait in a queue until
+`processIdleEvents()` runs them.
+"""
+
+from collections import deque
+from typing import *
+
+_deferred: Deque[Tuple[Callable, tuple, dict]] = deque()
+
+
+def executeDeferred(func: Callable, *args, **kwargs) -> None:
+    _deferred.append((func, args, kwargs))
+
+
+def executeInMainThreadWithResult(func: Callable, *args, **kwargs) -> Any:
+    return func(*args, **kwargs)
+
+
+def processIdleEvents() -> int:
+    "Run everything deferred so far, including what those calls defer. Returns how many ran"
+    ran = 0
+    while _deferred:
+        func, args, kwargs = _deferred.popleft()
+        func(*args, **kwargs)
+        ran += 1
+    return ran
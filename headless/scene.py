@@ -0,0 +1,373 @@
+""" =================================================================
+| scene.py -- Python/MayaMedic/headless/scene.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+The in-memory scene behind the headless `maya.cmds`: DAG and DG nodes,
+attributes, connections, selection, UI controls and a call counter.
+
+Simplifications, on purpose:
+- node names are unique scene-wide, so short names are always enough
+- world space transforms only add up the parents' translations
+- mesh topology is counts only (vertices, edges, faces, face-vertices)
+- anim curves store their keys but are never evaluated
+"""
+
+import re
+import time
+from collections import Counter
+from typing import *
+
+COMPONENT = re.compile(r"^(?P<node>[^.\[\]]+)\.(?P<kind>f|vtx|e|map)\[(?P<start>\d+)(?::(?P<stop>\d+))?\]$")
+"`pPlane1.f[3]` / `pPlane1.f[0:9]`"
+CHILD_SUFFIXES = {"X": 0, "Y": 1, "Z": 2, "R": 0, "G": 1, "B": 2}
+"`translateX` -> `translate[0]`, `colorR` -> `color[0]`"
+
+_DAG = {"visibility": True, "instObjGroups": {}, "overrideEnabled": False, "overrideRGBColors": False, "overrideColorRGB": (0.0, 0.0, 0.0)}
+_LIGHT = dict(_DAG,
+    color=(1.0, 1.0, 1.0), intensity=1.0, exposure=0.0, normalize=True,
+    aiUseColorTemperature=False, aiColorTemperature=6500.0, aiSamples=1,
+)
+NODE_TYPES: Dict[str, Dict[str, Any]] = {
+    "transform": dict(_DAG,
+        translate=(0.0, 0.0, 0.0), rotate=(0.0, 0.0, 0.0), scale=(1.0, 1.0, 1.0),
+        useOutlinerColor=False, outlinerColor=(0.0, 0.0, 0.0),
+    ),
+    "mesh":                 dict(_DAG),
+    "nurbsCurve":           dict(_DAG, degree=3, spans=1, form=0),
+    "camera": dict(_DAG,
+        focalLength=35.0, depthOfField=False, focusDistance=5.0, fStop=5.6,
+        orthographic=False, orthographicWidth=30.0,
+    ),
+    "aiAreaLight":          dict(_LIGHT),
+    "aiMeshLight":          dict(_LIGHT),
+    "aiPhotometricLight":   dict(_LIGHT),
+    "aiSkyDomeLight":       dict(_LIGHT),
+    "pointLight":           dict(_LIGHT),
+    "directionalLight":     dict(_LIGHT),
+    "objectSet":            {"dagSetMembers": {}},
+    "renderGlobals":        {"currentRenderer": "mayaSoftware"},
+    "polySmoothFace":       {"divisions": 1},
+    "animCurveTU":          {"keyTimeValue": {}, "output": 0.0},
+}
+"node type -> attribute defaults; `{}` marks a multi attribute"
+SHAPE_TYPES = {name for name in NODE_TYPES if name not in ("transform", "objectSet", "renderGlobals", "polySmoothFace", "animCurveTU")}
+DAG_TYPES   = SHAPE_TYPES | {"transform", "joint"}
+NODE_TYPES["joint"] = NODE_TYPES["transform"]
+
+
+
+class Node:
+    __slots__ = ("name", "type", "parent", "children", "attrs", "topology")
+
+    def __init__(self, name: str, node_type: str, parent: "Node | None" = None) -> None:
+        self.name       = name
+        self.type       = node_type
+        self.parent     = parent
+        self.children:  List[Node] = []
+        self.attrs      = {attr: (dict(value) if isinstance(value, dict) else value)
+                           for attr, value in NODE_TYPES.get(node_type, {}).items()}
+        self.topology:  Dict[str, int] | None = None
+        "mesh counts: vertex, edge, face, faceVertex"
+
+    @property
+    def is_dag(self) -> bool:
+        return self.type in DAG_TYPES
+
+    def path(self) -> str:
+        if not self.is_dag: return self.name
+        parts, node = [], self
+        while node is not None:
+            parts.append(node.name)
+            node = node.parent
+        return "|" + "|".join(reversed(parts))
+
+    def walk(self) -> Iterator["Node"]:
+        "Depth first, self included"
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+
+
+class Control:
+    __slots__ = ("name", "kind", "parent", "children", "flags", "is_layout")
+
+    def __init__(self, name: str, kind: str, parent: "Control | None", flags: Dict[str, Any], is_layout: bool) -> None:
+        self.name       = name
+        self.kind       = kind
+        self.parent     = parent
+        self.children:  List[Control] = []
+        self.flags      = flags
+        self.is_layout  = is_layout
+
+    def path(self) -> str:
+        return self.name if self.parent is None else self.parent.path() + "|" + self.name
+
+    def walk(self) -> Iterator["Control"]:
+        yield self
+        for child in self.children: yield from child.walk()
+
+
+
+class Scene:
+    '''
+    Everything the headless commands read and write.
+
+    `latency` is added to every command call (busy wait, so sub-millisecond
+    values are honoured); `command_latency` overrides it per command, e.g.
+    `{"getAttr": 20e-6}` to model a slow command layer.
+    '''
+    def __init__(self) -> None:
+        self.calls              = Counter()
+        "command -> calls since `reset_calls`, survives `new`"
+        self.latency            = 0.0
+        self.command_latency:   Dict[str, float] = {}
+        self.new()
+
+
+    def new(self) -> None:
+        "Empty scene, as after `file -new`"
+        self.nodes:         Dict[str, Node] = {}
+        self.connections:   Dict[str, str]  = {}
+        "destination plug -> source plug"
+        self.selection:     List[str] = []
+        self.controls:      Dict[str, Control] = {}
+        "leaf name -> control"
+        self.current_parent: Control | None = None
+        self.script_jobs:   Dict[int, Dict[str, Any]] = {}
+        self.undo_chunks    = 0
+        self.undo_enabled   = True
+        self.refresh_suspended = False
+        self._counters      = Counter()
+        self.scene_name     = ""
+        self.saves          = 0
+        self.units          = {"linear": "cm", "angle": "deg", "time": "film"}
+
+        self.create("defaultLightSet",      "objectSet")
+        self.create("defaultRenderGlobals", "renderGlobals")
+        persp = self.create("persp", "transform")
+        self.create("perspShape", "camera", persp)
+
+    def reset_calls(self) -> Counter:
+        "Return the call counts so far and start counting again"
+        calls, self.calls = self.calls, Counter()
+        return calls
+
+    def wait(self, command: str) -> None:
+        self.calls[command] += 1
+        latency = self.command_latency.get(command, self.latency)
+        if latency:
+            end = time.perf_counter() + latency
+            while time.perf_counter() < end: pass
+
+
+    # =============================
+    # nodes
+    # =============================
+    def unique_name(self, name: str | None, node_type: str, table: Collection[str] | None = None) -> str:
+        "Maya style: `name` if free, otherwise its trailing number is bumped"
+        table = self.nodes if table is None else table
+        if not name: name = node_type + "#"
+        if name.endswith("#"):
+            name = name.rstrip("#")
+        elif name not in table:
+            return name
+
+        base = name.rstrip("0123456789")
+        self._counters[base] = number = max(self._counters[base], 0) + 1
+        while f"{base}{number}" in table:
+            number += 1
+        self._counters[base] = number
+        return f"{base}{number}"
+
+    def create(self, name: str | None, node_type: str, parent: Node | None = None) -> Node:
+        node = Node(self.unique_name(name, node_type), node_type, parent if node_type in DAG_TYPES else None)
+        self.nodes[node.name] = node
+        if node.parent is not None: node.parent.children.append(node)
+        return node
+
+    def node(self, name: str) -> Node:
+        "Node from a short name or a DAG path, `ValueError` like Maya when missing"
+        node = self.nodes.get(name.rsplit("|", 1)[-1])
+        if node is None:
+            raise ValueError("No object matches name: {}".format(name))
+        return node
+
+    def delete(self, *nodes: Node) -> None:
+        "Delete nodes and their descendants; connections, sets and selection are swept once for all of them"
+        doomed = {n.name: n for node in nodes for n in node.walk()}
+        for node in nodes:
+            if node.parent is not None and node.parent.name not in doomed: node.parent.children.remove(node)
+        names = set(doomed)
+        for name in names: del self.nodes[name]
+        self.connections = {dst: src for dst, src in self.connections.items()
+                            if dst.split(".", 1)[0] not in names and src.split(".", 1)[0] not in names}
+        for set_node in self.nodes.values():
+            if "dagSetMembers" in set_node.attrs:
+                members = set_node.attrs["dagSetMembers"]
+                for index in [i for i, src in members.items() if src.split(".", 1)[0] in names]:
+                    del members[index]
+        self.selection = [item for item in self.selection if item.split(".", 1)[0].rsplit("|", 1)[-1] not in names]
+
+    def reparent(self, node: Node, parent: Node | None) -> None:
+        if node.parent is not None: node.parent.children.remove(node)
+        node.parent = parent
+        if parent is not None: parent.children.append(node)
+
+    def shape_of(self, node: Node) -> Node:
+        "The node itself for a shape, its first shape for a transform"
+        if node.type in SHAPE_TYPES: return node
+        shapes = [child for child in node.children if child.type in SHAPE_TYPES]
+        if not shapes:
+            raise ValueError("No shape under: {}".format(node.name))
+        return shapes[0]
+
+
+    # =============================
+    # attributes
+    # =============================
+    def plug(self, path: str) -> Tuple[Node, str, int | None, int | None]:
+        '''
+        `(node, attribute, multi index, child index)` of `node.attr`,
+        `node.attr[3]` or `node.attrX`. `ValueError` when it does not exist.
+        '''
+        name, _, attr = path.partition(".")
+        node = self.node(name)
+        index = None
+        if attr.endswith("]") and "[" in attr:
+            attr, _, rest = attr.partition("[")
+            index = int(rest[:-1])
+        if attr in node.attrs:
+            return node, attr, index, None
+        if attr[:-1] in node.attrs and attr[-1] in CHILD_SUFFIXES and isinstance(node.attrs[attr[:-1]], tuple):
+            return node, attr[:-1], index, CHILD_SUFFIXES[attr[-1]]
+        raise ValueError("No object matches name: {}".format(path))
+
+    def get(self, path: str) -> Any:
+        node, attr, index, child = self.plug(path)
+        value = node.attrs[attr]
+        if isinstance(value, dict):
+            return value.get(index) if index is not None else sorted(value)
+        if child is not None: return value[child]
+        return [value] if isinstance(value, tuple) else value
+
+    def set(self, path: str, values: Sequence[Any]) -> None:
+        node, attr, index, child = self.plug(path)
+        if self.connections.get(path):
+            raise RuntimeError("setAttr: The attribute '{}' is locked or connected and cannot be modified.".format(path))
+        current = node.attrs[attr]
+        if isinstance(current, dict):
+            raise RuntimeError("setAttr: cannot set the multi attribute '{}'".format(path))
+
+        if child is not None:
+            items = list(current)
+            items[child] = float(values[0])
+            node.attrs[attr] = tuple(items)
+        elif isinstance(current, tuple):
+            if len(values) != len(current):
+                raise RuntimeError("setAttr: '{}' expects {} values, got {}".format(path, len(current), len(values)))
+            node.attrs[attr] = tuple(float(v) for v in values)
+        else:
+            value = values[0]
+            node.attrs[attr] = type(current)(value) if isinstance(current, (bool, int, float)) else value
+
+    def connect(self, source: str, destination: str, next_available: bool = False, force: bool = False) -> str:
+        self.plug(source)
+        node, attr, index, _ = self.plug(destination)
+        members = node.attrs[attr]
+        if isinstance(members, dict):
+            if index is None:
+                if not next_available:
+                    raise RuntimeError("connectAttr: '{}' is a multi attribute, give an index".format(destination))
+                index = len(members)
+                while index in members: index += 1
+            destination = f"{node.name}.{attr}[{index}]"
+            if index in members and not force:
+                raise RuntimeError("connectAttr: '{}' is already connected".format(destination))
+            members[index] = source
+        elif destination in self.connections and not force:
+            raise RuntimeError("connectAttr: '{}' is already connected".format(destination))
+        self.connections[destination] = source
+        return destination
+
+
+    def source(self, destination: str) -> str | None:
+        "Plug connected into `destination`, `None` when it is not connected"
+        self.plug(destination)
+        return self.connections.get(destination)
+
+
+    # =============================
+    # anim curves
+    # =============================
+    def keys(self, curve: Node) -> List[Tuple[float, float]]:
+        "`(time, value)` of every key, sorted by time"
+        return sorted(curve.attrs["keyTimeValue"].values())
+
+    def set_keys(self, curve: Node, first: int, values: Sequence[float]) -> None:
+        "`keyTimeValue[first:]` from interleaved `time, value, time, value...`"
+        if len(values) % 2:
+            raise RuntimeError("setAttr: keyTimeValue expects time / value pairs, got {} values".format(len(values)))
+        table = curve.attrs["keyTimeValue"]
+        for i in range(len(values) // 2):
+            table[first + i] = (float(values[2 * i]), float(values[2 * i + 1]))
+
+    def set_key(self, curve: Node, time: float, value: float) -> None:
+        "Add a key, or move the value of the key already at `time`"
+        table = curve.attrs["keyTimeValue"]
+        index = next((i for i, (t, _) in table.items() if t == time), len(table))
+        table[index] = (float(time), float(value))
+
+
+    # =============================
+    # components
+    # =============================
+    def component(self, specifier: str) -> Tuple[Node, str, int, int] | None:
+        "`(mesh, kind, start, stop)`, stop included, or `None` when it is not a valid component"
+        match = COMPONENT.match(specifier)
+        if not match or match["node"].rsplit("|", 1)[-1] not in self.nodes: return None
+        try:    mesh = self.shape_of(self.node(match["node"]))
+        except ValueError: return None
+        if mesh.topology is None: return None
+
+        start = int(match["start"])
+        stop  = int(match["stop"]) if match["stop"] is not None else start
+        count = self.component_count(mesh, match["kind"])
+        if not 0 <= start <= stop < count: return None
+        return mesh, match["kind"], start, stop
+
+    @staticmethod
+    def component_count(mesh: Node, kind: str) -> int:
+        topology = mesh.topology
+        return {"f": topology["face"], "vtx": topology["vertex"], "e": topology["edge"], "map": topology["vertex"]}[kind]
+
+    def flatten(self, specifier: str) -> List[str]:
+        found = self.component(specifier)
+        if found is None: return [specifier]
+        _, kind, start, stop = found
+        name = specifier.split(".", 1)[0]
+        return [f"{name}.{kind}[{i}]" for i in range(start, stop + 1)]
+
+
+    # =============================
+    # UI
+    # =============================
+    def control(self, name: str) -> Control | None:
+        return self.controls.get(name.rsplit("|", 1)[-1])
+
+    def delete_control(self, control: Control) -> None:
+        if control.parent is not None: control.parent.children.remove(control)
+        for item in list(control.walk()):
+            self.controls.pop(item.name, None)
+            if self.current_parent is item: self.current_parent = control.parent
+
+
+
+SCENE = Scene()
+"the scene every headless command works on"
@@ -0,0 +1,17 @@
+"""
+Submodules are imported on first attribute access (`interface.lightmanager.show()`),
+nothing UI related is loaded by `import interface` alone.
+"""
+import importlib
+
+_SUBMODULES = {"nativeuibase", "nativegui", "callbacks", "builder", "lightmanager"}
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
@@ -0,0 +1,143 @@
+""" =================================================================
+| builder.py -- Python/MayaMedic/interface/builder.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+Declarative window building: describe the whole tree first, then create
+it in one pass.
+
+Every control is created with all of its flags and an explicit `parent`,
+so there is no `setParent` and no follow-up `edit` call (`Text.setFont`,
+`setHeight`, ...). The window is only shown once the tree exists.
+"""
+
+from collections import Counter
+from typing import *
+
+import maya.cmds as cmds
+
+import interface.nativegui as ng
+
+
+
+class Spec:
+    '''
+    One control of the tree: a `maya.cmds` UI command, its creation flags
+    and, for layouts, its children.
+
+    Examples:
+    ---------
+    >>> Spec("columnLayout", adjustableColumn=True, children=[
+    ...     Spec("text",   label="Lights", font="boldLabelFont", height=30),
+    ...     Spec("button", key="refresh", label="Refresh", command=refresh),
+    ... ])
+    '''
+    __slots__ = ("command", "flags", "children", "key")
+
+    def __init__(self, command: str, children: Sequence["Spec"] = (), key: str | None = None, **flags) -> None:
+        '''
+        Params:
+        -------
+        - `command`:  name of the `maya.cmds` command, e.g. `"frameLayout"`
+        - `children`: child specs, layouts only
+        - `key`:      name to find the created control under in the result
+        - `**flags`:  creation flags, `NativeFont` values are accepted for `font`
+        '''
+        if not hasattr(cmds, command):
+            raise ValueError("Unknown UI command: {}".format(command))
+        self.command  = command
+        self.children = list(children)
+        self.key      = key
+        self.flags    = flags
+
+    def __repr__(self) -> str:
+        return f"Spec({self.command!r}, {len(self.children)} children)"
+
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> "Spec":
+        '''
+        Build from nested dicts: `{"command": ..., "key": ..., "children": [...], **flags}`
+
+        Examples:
+        ---------
+        >>> Spec.from_dict({"command": "frameLayout", "label": "Area Lights", "children": [
+        ...     {"command": "button", "label": "Select all"},
+        ... ]})
+        '''
+        spec     = dict(spec)
+        command  = spec.pop("command")
+        children = [cls.from_dict(child) for child in spec.pop("children", ())]
+        return cls(command, children=children, key=spec.pop("key", None), **spec)
+
+
+
+class WindowBuilder:
+    '''
+    Compile a `Spec` tree into a window.
+
+    `commands` counts every UI command the builder issued, per command,
+    so a layout can be compared with its imperative version. The query
+    for an existing window is counted as `"window exists"`.
+
+    Examples:
+    ---------
+    >>> builder = WindowBuilder("Arnold Light Master", (420, 720))
+    >>> controls = builder.build(spec)
+    >>> controls["refresh"]
+    'Arnold_Light_Master|columnLayout12|button3'
+    >>> builder.commands.total()
+    '''
+    def __init__(self,
+        title:              str,
+        widthHeight:        Tuple[int, int],
+        **window_flags
+    ) -> None:
+        self.title          = title
+        self.widthHeight    = widthHeight
+        self.window_flags   = window_flags
+        self.window_id      = '_'.join(title.split(" "))
+        self.commands       = Counter()
+
+
+    def build(self, spec: Spec | Dict[str, Any], show: bool = True) -> Dict[str, str]:
+        '''
+        Create the window and the whole tree, then show it.
+
+        Returns:
+        --------
+        - `{key: full path}` for every spec that had a `key`, plus `"window"`
+        '''
+        if isinstance(spec, dict): spec = Spec.from_dict(spec)
+
+        self.commands["window exists"] += 1 # the query `deleteWindow_byId` makes, the window itself is counted by `_run`
+        if ng.Popup.deleteWindow_byId(self.window_id):
+            self.commands["deleteUI"] += 1
+        window = self._run("window", self.window_id, title=self.title, widthHeight=self.widthHeight, **self.window_flags)
+
+        controls = {"window": window}
+        stack: List[Tuple[Spec, str]] = [(spec, window)]
+        while stack:
+            node, parent = stack.pop()
+            flags = {k: (v.value if isinstance(v, ng.NativeFont) else v) for k, v in node.flags.items()}
+            name  = self._run(node.command, parent=parent, **flags)
+            if node.key: controls[node.key] = name
+            # reversed so children are created in order
+            stack.extend((child, name) for child in reversed(node.children))
+
+        if show: self._run("showWindow", window)
+        return controls
+
+
+    def _run(self, command: str, *args, **flags) -> Any:
+        self.commands[command] += 1
+        return getattr(cmds, command)(*args, **flags)
+
+
+
+def build_window(title: str, widthHeight: Tuple[int, int], spec: Spec | Dict[str, Any], **window_flags) -> Dict[str, str]:
+    "Shortcut for `WindowBuilder(title, widthHeight, **window_flags).build(spec)`"
+    return WindowBuilder(title, widthHeight, **window_flags).build(spec)
@@ -0,0 +1,185 @@
+""" =================================================================
+| callbacks.py -- Python/MayaMedic/interface/callbacks.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+import logging
+import threading
+import time
+from typing import *
+
+import maya.cmds as cmds
+import maya.utils as utils
+try:
+    import maya.api.OpenMaya as om
+except ImportError: # outside of a Maya session
+    om = None
+
+log = logging.getLogger(__name__)
+
+
+class AttributeCallbackHub:
+    '''
+    One attribute-changed listener per node, shared by every UI control
+    watching an attribute of that node.
+
+    Changes are not delivered synchronously: they are collected and flushed
+    once per idle cycle through `maya.utils.executeDeferred`, so dragging a
+    slider calls each subscriber at most once per refresh, however many
+    ticks the drag produced. `throttle` (seconds) sets a minimum time
+    between two flushes on top of that: a change arriving sooner waits on
+    one timer, which schedules the flush once the time is up.
+
+    Without OpenMaya, one `attributeChange` scriptJob per attribute feeds
+    the same queue.
+
+    Examples:
+    ---------
+    >>> hub = AttributeCallbackHub.instance()
+    >>> token = hub.subscribe("aiAreaLightShape1.intensity", refresh, owner=slider.name)
+    >>> hub.unsubscribe(token)
+    '''
+    _instance: "AttributeCallbackHub | None" = None
+
+    def __init__(self, throttle: float = 0.0) -> None:
+        self.throttle   = throttle
+        self.flushes    = 0
+
+        self._subscribers:  Dict[str, Dict[int, Tuple[Callable, str | None]]] = {}
+        "`node.attr` -> {token: (callback, owner control)}"
+        self._listeners:    Dict[str, int] = {}
+        "node (or `node.attr` without OpenMaya) -> callback / scriptJob id"
+        self._pending:      Set[str] = set()
+        self._scheduled     = False
+        "a flush is deferred or waiting on `_timer`"
+        self._timer:        threading.Timer | None = None
+        self._last_flush    = float("-inf")
+        self._next_token    = 0
+
+
+    # =============================
+    # functions
+    # =============================
+    def subscribe(self, attribute: str, callback: Callable[[], Any], owner: str | None = None) -> int:
+        '''
+        Call `callback()` after `attribute` (`node.attr`) changes.
+
+        Params:
+        -------
+        - `owner`: UI control; the subscription is dropped once it is deleted
+
+        Returns:
+        --------
+        - token for `unsubscribe`
+        '''
+        node, attr = attribute.split(".", 1)
+        if node not in self._listeners and attribute not in self._listeners:
+            self._listen(node, attr)
+
+        self._next_token += 1
+        self._subscribers.setdefault(attribute, {})[self._next_token] = (callback, owner)
+        return self._next_token
+
+
+    def unsubscribe(self, token: int) -> None:
+        for attribute, subscribers in list(self._subscribers.items()):
+            if subscribers.pop(token, None) is not None:
+                if not subscribers: self._forget(attribute)
+                return
+
+
+    def notify(self, attribute: str) -> None:
+        "Queue `attribute` and schedule a flush for the next idle cycle"
+        if attribute not in self._subscribers: return
+        self._pending.add(attribute)
+        if self._scheduled: return
+        self._scheduled = True
+        wait = self.throttle - (time.perf_counter() - self._last_flush)
+        if wait <= 0:
+            utils.executeDeferred(self._flush)
+        else: # flushed too recently: one timer, no polling
+            self._timer = threading.Timer(wait, utils.executeDeferred, (self._flush,))
+            self._timer.daemon = True
+            self._timer.start()
+
+
+    def clear(self) -> None:
+        "Remove every listener and subscriber"
+        if self._timer is not None: self._timer.cancel()
+        self._timer, self._scheduled = None, False
+        for key, listener in self._listeners.items():
+            self._remove_listener(key, listener)
+        self._listeners.clear()
+        self._subscribers.clear()
+        self._pending.clear()
+
+
+    # =============================
+    # private
+    # =============================
+    def _flush(self) -> None:
+        if not self._scheduled: return # cleared in the meantime
+        pending, self._pending = self._pending, set()
+        self._scheduled, self._timer = False, None
+        self._last_flush = time.perf_counter()
+        self.flushes    += 1
+
+        for attribute in pending:
+            for token, (callback, owner) in list(self._subscribers.get(attribute, {}).items()):
+                if owner and not cmds.control(owner, exists=True):
+                    self.unsubscribe(token)
+                    continue
+                try:
+                    callback()
+                except Exception:
+                    log.exception("Callback for %s failed", attribute)
+
+
+    def _listen(self, node: str, attr: str) -> None:
+        if om is None:
+            attribute = f"{node}.{attr}"
+            self._listeners[attribute] = cmds.scriptJob(attributeChange=[attribute, lambda: self.notify(attribute)])
+            return
+
+        mobject = om.MSelectionList().add(node).getDependNode(0)
+        self._listeners[node] = om.MNodeMessage.addAttributeChangedCallback(
+            mobject, lambda message, plug, *args: self._on_attribute_changed(node, message, plug)
+        )
+
+    def _on_attribute_changed(self, node: str, message: int, plug: "om.MPlug") -> None:
+        if not message & (om.MNodeMessage.kAttributeSet | om.MNodeMessage.kConnectionMade | om.MNodeMessage.kConnectionBroken):
+            return
+        # `color` subscribers also want `colorR` changes
+        while True:
+            self.notify(f"{node}.{plug.partialName(useLongNames=True)}")
+            if not plug.isChild: break
+            plug = plug.parent()
+
+    def _forget(self, attribute: str) -> None:
+        del self._subscribers[attribute]
+        node = attribute.split(".", 1)[0]
+        key  = attribute if om is None else node
+        if key == node and any(a.split(".", 1)[0] == node for a in self._subscribers):
+            return # other attributes of the node are still watched
+        if (listener := self._listeners.pop(key, None)) is not None:
+            self._remove_listener(key, listener)
+
+    @staticmethod
+    def _remove_listener(key: str, listener: int) -> None:
+        if om is not None:
+            om.MMessage.removeCallback(listener)
+        elif cmds.scriptJob(exists=listener):
+            cmds.scriptJob(kill=listener, force=True)
+
+
+    # =============================
+    # Static
+    # =============================
+    @classmethod
+    def instance(cls) -> "AttributeCallbackHub":
+        "The hub shared by every `AttributeSlider`"
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
@@ -0,0 +1,246 @@
+""" =================================================================
+| lightmanager.py -- Python/MayaMedic/interface/lightmanager.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+import os
+import sys
+from functools import partial
+from typing import *
+
+import maya.cmds as cmds
+
+import interface.nativegui as ng
+import nodes.arnold as arnold
+from nodes.lightpreset import LightPreset
+from interface.callbacks import AttributeCallbackHub
+from utility.parser import kelvin_to_rgb
+import utility.devtools as devtools
+
+
+
+# =========================================================================
+# Row
+# =========================================================================
+class LightRow:
+    '''
+    Controls of one Arnold light. Rows are recycled by `PagedColumn`:
+    `bind` points every control at another light shape.
+
+    Attribute sliders follow their attribute on their own. The rest (header,
+    checkbox, swatch) is refreshed through `AttributeCallbackHub`, and a
+    control is only edited when its value differs from the last one shown.
+    '''
+    def __init__(self, shape: str) -> None:
+        self.shape  = shape
+        self.shown: Dict[str, Any] = {}
+        "last value shown by each control that is not bound to an attribute"
+        self._token = None
+
+        self.layout = cmds.columnLayout(adjustableColumn=True)
+
+        self.header = ng.Text("", width=300, align="center")
+        self.header.setFont(ng.NativeFont.boldLabelFont)
+        self.header.setHeight(30)
+
+        self.color = ng.AssociatedColorSlider("Color", f"{shape}.color")
+
+        self.useTemperature = ng.CheckBox("Use Temperature Color")
+        self.useTemperature.setChangeCommand(self._on_use_temperature)
+
+        cmds.rowLayout(numberOfColumns=2, adjustableColumn=1)
+        self.temperature = ng.AssociatedFieldSlider("Temperature", f"{shape}.aiColorTemperature", min=1000, max=15000)
+        self.temperature.set_value_change_callback(self.sync)
+        self.swatch = ng.ColorSwatch(width=60, height=20)
+        cmds.setParent("..")
+
+        self.intensity = ng.AssociatedFieldSlider("Intensity", f"{shape}.intensity", min=0,   max=10)
+        self.exposure  = ng.AssociatedFieldSlider("Exposure",  f"{shape}.exposure",  min=-10, max=10)
+        self.samples   = ng.AssociatedFieldSlider("Samples",   f"{shape}.aiSamples", min=0,   max=10)
+        for slider in (self.intensity, self.exposure):
+            slider.setPrecision(4)
+        cmds.setParent("..")
+
+        self.bind(shape)
+
+
+    def bind(self, shape: str) -> None:
+        "Show another light in the same controls"
+        self.unbind()
+        self.shape = shape
+
+        self.color.bind(f"{shape}.color")
+        self.temperature.bind(f"{shape}.aiColorTemperature")
+        self.intensity.bind(f"{shape}.intensity")
+        self.exposure.bind(f"{shape}.exposure")
+        self.samples.bind(f"{shape}.aiSamples")
+
+        self._token = AttributeCallbackHub.instance().subscribe(f"{shape}.aiUseColorTemperature", self.sync, owner=self.layout)
+        self.sync()
+
+
+    def unbind(self) -> None:
+        "Stop following the light, while the row is hidden"
+        for slider in (self.color, self.temperature, self.intensity, self.exposure, self.samples):
+            slider.unbind()
+        if self._token is not None: AttributeCallbackHub.instance().unsubscribe(self._token)
+        self._token = None
+
+
+    def sync(self) -> None:
+        "Re-read the values that are not bound to an attribute, edit what changed"
+        transform = (cmds.listRelatives(self.shape, parent=True) or [self.shape])[0]
+        label     = transform if self.shape.startswith(transform) else f"{transform} | {self.shape}"
+        use_temp  = bool(cmds.getAttr(f"{self.shape}.aiUseColorTemperature"))
+        swatch    = kelvin_to_rgb(cmds.getAttr(f"{self.shape}.aiColorTemperature"))
+
+        if self._changed("label", label):
+            self.header.setLabel(label)
+        if self._changed("useTemperature", use_temp):
+            self.useTemperature.value  = use_temp
+            self.temperature.isEnabled = use_temp
+        if self._changed("swatch", swatch):
+            self.swatch.setColor(swatch)
+
+
+    def _changed(self, key: str, value: Any) -> bool:
+        if self.shown.get(key) == value: return False
+        self.shown[key] = value
+        return True
+
+    def _on_use_temperature(self, value: bool) -> None:
+        cmds.setAttr(f"{self.shape}.aiUseColorTemperature", value)
+
+
+
+# =========================================================================
+# Window
+# =========================================================================
+class ArnoldLightManager:
+    '''
+    Control every Arnold light of the scene from one window.
+
+    Only the first section is built when the window opens; the others are
+    built the first time they are expanded. Sections show `page_size` lights
+    at a time and reuse the same row controls from page to page, so opening
+    the window costs the same with 40 or 400 lights.
+
+    `refresh` diffs the lights on display against the scene instead of
+    rebuilding the window: nothing happens when the light index did not
+    change, and otherwise only rows whose light changed are re-bound.
+
+    Examples:
+    ---------
+    >>> manager = ArnoldLightManager()
+    >>> manager.show()
+    >>> manager.refresh()
+    '''
+    TITLE = "Arnold Light Master"
+    PRESET_FILTER = "Light Presets (*.json *.json.gz)"
+
+    def __init__(self, page_size: int = 20) -> None:
+        self.page_size = page_size
+        self.pages:     Dict[str, ng.PagedColumn] = {}
+        self.lights:    Dict[str, List[str]] = {section: [] for section in arnold.ARNOLD_LIGHT_SECTIONS}
+        "lights on display per section, the model `refresh` diffs against"
+        self.version    = None
+        "light index version the model was built from"
+
+        self.popup  = ng.Popup(self.TITLE, (420, 720), sizeable=True)
+        self.scroll = ng.ScrollLayout(parent=self.popup.window_id)
+        self.column = ng.ColumnLayout(parent=self.scroll.name)
+        ng.Button("Refresh", command=lambda *args: self.refresh(), height=24, parent=self.column.name)
+        ng.Button("Save Preset...",  command=lambda *args: self.save_preset(),  height=24, parent=self.column.name)
+        ng.Button("Apply Preset...", command=lambda *args: self.apply_preset(), height=24, parent=self.column.name)
+
+        # every section exists from the start so they keep their order, empty ones are unmanaged
+        self.sections: Dict[str, ng.LazyFrameLayout] = {}
+        for section, (_, color) in arnold.ARNOLD_LIGHT_SECTIONS.items():
+            frame = ng.LazyFrameLayout(
+                section,
+                build    = partial(self._build_section, section),
+                collapse = True,
+                parent   = self.column.name,
+            )
+            frame.setBackgroundColor(color)
+            cmds.control(frame.name, edit=True, manage=False)
+            self.sections[section] = frame
+
+        self.refresh()
+        if (first := next((s for s, lights in self.lights.items() if lights), None)):
+            cmds.frameLayout(self.sections[first].name, edit=True, collapse=False)
+            self.sections[first].build()
+
+
+    def show(self) -> None:
+        self.popup.showWindow()
+
+
+    def exists(self) -> bool:
+        return cmds.window(self.popup.window_id, exists=True)
+
+
+    def refresh(self) -> None:
+        "Bring the window up to date with the scene, touching only what changed"
+        index = arnold.AiLight.lightIndex()
+        snapshot = index.snapshot()
+        if index.version == self.version: return
+        self.version = index.version
+
+        for section, (light_type, _) in arnold.ARNOLD_LIGHT_SECTIONS.items():
+            lights = snapshot[light_type]
+            if lights == self.lights[section]: continue
+
+            if bool(lights) != bool(self.lights[section]):
+                cmds.control(self.sections[section].name, edit=True, manage=bool(lights))
+            self.lights[section] = list(lights)
+            if section in self.pages:
+                self.pages[section].setItems(lights)
+
+
+    def save_preset(self, path: str | None = None) -> str | None:
+        "Save every light's state, asks for a file when `path` is not given"
+        path = path or next(iter(cmds.fileDialog2(fileFilter=self.PRESET_FILTER, dialogStyle=2, fileMode=0) or []), None)
+        if not path: return None
+        preset = LightPreset.capture(os.path.basename(path).split(".")[0])
+        print(f"Saved {len(preset)} lights to {preset.save(path)}")
+        return path
+
+
+    def apply_preset(self, path: str | None = None) -> None:
+        "Apply a saved preset in one undo chunk; the rows follow their attributes on their own"
+        path = path or next(iter(cmds.fileDialog2(fileFilter=self.PRESET_FILTER, dialogStyle=2, fileMode=1) or []), None)
+        if not path: return
+        applied = LightPreset.load(path).apply()
+        print(f"Preset {os.path.basename(path)}: {applied.writes} attributes changed on {len(applied.lights)} lights"
+              + (f", {len(applied.missing)} lights not in the scene" if applied.missing else ""))
+
+
+    def _build_section(self, section: str) -> None:
+        self.pages[section] = ng.PagedColumn(self.lights[section], make_row=LightRow, page_size=self.page_size)
+
+
+
+_manager: ArnoldLightManager | None = None
+
+def show(page_size: int = 20, _reloaded: bool = False) -> ArnoldLightManager:
+    '''
+    Open the light manager, or refresh and raise the one already open.
+
+    Examples:
+    ---------
+    >>> import interface.lightmanager as lm
+    >>> lm.show()
+    '''
+    global _manager
+    if not _reloaded and devtools.reload_if_dev(): # the old window belongs to stale classes, use the new module once
+        return sys.modules[__name__].show(page_size, _reloaded=True)
+    
+    if _manager is None or not _manager.exists() or _manager.page_size != page_size:
+        _manager = ArnoldLightManager(page_size)
+    else:
+        _manager.refresh()
+    _manager.show()
+    return _manager
@@ -5,7 +5,7 @@
 | Copyright © 2023 jacktogon. All rights reserved.
 ================================================================= """
 
-import os, pathlib, re, importlib
+import os, pathlib, re
 from typing import *
 from typing import Optional
 from enum import Enum
@@ -14,9 +14,7 @@ import maya.cmds as cmds
 import maya.utils as utils
 
 import utility.general as gen
-importlib.reload(gen)
 import interface.nativeuibase as ui
-importlib.reload(ui)
 
 
 
@@ -93,6 +91,8 @@ class Popup():
     # =============================
     def setSize(self, window_size: Tuple[int, int]):
         cmds.window(self.window_id, edit=True, widthHeight=window_size)
+        for control in list(ui.UIBase._cached_controls): # children may have been resized
+            control.invalidate("width", "height")
         
     def setBackgroundColor(self, nRGB: Tuple[float, float, float]):
         cmds.window(self.window_id, edit=True, bgc=nRGB)
@@ -187,29 +187,30 @@ class FrameLayout(ui.Layout):
     def __init__(self,
         label: str,
         collapsable=True,
+        collapse=False,
         parent: str=None
     ) -> None:
         
         
-        self.layout = cmds.frameLayout(label=label, collapsable=collapsable) if not parent else \
-            cmds.frameLayout(label=label, collapsable=collapsable, parent=parent)
+        self.layout = cmds.frameLayout(label=label, collapsable=collapsable, collapse=collapse) if not parent else \
+            cmds.frameLayout(label=label, collapsable=collapsable, collapse=collapse, parent=parent)
 
         super().__init__(self.layout)
         
     @property
     def font(self) -> float:
-        return self._class_command(self.name, query=True, font=True)
+        return self._query("font")
     @font.setter
     def font(self, font: NativeFont):
-        return self._class_command(self.name, edit=True, font=font.value)
+        return self._edit("font", font.value)
     
     
     @property
     def labelWidth(self) -> float:
-        return self._class_command(self.name, query=True, labelWidth=True)
+        return self._query("labelWidth")
     @labelWidth.setter
     def labelWidth(self, labelWidth: float):
-        return self._class_command(self.name, edit=True, labelWidth=labelWidth)
+        return self._edit("labelWidth", labelWidth)
     
     
     @property
@@ -226,7 +227,159 @@ class FrameLayout(ui.Layout):
     def marginWidth(self, marginWidth: float):
         return self._class_command(self, edit=True, marginWidth=marginWidth)
     
-
+    
+    
+class LazyFrameLayout(FrameLayout):
+    '''
+    A collapsable frame layout that only builds its children the first time
+    it is expanded. Collapsed sections of a big window cost one control.
+    
+    Examples:
+    ---------
+    >>> LazyFrameLayout("Area Lights", build=lambda: [LightRow(l) for l in lights])
+    '''
+    def __init__(self,
+        label:      str,
+        build:      Callable[[], Any],
+        collapse:   bool = True,
+        parent:     str  = None
+    ) -> None:
+        super().__init__(label, collapsable=True, collapse=collapse, parent=parent)
+        self._build  = build
+        self.isBuilt = False
+        
+        self._class_command(self.name, edit=True, expandCommand=lambda *args: self.build())
+        if not collapse: self.build()
+        
+        
+    def build(self) -> None:
+        "Build the children now (no-op once built), under this layout. A failed build is undone and tried again on the next expand"
+        if self.isBuilt: return
+        
+        previous_parent = cmds.setParent(query=True)
+        cmds.setParent(self.name)
+        try:
+            self._build()
+        except BaseException:
+            self.invalidate("childArray")
+            for child in self.childArray or []:
+                cmds.deleteUI(child)
+            raise
+        finally:
+            cmds.setParent(previous_parent)
+            self.invalidate("childArray")
+        self.isBuilt = True
+            
+            
+    def rebuild(self) -> None:
+        "Delete the children and build them again if expanded, otherwise on next expand"
+        for child in self.childArray or []:
+            cmds.deleteUI(child)
+        self.invalidate("childArray")
+        self.isBuilt = False
+        if not self._class_command(self.name, query=True, collapse=True):
+            self.build()
+
+
+
+class PagedColumn(ui.Layout):
+    '''
+    Column that shows a long list one page at a time.
+    
+    Only `page_size` rows ever get real controls. Rows are built on demand
+    and recycled: changing page re-binds the existing rows to other items
+    instead of deleting and creating controls. Unused rows are unmanaged
+    and unbound.
+    
+    `make_row(item)` is called under the row container and must return an
+    object with a `layout` (its top level control), a `bind(item)` and an
+    `unbind()` method.
+    
+    Examples:
+    ---------
+    >>> PagedColumn(cmds.ls(type="aiAreaLight"), make_row=LightRow, page_size=20)
+    '''
+    _class_command = cmds.columnLayout
+    
+    def __init__(self,
+        items:      Sequence[Any],
+        make_row:   Callable[[Any], Any],
+        page_size:  int = 25,
+        parent:     str = None
+    ) -> None:
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1: {}".format(page_size))
+        
+        self.layout = cmds.columnLayout(adjustableColumn=True) if not parent else \
+            cmds.columnLayout(adjustableColumn=True, parent=parent)
+        super().__init__(self.layout)
+        
+        self.items      = list(items)
+        self.page_size  = page_size
+        self.page       = 0
+        self.rows:      List[Any] = []
+        self.row_items: List[Any] = []
+        "item each row is currently bound to, `None` for hidden rows"
+        self._make_row  = make_row
+        self._managed   = 0
+        self._label     = None
+        
+        # ~~~~~~~~ pager ~~~~~~~~
+        self.pager = cmds.rowLayout(numberOfColumns=3, adjustableColumn=2, parent=self.layout)
+        Button("<",  command=lambda *args: self.showPage(self.page - 1), height=20, parent=self.pager)
+        self.pageLabel = cmds.text(label="", align="center", parent=self.pager)
+        Button(">",  command=lambda *args: self.showPage(self.page + 1), height=20, parent=self.pager)
+        
+        self.container = cmds.columnLayout(adjustableColumn=True, parent=self.layout)
+        self.showPage(0)
+    
+    
+    @property
+    def pageCount(self) -> int:
+        return max(1, -(-len(self.items) // self.page_size))
+    
+    
+    def setItems(self, items: Sequence[Any]) -> None:
+        '''
+        Replace the items, staying on the current page when it still exists.
+        Only rows whose item changed are re-bound.
+        '''
+        self.items = list(items)
+        self.showPage(min(self.page, self.pageCount - 1))
+        
+        
+    def showPage(self, page: int) -> None:
+        "Bind the rows to the items of `page`; rows already showing the right item are left alone"
+        self.page = max(0, min(page, self.pageCount - 1))
+        visible   = self.items[self.page * self.page_size:(self.page + 1) * self.page_size]
+        
+        built = len(self.rows)
+        for i, item in enumerate(visible):
+            if i >= built:
+                cmds.setParent(self.container)
+                self.rows.append(self._make_row(item))
+                self.row_items.append(item)
+            elif self.row_items[i] != item:
+                self.rows[i].bind(item)
+                self.row_items[i] = item
+        
+        # new rows are managed already, only flip the recycled ones
+        for i in range(len(visible), self._managed):
+            cmds.control(self.rows[i].layout, edit=True, manage=False)
+            self.rows[i].unbind()
+            self.row_items[i] = None
+        for i in range(self._managed, min(len(visible), built)):
+            cmds.control(self.rows[i].layout, edit=True, manage=True)
+        self._managed = len(visible)
+        
+        first = self.page * self.page_size
+        label = f"{first + 1 if visible else 0}-{first + len(visible)} of {len(self.items)}"
+        if label != self._label:
+            cmds.text(self.pageLabel, edit=True, label=label)
+            cmds.control(self.pager, edit=True, manage=len(self.items) > self.page_size)
+            self._label = label
+    
+    
 
 
 # =========================================================================
@@ -271,6 +424,9 @@ class Text(ui.UIBase):
         
     def setHeight(self, height: int):
         cmds.text(self.instance, edit=True, height=height)
+        
+    def setLabel(self, label: str):
+        cmds.text(self.instance, edit=True, label=label)
 
 
 
@@ -327,6 +483,9 @@ class AssociatedFieldSlider(ui.AttributeSlider):
     # =============================
     def setPrecision(self, precision: int):
         self._class_command(self.name, edit=True, pre=precision)
+        
+    def setChangeCommand(self, callback: Callable):
+        self._class_command(self.name, edit=True, changeCommand=callback)
     
     
 
@@ -345,6 +504,13 @@ class CheckBox(ui.UIBase):
     def setChangeCommand(self, callback: Callable):
         self._class_command(self.transform, edit=True, changeCommand=callback)
         
+    @property
+    def value(self) -> bool:
+        return self._class_command(self.transform, query=True, value=True)
+    @value.setter
+    def value(self, value: bool):
+        self._class_command(self.transform, edit=True, value=value)
+        
         
 # ==========================================================================
 # Selectors
@@ -364,9 +530,13 @@ class ColorSwatch(ui.UIBase):
         height: int             = 20,
         rgb:    Tuple[int, ...] = (0, 0, 0)
     ) -> None:
-        fullpath = cmds.canvas(name, width=width, height=height)
+        fullpath = cmds.canvas(name, width=width, height=height) if name else \
+            cmds.canvas(width=width, height=height)
         super().__init__(name=fullpath)
         
         self._class_command(self.name, edit=True, rgbValue=rgb)
         
+    def setColor(self, nRGB: Tuple[float, float, float]):
+        self._class_command(self.name, edit=True, rgbValue=nRGB)
+        
     
\ No newline at end of file
@@ -5,10 +5,22 @@
 | Copyright © 2023 jacktogon. All rights reserved.
 ================================================================= """
 
+import weakref
 from typing import *
 from abc import ABC, abstractclassmethod
 
 import maya.cmds as cmds
+try:
+    from PySide6 import QtCore
+    from shiboken6 import wrapInstance
+except ImportError:
+    try:
+        from PySide2 import QtCore
+        from shiboken2 import wrapInstance
+    except ImportError: # no Qt: resizes are not watched
+        QtCore = None
+
+from interface.callbacks import AttributeCallbackHub
 
 # ======================================================================
 # Base
@@ -18,8 +30,14 @@ class UIBase(ABC):
     _class_command = None
     
     "Base for native UI class"
+    _cached_controls: "weakref.WeakSet[UIBase]" = weakref.WeakSet()
+    
     def __init__(self, name: str | None = None) -> None:
         self.name = name
+        self._cache: Dict[str, Any] | None = None
+        "query flag -> last known value, `None` while caching is off"
+        self.cacheHits   = 0
+        self.cacheMisses = 0
         
     def __del__(self):
         # NOTE: Don't use this because it will go out of scope even if the window is not closed by user
@@ -33,33 +51,104 @@ class UIBase(ABC):
     def __str__(self) -> str:
         return self.name
     
+    # =============================
+    # Query cache
+    # =============================
+    def enableCache(self) -> None:
+        '''
+        Opt in to caching the `query=True` properties of this control
+        (`width`, `height`, `annotation`, `childArray`, ...). Setters write
+        through, and the cache is dropped when the control is resized or deleted.
+        '''
+        if self._cache is not None: return
+        self._cache = {}
+        UIBase._cached_controls.add(self)
+        ref = weakref.ref(self) # the job outlives the control object, it must not keep it in `_cached_controls`
+        cmds.scriptJob(uiDeleted=[self.name, lambda: _invalidate_ref(ref)], runOnce=True)
+        self._watch_resize()
+        
+    def invalidate(self, *flags: str) -> None:
+        "Forget the cached value of `flags`, or of everything"
+        if self._cache is None: return
+        if not flags: self._cache.clear()
+        for flag in flags: self._cache.pop(flag, None)
+        
+    def refresh(self) -> Dict[str, Any]:
+        "Re-query every cached property in one pass"
+        if self._cache is None: return {}
+        for flag in list(self._cache):
+            self._cache[flag] = self._class_command(self.name, query=True, **{flag: True})
+        return dict(self._cache)
+    
+    def _query(self, flag: str) -> Any:
+        if self._cache is not None and flag in self._cache:
+            self.cacheHits += 1
+            return self._cache[flag]
+        
+        value = self._class_command(self.name, query=True, **{flag: True})
+        if self._cache is not None:
+            self.cacheMisses += 1
+            self._cache[flag] = value
+        return value
+    
+    def _edit(self, flag: str, value: Any) -> None:
+        "Edit one flag and remember `value` as what a query would return"
+        self._class_command(self.name, edit=True, **{flag: value})
+        if self._cache is not None:
+            self._cache[flag] = value
+    
+    def _watch_resize(self) -> None:
+        if QtCore is None: return
+        import maya.OpenMayaUI as omui
+        
+        pointer = omui.MQtUtil.findControl(self.name) or omui.MQtUtil.findLayout(self.name)
+        if pointer:
+            self._resizeWatcher = _ResizeWatcher(self)
+            wrapInstance(int(pointer), QtCore.QObject).installEventFilter(self._resizeWatcher)
+    
+    @staticmethod
+    def cacheStats() -> Dict[str, int]:
+        "Hits and misses summed over every control with caching enabled"
+        controls = list(UIBase._cached_controls)
+        return {
+            "controls": len(controls),
+            "hits":     sum(c.cacheHits   for c in controls),
+            "misses":   sum(c.cacheMisses for c in controls),
+        }
+    
+    @staticmethod
+    def refreshAll() -> None:
+        "`refresh` every control with caching enabled"
+        for control in list(UIBase._cached_controls):
+            if control.exists(): control.refresh()
+    
     # =============================
     # Getters & setters & Properties
     # =============================
     @property
     def annotation(self):
-        return self._class_command(self.name, query=True, annotation=True)
+        return self._query("annotation")
     @annotation.setter
     def annotation(self, ann: str):
-        self._class_command(self.name, edit=True, annotation=ann)
+        self._edit("annotation", ann)
     
     
     @property
     def width(self) -> float:
         # TODO: testing
-        return self._class_command(self.name, query=True, width=True)
+        return self._query("width")
     @width.setter
     def width(self, width: float):
-        self._class_command(self.name, edit=True, width=width)
+        self._edit("width", width)
 
 
     @property
     def height(self) -> float:
         # TODO: testing
-        return self._class_command(self.name, query=True, height=True)
+        return self._query("height")
     @height.setter
     def height(self, height: float):
-        self._class_command(self.name, edit=True, height=height)
+        self._edit("height", height)
 
     @property
     def fullPathName(self) -> str:
@@ -93,9 +182,30 @@ class UIBase(ABC):
         
     def setSize(self, width: int, height: int):
         self._class_command(self.name, edit=True, width=width, height=height)    
+        if self._cache is not None:
+            self._cache.update(width=width, height=height)
         
 
 
+def _invalidate_ref(ref: "weakref.ref[UIBase]") -> None:
+    "`uiDeleted` handler: drop the cache of the control, if the object still exists"
+    if (control := ref()) is not None: control.invalidate()
+
+
+if QtCore is not None:
+    class _ResizeWatcher(QtCore.QObject):
+        "Drops the size entries of a control's cache when its widget is resized"
+        def __init__(self, control: UIBase) -> None:
+            super().__init__()
+            self._control = weakref.ref(control)
+            
+        def eventFilter(self, watched, event) -> bool:
+            if event.type() == QtCore.QEvent.Resize and (control := self._control()) is not None:
+                control.invalidate("width", "height")
+            return False
+
+
+
 # ======================================================================
 # Layouts
 # ======================================================================
@@ -108,7 +218,7 @@ class Layout(UIBase):
     
     @property
     def childArray(self) -> List[str]:
-        return self._class_command(self, query=True, childArray=True)
+        return self._query("childArray")
 
 
 # ======================================================================
@@ -122,16 +232,39 @@ class AttributeSlider(UIBase):
         ''''''
         super().__init__(name)
         self.attribute = attr
+        self._callbacks: List[Callable] = []
+        "value change callbacks, kept to follow `bind`"
+        self._tokens:    List[int] = []
+        "their hub subscriptions, empty while unbound"
 
 
     def set_value_change_callback(self, callback: Callable) -> None:
         '''
         Register a callback function that gets called when the color changes.
+        
+        Changes go through the shared `AttributeCallbackHub`: one listener per
+        node, and at most one call per idle cycle however fast the value moves.
+        '''
+        self._callbacks.append(callback)
+        self._tokens.append(AttributeCallbackHub.instance().subscribe(self.attribute, callback, owner=self.name))
+        
+    def bind(self, attr: str) -> None:
+        '''
+        Point the slider at another attribute, so the control can be reused
+        instead of deleted and created again. Value change callbacks follow.
         '''
-        cmds.scriptJob(
-            attributeChange = [self.attribute, callback], 
-            parent          = self
-        )
+        self.unbind()
+        self._class_command(self.name, edit=True, attribute=attr)
+        self.attribute = attr
+        
+        hub = AttributeCallbackHub.instance()
+        self._tokens = [hub.subscribe(attr, callback, owner=self.name) for callback in self._callbacks]
+        
+    def unbind(self) -> None:
+        "Stop calling the value change callbacks until the next `bind`"
+        hub = AttributeCallbackHub.instance()
+        for token in self._tokens: hub.unsubscribe(token)
+        self._tokens = []
     
     # =============================
     # Getters & Setters
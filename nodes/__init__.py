@@ -1,3 +1,6 @@
 from .node import NodeNames, MayaNode
 from .camera import *
-from .arnold import *
\ No newline at end of file
+from .arnold import *
+from .lightpreset import LightPreset, PresetApplied
+from .curvelibrary import CurveLibrary, Curve
+from .lightbake import LightBake
\ No newline at end of file
@@ -4,17 +4,27 @@
 | Created by Jack on 12/06, 2023
 | Copyright © 2023 jacktogon. All rights reserved.
 ================================================================= """
-import importlib
 from typing import *
 
 import maya.cmds as cmds
 
 import utility.general as gen
-importlib.reload(gen)
 from . import node as nd
-importlib.reload(nd)
+from . import index as idx
 
 
+ARNOLD_LIGHT_SECTIONS: Dict[str, Tuple[str, Tuple[float, float, float]]] = {
+    "Area Lights":         (nd.NodeNames.aiAreaLight.name,         gen.Colors.jasper),
+    "Mesh Lights":         (nd.NodeNames.aiMeshLight.name,         gen.Colors.unreal_neon_purple),
+    "Photometric Lights":  (nd.NodeNames.aiPhotometricLight.name,  gen.Colors.google_blue),
+    "Sky Dome Lights":     (nd.NodeNames.aiSkyDomeLight.name,      gen.Colors.google_red),
+}
+"section label -> (node type, section color), as shown by the light manager"
+
+if (_light_index := globals().get("_light_index")) is not None:
+    _light_index.close() # module reloaded, drop the callbacks of the previous index
+_light_index: idx.NodeTypeIndex | None = None
+
 
 def setRendererToArnold():
     cmds.setAttr("defaultRenderGlobals.currentRenderer", "arnold", type="string")
@@ -23,6 +33,7 @@ def setRendererToArnold():
 
 class AiLight(nd.MayaNode):
     
+    @gen.transaction("AiLight")
     def __init__(self,
         nodename:   nd.NodeNames,
         name:       str, 
@@ -44,28 +55,13 @@ class AiLight(nd.MayaNode):
     # =============================
     # Getters & Setters
     # =============================
-    @property
-    def intensity(self) -> float:
-        return cmds.getAttr(self.shape + '.intensity')
-    @intensity.setter
-    def intensity(self, intensity: float) -> float:
-        return cmds.setAttr(self.shape + '.intensity', intensity)
-    
-    
-    @property
-    def exposure(self) -> float:
-        return cmds.getAttr(self.shape + '.exposure')
-    @exposure.setter
-    def exposure(self, exposure: float) -> float:
-        return cmds.setAttr(self.shape + '.exposure', exposure)
-    
-    
-    @property
-    def normalize(self) -> bool:
-        return cmds.getAttr(self.shape + '.normalize')
-    @normalize.setter
-    def normalize(self, normalize: bool) -> bool:
-        return cmds.setAttr(self.shape + '.normalize', normalize)
+    intensity   = nd.Attribute()
+    exposure    = nd.Attribute()
+    normalize   = nd.Attribute()
+    color       = nd.Attribute()
+    samples     = nd.Attribute("aiSamples")
+    useColorTemperature = nd.Attribute("aiUseColorTemperature")
+    colorTemperature    = nd.Attribute("aiColorTemperature")
     
     # =============================
     # Functions
@@ -74,22 +70,96 @@ class AiLight(nd.MayaNode):
         '''This will check `Illuminates By Default` '''        
         self.connetAttr('instObjGroups[0]', lightSetTransform, 'dagSetMembers')
         
+    
+    @classmethod
+    def create_many(cls,
+        nodename:           nd.NodeNames,
+        names:              Sequence[str],
+        positions:          Sequence[Tuple[float, float, float]] | None = None,
+        rotations:          Sequence[Tuple[float, float, float]] | None = None,
+        lightSetTransform:  str = 'defaultLightSet',
+        undoable:           bool = True,
+    ) -> List["AiLight"]:
+        '''
+        Create many lights of one type in a single undo chunk.
+        
+        Same result as calling `AiLight(...)` per name, but the light set
+        indices are computed once and every light is connected to an explicit
+        index instead of a `nextAvailable` lookup that slows down as the set grows.
+        
+        Params:
+        -------
+        - `names`:      one name per light
+        - `positions`:  optional, one position per light
+        - `rotations`:  optional, one rotation per light
+        - `undoable`:   `False` turns the undo queue off while creating, for
+                        very large batches that do not need to be undone
+        
+        Examples:
+        ---------
+        >>> AiLight.create_many(
+        ...     nd.NodeNames.aiAreaLight,
+        ...     names       = [f"stadiumLight{i}" for i in range(2000)],
+        ...     positions   = [(i * 2.0, 30, 0) for i in range(2000)],
+        ... )
+        '''
+        for label, values in (("positions", positions), ("rotations", rotations)):
+            if values is not None and len(values) != len(names):
+                raise ValueError("Expected one entry in {} per name: {} names, {} {}".format(label, len(names), len(values), label))
+        
+        lights: List[AiLight] = []
+        with gen.transaction("create_many", suspend_undo=not undoable, suspend_refresh=True):
+            first_index = cls._nextSetMemberIndex(lightSetTransform)
+            
+            for i, name in enumerate(names):
+                light = cls.__new__(cls)
+                nd.MayaNode.__init__(light,
+                    name      = name,
+                    transform = (tf := cmds.createNode('transform', name=name)),
+                    shape     = cmds.createNode(nodename.name, name=name + 'Shape', parent=tf)
+                )
+                if positions: cmds.setAttr(tf + '.translate', *positions[i])
+                if rotations: cmds.setAttr(tf + '.rotate',    *rotations[i])
+                
+                cmds.connectAttr(f"{tf}.instObjGroups[0]", f"{lightSetTransform}.dagSetMembers[{first_index + i}]")
+                lights.append(light)
+        return lights
+        
         
         
         
     # =============================
     # Static
     # =============================
+    @staticmethod
+    def _nextSetMemberIndex(lightSetTransform: str) -> int:
+        "First free `dagSetMembers` index after the last one in use"
+        used = cmds.getAttr(f"{lightSetTransform}.dagSetMembers", multiIndices=True) or []
+        return max(used) + 1 if used else 0
+    
+    
+    @staticmethod
+    def lightIndex() -> idx.NodeTypeIndex:
+        '''
+        The scene-wide index of Arnold lights, created on first use.
+        Compare `lightIndex().version` to skip work when no light changed.
+        '''
+        global _light_index
+        if _light_index is None:
+            _light_index = idx.NodeTypeIndex([light_type for light_type, _ in ARNOLD_LIGHT_SECTIONS.values()])
+        return _light_index
+    
+    
     @staticmethod
     def getAllAiLights() -> Dict[str, Tuple[List[str], Tuple[int, ...]]]:
-        arnold_light_types = {
-            "Area Lights":         (nd.NodeNames.aiAreaLight.name,         gen.Colors.jasper),
-            "Mesh Lights":         (nd.NodeNames.aiMeshLight.name,         gen.Colors.unreal_neon_purple),
-            "Photometric Lights":  (nd.NodeNames.aiPhotometricLight.name,  gen.Colors.google_blue),
-            "Sky Dome Lights":     (nd.NodeNames.aiSkyDomeLight.name,      gen.Colors.google_red),
-        }
+        '''
+        Arnold lights grouped by manager section, read from `lightIndex()`.
+        Sections without lights are left out. The lists are shared with the
+        index, treat them as read-only.
+        '''
+        snapshot = AiLight.lightIndex().snapshot()
         aiLights = {}
-        for section, (light_type, color) in arnold_light_types.items():
-            listed_lgt = cmds.ls( type=light_type )
+        for section, (light_type, color) in ARNOLD_LIGHT_SECTIONS.items():
+            listed_lgt = snapshot[light_type]
             if listed_lgt: aiLights[section] = listed_lgt, color
         return aiLights
\ No newline at end of file
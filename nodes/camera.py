@@ -9,6 +9,7 @@ from typing import *
 import maya.cmds as cmds
 
 import utility.general as gen
+from . import node as nd
 from .node import MayaNode
 from utility.parser import normalize_rgb
 
@@ -17,6 +18,7 @@ from utility.parser import normalize_rgb
 class Camera(MayaNode):
     ''' A maya camera '''
     
+    @gen.transaction("Camera")
     def __init__(self, 
         name:               str, 
         is_orthographic:    bool                        = False,
@@ -26,7 +28,7 @@ class Camera(MayaNode):
     ):
         if gen.objExists(name): print(f"{name} already exists, using a different name.")
         self.camera, self.camera_shape = cmds.camera(name=name, orthographic=is_orthographic)
-        super().__init__(transform=self.camera, shape=self.camera_shape)
+        super().__init__(name=name, transform=self.camera, shape=self.camera_shape)
     
         if parent_name: cmds.parent(self.camera, parent_name)
     
@@ -57,52 +59,9 @@ class Camera(MayaNode):
         cmds.rotate(rotation[0], rotation[1], rotation[2], self.camera)
 
     # ~~~~~~~~ cam properties ~~~~~~~~
-    @property
-    def focalLength(self) -> float:
-        return cmds.getAttr(self.camera_shape+'.focalLength')
-    @focalLength.setter
-    def focalLength(self, focal_length: float):
-        return cmds.setAttr(self.camera_shape+'.focalLength', focal_length)
-    
-    
-    @property
-    def has_depthOfField(self) -> bool:
-        """Enabling this will introduce more computational complexity"""
-        return cmds.getAttr(self.camera_shape+'.depthOfField')
-    @has_depthOfField.setter
-    def has_depthOfField(self, value: bool):
-        return cmds.setAttr(self.camera_shape+'.depthOfField', value)
-    
-    
-    @property
-    def focusDistance(self) -> float:
-        "control where the camera should focus. If objects not in range, blurred"
-        return cmds.getAttr(self.camera_shape+'.focusDistance')
-    @focusDistance.setter
-    def focusDistance(self, focusDistance: float):
-        return cmds.setAttr(self.camera_shape+'.focusDistance', focusDistance)
-    
-    
-    @property
-    def fStop(self) -> float:
-        "aperture"
-        return cmds.getAttr(self.camera_shape+'.fStop')
-    @fStop.setter
-    def fStop(self, fStop: float):
-        return cmds.setAttr(self.camera_shape+'.fStop', fStop)
-    
-    
-    @property
-    def is_orthographic(self) -> bool:
-        return cmds.getAttr(self.camera_shape+'.orthographic')
-    @is_orthographic.setter
-    def is_orthographic(self, value: bool):
-        return cmds.setAttr(self.camera_shape+'.orthographic', value)
-    
-    
-    @property
-    def orthographicWidth(self) -> float:
-        return cmds.getAttr(self.camera_shape+'.orthographicWidth')
-    @orthographicWidth.setter
-    def orthographicWidth(self, value: float):
-        return cmds.setAttr(self.camera_shape+'.orthographicWidth', value)
\ No newline at end of file
+    focalLength         = nd.Attribute()
+    has_depthOfField    = nd.Attribute("depthOfField", doc="Enabling this will introduce more computational complexity")
+    focusDistance       = nd.Attribute(doc="control where the camera should focus. If objects not in range, blurred")
+    fStop               = nd.Attribute(doc="aperture")
+    is_orthographic     = nd.Attribute("orthographic")
+    orthographicWidth   = nd.Attribute()
@@ -0,0 +1,421 @@
+""" =================================================================
+| curvelibrary.py -- Python/MayaMedic/nodes/curvelibrary.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+On-disk library of NURBS controllers for the curves manager.
+
+A library is a folder with two files:
+- `index.json`: every controller's color, tags and where its curves are
+- `shapes.bin`: the CV and knot arrays of every curve, float32, back to back
+
+Opening a library only reads the index; browsing and filtering by color or
+tag never touch the shapes. A controller's arrays are read when it is first
+imported and kept in a small LRU cache.
+"""
+
+import json
+import os
+from array import array
+from collections import OrderedDict
+from typing import *
+
+import maya.cmds as cmds
+try:
+    import maya.api.OpenMaya as om
+except ImportError: # outside of a Maya session
+    om = None
+
+import utility.general as gen
+from . import node as nd
+
+FORMAT  = "mayamedic.curvelibrary"
+VERSION = 1
+INDEX   = "index.json"
+SHAPES  = "shapes.bin"
+TYPECODE = "f"
+"float32: plenty for controller shapes, half the size of doubles"
+
+FORM_OPEN, FORM_CLOSED, FORM_PERIODIC = 0, 1, 2
+"`nurbsCurve.form` values"
+
+COLOR_NAMES: Dict[Tuple[float, float, float], str] = {
+    value: name for name, value in vars(gen.Colors).items() if not name.startswith("_")
+}
+"`general.Colors` value -> name"
+
+
+
+class Curve(NamedTuple):
+    '''One NURBS curve of a controller, the arguments of `cmds.curve`'''
+    degree: int
+    form:   int
+    "`FORM_OPEN`, `FORM_CLOSED` or `FORM_PERIODIC`"
+    cvs:    Sequence[float]
+    "flat `x, y, z, x, y, z, ...`; periodic curves repeat their first `degree` CVs"
+    knots:  Sequence[float]
+
+    def points(self) -> List[Tuple[float, float, float]]:
+        return list(zip(self.cvs[0::3], self.cvs[1::3], self.cvs[2::3]))
+
+
+
+class Entry(NamedTuple):
+    '''What the index knows of a controller, without its shape data'''
+    name:   str
+    color:  str | Tuple[float, float, float]
+    "a `general.Colors` name, or an RGB tuple for other colors"
+    tags:   Tuple[str, ...]
+    curves: Tuple[Tuple[int, int, int, int, int], ...]
+    "per curve: `(degree, form, offset, cv count, knot count)`, offset in floats into `shapes.bin`"
+
+    @property
+    def rgb(self) -> Tuple[float, float, float]:
+        return getattr(gen.Colors, self.color) if isinstance(self.color, str) else self.color
+
+
+
+class CurveLibrary:
+    '''
+    Controllers saved on disk, indexed by name, color and tag.
+
+    Examples:
+    ---------
+    >>> library = CurveLibrary("D:/rigging/controllers")
+    >>> library.save("circle_ctrl", CurveLibrary.capture("nurbsCircle1"), color="jasper", tags=["fk"])
+    >>> library.find(color="jasper", tag="fk")
+    ['circle_ctrl', 'square_ctrl']
+    >>> library.import_many(library.find(color="jasper"))
+    ['circle_ctrl', 'square_ctrl']
+    '''
+    def __init__(self, folder: str, cache_size: int = 128) -> None:
+        '''
+        Params:
+        -------
+        - `folder`:     library folder, created on the first `save`
+        - `cache_size`: controllers whose shape data stay in memory
+        '''
+        self.folder     = folder
+        self.cache_size = cache_size
+        self._entries:  Dict[str, Entry] = {}
+        self._by_color: Dict[str | Tuple[float, float, float], Set[str]] = {}
+        self._by_tag:   Dict[str, Set[str]] = {}
+        self._cache:    OrderedDict[str, List[Curve]] = OrderedDict()
+        self._garbage   = 0
+        "floats in `shapes.bin` no controller points to any more, see `compact`"
+
+        if os.path.exists(self._path(INDEX)):
+            with open(self._path(INDEX), encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") != FORMAT or data.get("version", 0) > VERSION:
+                raise ValueError("Not a curve library this version can read: {}".format(folder))
+            self._garbage = data.get("garbage", 0)
+            for name, item in data["controllers"].items():
+                color = item["color"] if isinstance(item["color"], str) else tuple(item["color"])
+                self._add(Entry(name, color, tuple(item["tags"]), tuple(map(tuple, item["curves"]))))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __iter__(self) -> Iterator[Entry]:
+        return iter(self._entries.values())
+
+    def __repr__(self) -> str:
+        return f"CurveLibrary({self.folder!r}, {len(self)} controllers)"
+
+
+    # =============================
+    # Index
+    # =============================
+    def entry(self, name: str) -> Entry:
+        try:                return self._entries[name]
+        except KeyError:    raise KeyError("No controller named {} in {}".format(name, self.folder)) from None
+
+    def colors(self) -> List[str | Tuple[float, float, float]]:
+        return list(self._by_color)
+
+    def tags(self) -> List[str]:
+        return sorted(self._by_tag)
+
+    def find(self, color: str | Tuple[float, float, float] | None = None, tag: str | None = None, text: str = "") -> List[str]:
+        '''
+        Controller names matching every filter given, sorted. Only the index is read.
+
+        Params:
+        -------
+        - `color`:  a `general.Colors` name or its RGB value
+        - `tag`:    one tag
+        - `text`:   part of the name, case insensitive
+        '''
+        names: Set[str] | None = None
+        if color is not None:
+            names = set(self._by_color.get(_color_key(color), ()))
+        if tag is not None:
+            tagged = self._by_tag.get(tag, set())
+            names  = set(tagged) if names is None else names & tagged
+        if names is None:
+            names = set(self._entries)
+        if text:
+            text  = text.lower()
+            names = {name for name in names if text in name.lower()}
+        return sorted(names)
+
+
+    # =============================
+    # Shapes
+    # =============================
+    def curves(self, name: str) -> List[Curve]:
+        "Shape data of a controller, read from disk the first time and then from the cache"
+        if name in self._cache:
+            self._cache.move_to_end(name)
+            return self._cache[name]
+
+        entry  = self.entry(name)
+        curves = []
+        with open(self._path(SHAPES), "rb") as f:
+            for degree, form, offset, cv_count, knot_count in entry.curves:
+                f.seek(offset * array(TYPECODE).itemsize)
+                data = array(TYPECODE)
+                data.fromfile(f, cv_count + knot_count)
+                curves.append(Curve(degree, form, data[:cv_count], data[cv_count:]))
+
+        self._cache[name] = curves
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return curves
+
+
+    def save(self,
+        name:   str,
+        curves: Sequence[Curve],
+        color:  str | Tuple[float, float, float] = "mint_cream",
+        tags:   Sequence[str] = (),
+    ) -> Entry:
+        '''
+        Add a controller, or replace the one with the same name.
+
+        Params:
+        -------
+        - `curves`: its curves, e.g. from `CurveLibrary.capture`
+        - `color`:  a `general.Colors` name, or any RGB
+        '''
+        self.save_many([(name, curves, color, tags)])
+        return self._entries[name]
+
+
+    def save_many(self, controllers: Iterable[Tuple[str, Sequence[Curve], str | Tuple[float, float, float], Sequence[str]]]) -> None:
+        "`save` for many `(name, curves, color, tags)`, with one write of each file. Nothing is written if one is invalid"
+        # ~~~~~~~~ check and convert everything first, a bad controller must not leave data behind ~~~~~~~~
+        checked = []
+        for name, curves, color, tags in controllers:
+            if not curves:
+                raise ValueError("A controller needs at least one curve: {}".format(name))
+            data = []
+            for curve in curves:
+                values = array(TYPECODE, curve.cvs)
+                values.extend(curve.knots)
+                data.append((curve, values))
+            checked.append((name, data, _color_key(color), tuple(tags)))
+        if not checked: return
+
+        os.makedirs(self.folder, exist_ok=True)
+        with open(self._path(SHAPES), "ab") as f:
+            offset = f.tell() // array(TYPECODE).itemsize
+            for name, data, color, tags in checked:
+                layout = []
+                for curve, values in data:
+                    values.tofile(f)
+                    layout.append((curve.degree, curve.form, offset, len(curve.cvs), len(curve.knots)))
+                    offset += len(values)
+
+                if name in self._entries:
+                    self._garbage += sum(cvs + knots for *_, cvs, knots in self._remove(name).curves)
+                self._add(Entry(name, color, tags, tuple(layout)))
+                self._cache.pop(name, None)
+        self._write_index()
+
+
+    def remove(self, name: str) -> None:
+        self.entry(name)
+        self._garbage += sum(cvs + knots for *_, cvs, knots in self._remove(name).curves)
+        self._cache.pop(name, None)
+        self._write_index()
+
+
+    def retag(self, name: str, color: str | Tuple[float, float, float] | None = None, tags: Sequence[str] | None = None) -> Entry:
+        "Change a controller's color and/or tags; its shape data is left alone"
+        entry = self._remove(self.entry(name).name)
+        self._add(entry._replace(
+            color = entry.color if color is None else _color_key(color),
+            tags  = entry.tags  if tags  is None else tuple(tags),
+        ))
+        self._write_index()
+        return self._entries[name]
+
+
+    def compact(self) -> int:
+        "Rewrite `shapes.bin` without the data of removed or replaced controllers. Returns the floats dropped"
+        if not self._garbage: return 0
+        dropped = self._garbage
+
+        entries = []
+        data    = array(TYPECODE)
+        with open(self._path(SHAPES), "rb") as f:
+            for entry in self._entries.values():
+                layout = []
+                for degree, form, offset, cv_count, knot_count in entry.curves:
+                    f.seek(offset * data.itemsize)
+                    layout.append((degree, form, len(data), cv_count, knot_count))
+                    data.fromfile(f, cv_count + knot_count)
+                entries.append(entry._replace(curves=tuple(layout)))
+
+        with open(self._path(SHAPES) + ".tmp", "wb") as f:
+            data.tofile(f)
+        os.replace(self._path(SHAPES) + ".tmp", self._path(SHAPES))
+        for entry in entries: self._entries[entry.name] = entry
+        self._garbage = 0
+        self._write_index()
+        return dropped
+
+
+    # =============================
+    # Scene
+    # =============================
+    def import_controller(self, name: str, new_name: str | None = None) -> str:
+        "Build a controller in the scene, returns its transform"
+        return self.import_many([name], [new_name] if new_name else None)[0]
+
+
+    def import_many(self, names: Sequence[str], new_names: Sequence[str] | None = None) -> List[str]:
+        '''
+        Build many controllers in one undo chunk, viewport refresh suspended.
+        Curves of a multi-shape controller are merged under one transform
+        with a single `parent` call, and the transforms left empty are
+        deleted together at the end; each controller is colored once, on its
+        transform.
+
+        Returns:
+        --------
+        - the created transforms, in the order of `names`
+        '''
+        new_names = list(new_names) if new_names is not None else list(names)
+        if len(new_names) != len(names):
+            raise ValueError("Expected one new name per controller: {} names, {} new names".format(len(names), len(new_names)))
+        entries = [self.entry(name) for name in names]
+        shapes  = [self.curves(name) for name in names] # read everything before creating anything
+
+        created = []
+        emptied = []
+        with gen.transaction("import controllers", suspend_refresh=True):
+            for entry, curves, new_name in zip(entries, shapes, new_names):
+                transforms = [_create_curve(curve, new_name) for curve in curves]
+                transform  = transforms[0]
+                if len(transforms) > 1:
+                    extra_shapes = cmds.listRelatives(transforms[1:], shapes=True, fullPath=True)
+                    cmds.parent(extra_shapes, transform, shape=True, relative=True)
+                    emptied.extend(transforms[1:])
+
+                cmds.setAttr(transform + ".overrideEnabled", True)
+                cmds.setAttr(transform + ".overrideRGBColors", True)
+                cmds.setAttr(transform + ".overrideColorRGB", *entry.rgb)
+                created.append(transform)
+            if emptied: cmds.delete(emptied)
+        return created
+
+
+    @staticmethod
+    def capture(transform: str) -> List[Curve]:
+        '''
+        Curves of every `nurbsCurve` shape under `transform`, in object space.
+        Read through OpenMaya when available, otherwise with a `curveInfo` node.
+        '''
+        shapes = cmds.listRelatives(transform, shapes=True, type=nd.NodeNames.nurbsCurve.name, fullPath=True) or []
+        if not shapes:
+            raise ValueError("No NURBS curve under {}".format(transform))
+
+        curves = []
+        for shape in shapes:
+            if om is not None:
+                fn = om.MFnNurbsCurve(om.MSelectionList().add(shape).getDagPath(0))
+                cvs = [coord for point in fn.cvPositions(om.MSpace.kObject) for coord in (point.x, point.y, point.z)]
+                curves.append(Curve(fn.degree, fn.form - 1, cvs, list(fn.knots()))) # MFnNurbsCurve forms start at 1
+                continue
+
+            # CVs and knots from the same node: `shape.cv[*]` leaves out the CVs a periodic curve repeats
+            info = cmds.createNode("curveInfo")
+            try:
+                cmds.connectAttr(shape + ".local", info + ".inputCurve")
+                knots  = cmds.getAttr(info + ".knots")[0]
+                points = cmds.getAttr(info + ".controlPoints[*]")
+            finally:
+                cmds.delete(info)
+            cvs = [coord for point in points for coord in point]
+            curves.append(Curve(cmds.getAttr(shape + ".degree"), cmds.getAttr(shape + ".form"), cvs, list(knots)))
+        return curves
+
+
+    # =============================
+    # Private
+    # =============================
+    def _path(self, file: str) -> str:
+        return os.path.join(self.folder, file)
+
+
+    def _add(self, entry: Entry) -> None:
+        self._entries[entry.name] = entry
+        self._by_color.setdefault(entry.color, set()).add(entry.name)
+        for tag in entry.tags:
+            self._by_tag.setdefault(tag, set()).add(entry.name)
+
+
+    def _remove(self, name: str) -> Entry:
+        entry = self._entries.pop(name)
+        for key, index in [(entry.color, self._by_color)] + [(tag, self._by_tag) for tag in entry.tags]:
+            index[key].discard(name)
+            if not index[key]: del index[key]
+        return entry
+
+
+    def _write_index(self) -> None:
+        data = {
+            "format":       FORMAT,
+            "version":      VERSION,
+            "garbage":      self._garbage,
+            "controllers":  {
+                entry.name: {"color": entry.color, "tags": entry.tags, "curves": entry.curves}
+                for entry in self._entries.values()
+            },
+        }
+        with open(self._path(INDEX) + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(self._path(INDEX) + ".tmp", self._path(INDEX)) # never leave a half written index
+
+
+
+def _color_key(color: str | Sequence[float]) -> str | Tuple[float, float, float]:
+    "A `general.Colors` name for named colors, the RGB tuple otherwise"
+    if isinstance(color, str):
+        if color not in COLOR_NAMES.values():
+            raise ValueError("Unknown color name, expected one of general.Colors: {}".format(color))
+        return color
+    rgb = tuple(float(v) for v in color)
+    if len(rgb) != 3:
+        raise ValueError("Expected an RGB color: {}".format(color))
+    return COLOR_NAMES.get(rgb, rgb)
+
+
+def _create_curve(curve: Curve, name: str) -> str:
+    "One `cmds.curve` call, returns the new transform"
+    return cmds.curve(
+        name     = name,
+        degree   = curve.degree,
+        point    = curve.points(),
+        knot     = list(curve.knots),
+        periodic = curve.form == FORM_PERIODIC,
+    )
@@ -0,0 +1,154 @@
+""" =================================================================
+| index.py -- Python/MayaMedic/nodes/index.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+from typing import *
+
+import maya.cmds as cmds
+try:
+    import maya.api.OpenMaya as om
+except ImportError: # outside of a Maya session
+    om = None
+
+
+
+class NodeTypeIndex:
+    '''
+    Persistent index of the scene nodes of some types.
+
+    The scene is scanned once, then kept up to date through node
+    added / removed / renamed callbacks, so reading the index never goes
+    back to the command layer. `version` is bumped on every change;
+    consumers can compare it to the last one they saw and skip work.
+
+    Without OpenMaya there is nothing to listen to, and `snapshot` falls
+    back to one `cmds.ls` per call.
+
+    Examples:
+    ---------
+    >>> index = NodeTypeIndex(["aiAreaLight", "aiSkyDomeLight"])
+    >>> index.snapshot()
+    {'aiAreaLight': ['aiAreaLightShape1'], 'aiSkyDomeLight': []}
+    >>> index.version
+    1
+    >>> index.close()
+    '''
+    def __init__(self, node_types: Sequence[str]) -> None:
+        self.node_types = tuple(node_types)
+        self.version    = 0
+
+        self._handles:      Dict[str, Dict[int, "om.MObjectHandle"]] = {t: {} for t in self.node_types}
+        "node type -> {handle hash: handle}"
+        self._snapshot:     Dict[str, List[str]] = {}
+        self._snapshot_ver  = -1
+        self._callback_ids: List[int] = []
+
+        self.rescan()
+        self._register_callbacks()
+
+    def __del__(self):
+        self.close()
+
+    def __len__(self) -> int:
+        return sum(len(handles) for handles in self._handles.values())
+
+
+    # =============================
+    # functions
+    # =============================
+    def snapshot(self) -> Dict[str, List[str]]:
+        '''
+        Names per node type, rebuilt only when the index changed since the
+        last call. The returned dict is shared, treat it as read-only.
+        '''
+        if om is None:
+            self.rescan()
+
+        if self._snapshot_ver != self.version:
+            self._snapshot = {
+                node_type: [name for handle in handles.values() if (name := self._name(handle))]
+                for node_type, handles in self._handles.items()
+            }
+            self._snapshot_ver = self.version
+        return self._snapshot
+
+
+    def rescan(self) -> None:
+        "Rebuild the index from one `cmds.ls` over every indexed type"
+        listed = cmds.ls(type=list(self.node_types), showType=True) or []
+        names_types = list(zip(listed[0::2], listed[1::2]))
+
+        if om is None:
+            snapshot = {t: [] for t in self.node_types}
+            for name, node_type in names_types: snapshot[node_type].append(name)
+            if snapshot != self._snapshot:
+                self._snapshot = snapshot
+                self.version  += 1
+            self._snapshot_ver = self.version
+            return
+
+        handles = {t: {} for t in self.node_types}
+        selection = om.MSelectionList()
+        for name, node_type in names_types:
+            selection.clear()
+            selection.add(name)
+            handle = om.MObjectHandle(selection.getDependNode(0))
+            handles[node_type][handle.hashCode()] = handle
+        self._handles  = handles
+        self.version  += 1
+
+
+    def close(self) -> None:
+        "Remove every callback registered by this index"
+        if om is not None and self._callback_ids:
+            om.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+
+
+    # =============================
+    # callbacks
+    # =============================
+    def _register_callbacks(self) -> None:
+        if om is None: return
+
+        for node_type in self.node_types:
+            self._callback_ids.append(om.MDGMessage.addNodeAddedCallback(self._on_added, node_type, node_type))
+            self._callback_ids.append(om.MDGMessage.addNodeRemovedCallback(self._on_removed, node_type, node_type))
+        self._callback_ids.append(om.MNodeMessage.addNameChangedCallback(om.MObject(), self._on_renamed))
+
+        for message in (om.MSceneMessage.kAfterOpen, om.MSceneMessage.kAfterNew, om.MSceneMessage.kAfterImport):
+            self._callback_ids.append(om.MSceneMessage.addCallback(message, self._on_scene_changed))
+
+
+    def _on_added(self, mobject: "om.MObject", node_type: str) -> None:
+        handle = om.MObjectHandle(mobject)
+        self._handles[node_type][handle.hashCode()] = handle
+        self.version += 1
+
+    def _on_removed(self, mobject: "om.MObject", node_type: str) -> None:
+        if self._handles[node_type].pop(om.MObjectHandle(mobject).hashCode(), None) is not None:
+            self.version += 1
+
+    def _on_renamed(self, mobject: "om.MObject", previous_name: str, *args) -> None:
+        key = om.MObjectHandle(mobject).hashCode()
+        if any(key in handles for handles in self._handles.values()):
+            self.version += 1
+
+    def _on_scene_changed(self, *args) -> None:
+        self.rescan()
+
+
+    # =============================
+    # Static
+    # =============================
+    @staticmethod
+    def _name(handle: "om.MObjectHandle") -> str | None:
+        "Shortest unique name (what `cmds.ls` returns), `None` once the node is gone"
+        if not handle.isValid(): return None
+        mobject = handle.object()
+        if mobject.hasFn(om.MFn.kDagNode):
+            return om.MDagPath.getAPathTo(mobject).partialPathName()
+        return om.MFnDependencyNode(mobject).name()
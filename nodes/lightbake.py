@@ -0,0 +1,280 @@
+""" =================================================================
+| lightbake.py -- Python/MayaMedic/nodes/lightbake.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+Bake color temperature, intensity and exposure animation onto Arnold lights.
+
+Every frame of every light is evaluated at once with NumPy, then each
+attribute gets one anim curve whose keys are written with a single
+`setAttr curve.ktv[0:n]` call, instead of one `setKeyframe` per frame.
+Keys that a straight line through their neighbours already reproduces
+(within `tolerance`) can be dropped before writing.
+"""
+
+import time
+from typing import *
+
+import maya.cmds as cmds
+try:
+    import numpy as np
+except ImportError: # importing the module works without it, baking does not
+    np = None
+
+import utility.general as gen
+from utility.parser import kelvin_to_rgb_array
+from . import node as nd
+
+CHANNELS = ("temperature", "intensity", "exposure")
+COLOR_PLUGS = ("colorR", "colorG", "colorB")
+CURVE_TYPE  = "animCurveTU"
+
+Channel = Union[float, Sequence[Tuple[float, float]], Callable[["np.ndarray"], "np.ndarray"], "np.ndarray"]
+'''
+How a channel changes over time:
+- a number: constant
+- `(frame, value)` pairs: linear in between, held before the first / after the last
+- a function of the frame array, returning one value per frame
+- an array with one value per baked frame
+'''
+
+
+
+class BakeResult(NamedTuple):
+    curves:     List[str]
+    "anim curves created"
+    keys:       int
+    "keys written"
+    dropped:    int
+    "keys removed by `tolerance`"
+    seconds:    float
+
+
+
+class LightBake:
+    '''
+    Per-light animation curves, evaluated and keyed in bulk.
+
+    `temperature` is baked as keys on `colorR/G/B` (the light's
+    `aiUseColorTemperature` is turned off so the color is used), or, with
+    `color_from_temperature=False`, as keys on `aiColorTemperature` with
+    the temperature switch turned on.
+
+    Examples:
+    ---------
+    >>> bake = LightBake(1, 1000)
+    >>> for light in street_lights:
+    ...     bake.add(light, temperature=[(1, 1900), (500, 6500), (1000, 1900)],
+    ...                     intensity=lambda frames: 2 + np.sin(frames / 24))
+    >>> bake.bake(tolerance=1e-3)
+    BakeResult(curves=[...], keys=84210, dropped=715790, seconds=1.9)
+    '''
+    def __init__(self, start: float, end: float, step: float = 1.0) -> None:
+        '''
+        Params:
+        -------
+        - `start`, `end`:   frame range, both included
+        - `step`:           frames between two samples
+        '''
+        if np is None:
+            raise ImportError("LightBake needs numpy")
+        if end < start or step <= 0:
+            raise ValueError("Invalid frame range: {} to {} by {}".format(start, end, step))
+        self.frames = np.arange(start, end + step / 2, step, dtype=float)
+        self.lights: Dict[str, Dict[str, Channel]] = {}
+        "light shape -> channel -> curve, in the order added"
+
+
+    def add(self,
+        light:          Union[nd.MayaNode, str],
+        temperature:    Channel | None = None,
+        intensity:      Channel | None = None,
+        exposure:       Channel | None = None,
+    ) -> "LightBake":
+        "Animate a light (an `AiLight` or a shape name); channels left `None` are not baked"
+        shape    = light.shape if isinstance(light, nd.MayaNode) else light
+        channels = {name: curve for name, curve in zip(CHANNELS, (temperature, intensity, exposure)) if curve is not None}
+        if not channels:
+            raise ValueError("Nothing to bake on {}: give a temperature, intensity or exposure".format(shape))
+        self.lights.setdefault(shape, {}).update(channels)
+        return self
+
+
+    # =============================
+    # Evaluation
+    # =============================
+    def evaluate(self, color_from_temperature: bool = True) -> Dict[str, "np.ndarray"]:
+        '''
+        Every baked plug with one value per frame.
+
+        Returns:
+        --------
+        - `{"lightShape.attr": values}`; temperatures are converted to colors
+          with one `kelvin_to_rgb_array` call for all lights
+        '''
+        values: Dict[str, np.ndarray] = {}
+        temperatures: List[Tuple[str, np.ndarray]] = []
+
+        for shape, channels in self.lights.items():
+            for channel, curve in channels.items():
+                samples = self._sample(curve, f"{shape} {channel}")
+                if channel != "temperature":
+                    values[f"{shape}.{channel}"] = samples
+                elif color_from_temperature:
+                    temperatures.append((shape, samples))
+                else:
+                    values[f"{shape}.aiColorTemperature"] = samples
+
+        if temperatures:
+            rgb = kelvin_to_rgb_array(np.stack([samples for _, samples in temperatures]))
+            rgb = rgb.reshape(len(temperatures), len(self.frames), 3)
+            for (shape, _), light_rgb in zip(temperatures, rgb):
+                for i, plug in enumerate(COLOR_PLUGS):
+                    values[f"{shape}.{plug}"] = light_rgb[:, i]
+        return values
+
+
+    def _sample(self, curve: Channel, label: str) -> "np.ndarray":
+        frames = self.frames
+        if callable(curve):
+            samples = np.broadcast_to(np.asarray(curve(frames), dtype=float), frames.shape)
+        elif np.isscalar(curve):
+            samples = np.full(frames.shape, float(curve))
+        else:
+            curve = np.asarray(curve, dtype=float)
+            if curve.ndim == 2 and curve.shape[1] == 2:
+                order   = np.argsort(curve[:, 0], kind="stable")
+                samples = np.interp(frames, curve[order, 0], curve[order, 1])
+            elif curve.shape == frames.shape:
+                samples = curve
+            else:
+                raise ValueError("{}: expected (frame, value) pairs or {} values, got shape {}".format(label, len(frames), curve.shape))
+        if not np.all(np.isfinite(samples)):
+            raise ValueError("{}: the curve gives non finite values".format(label))
+        return samples
+
+
+    # =============================
+    # Writing
+    # =============================
+    def bake(self, tolerance: float = 0.0, color_from_temperature: bool = True, replace: bool = True) -> BakeResult:
+        '''
+        Evaluate and key everything in one undo chunk, viewport refresh suspended.
+
+        Each plug gets one new anim curve, its keys set by one `setAttr`
+        on the curve's `keyTimeValue` range, with linear tangents.
+
+        Params:
+        -------
+        - `tolerance`:  drop keys the linear interpolation of the remaining
+                        ones reproduces within this much; `0` keeps only
+                        exactly redundant keys out (still removes holds)
+        - `replace`:    delete the anim curves already driving the baked plugs
+        '''
+        start   = time.perf_counter()
+        values  = self.evaluate(color_from_temperature)
+        curves: List[str] = []
+        keys = dropped = 0
+
+        with gen.transaction("bake lights", suspend_refresh=True):
+            if replace and values:
+                old = cmds.listConnections(list(values), source=True, destination=False, type="animCurve")
+                if old: cmds.delete(list(dict.fromkeys(old)))
+
+            for shape in self.lights:
+                if "temperature" not in self.lights[shape]: continue
+                cmds.setAttr(f"{shape}.aiUseColorTemperature", not color_from_temperature)
+
+            masks = reduce_keys(self.frames, np.stack(list(values.values())), tolerance) if values else []
+            for (plug, samples), kept in zip(values.items(), masks):
+                count    = int(kept.sum())
+                keys    += count
+                dropped += len(samples) - count
+
+                curve = cmds.createNode(CURVE_TYPE, name=plug.rsplit("|", 1)[-1].replace(".", "_"), skipSelect=True) # DAG paths make invalid names
+                timed = np.empty(2 * count)
+                timed[0::2], timed[1::2] = self.frames[kept], samples[kept]
+                cmds.setAttr(f"{curve}.ktv[0:{count - 1}]", *timed.tolist())
+                cmds.connectAttr(f"{curve}.output", plug, force=True)
+                curves.append(curve)
+
+            if curves: cmds.keyTangent(curves, inTangentType="linear", outTangentType="linear")
+        return BakeResult(curves, keys, dropped, time.perf_counter() - start)
+
+
+
+def reduce_keys(frames: "np.ndarray", values: "np.ndarray", tolerance: float = 0.0) -> "np.ndarray":
+    '''
+    Keys to keep so that linear interpolation between them stays within
+    `tolerance` of every original sample.
+
+    Works on all the curves at once: each pass tries to drop every other
+    remaining key, checking the line between its kept neighbours against
+    every original sample it spans, so the bound always holds. Passes
+    repeat until nothing more can go. A curve that never leaves
+    `tolerance` keeps a single key.
+
+    Params:
+    -------
+    - `values`: one curve `(frames,)` or many `(curves, frames)`
+
+    Returns:
+    --------
+    - boolean mask shaped like `values`, `True` for the keys to keep
+
+    Examples:
+    ---------
+    >>> reduce_keys(np.arange(5.0), np.array([0, 1, 2, 2, 2]))
+    array([ True, False,  True, False,  True])
+    '''
+    values = np.asarray(values, dtype=float)
+    curves = values.reshape(-1, values.shape[-1])
+    count, length = curves.shape
+    keep = np.ones(curves.shape, dtype=bool)
+    if length <= 2: return keep.reshape(values.shape)
+
+    # one flat timeline, every curve's first and last key pinned so segments never span two curves
+    times = np.tile(np.asarray(frames, dtype=float), count)
+    flat  = curves.ravel()
+    flat_curves = np.ptp(curves, axis=1) <= tolerance
+    keep[flat_curves, 1:-1] = False # any line between two of their samples fits
+    keep = keep.ravel()
+    pinned = np.zeros(keep.shape, dtype=bool)
+    pinned[0::length] = pinned[length - 1::length] = True
+    settled = pinned.copy()
+    "pinned, or failed to go and no neighbour changed since"
+
+    idle = 0
+    parity = 0
+    while idle < 2: # both parities found nothing to try
+        kept = np.flatnonzero(keep)
+        middle = np.arange(1 + parity, len(kept) - 1, 2)
+        middle = middle[~settled[kept[middle]]]
+        parity ^= 1
+        if not len(middle):
+            idle += 1
+            continue
+        idle = 0
+
+        first, last = kept[middle - 1], kept[middle + 1]
+        # ~~~~~~~~ every sample of every candidate segment, worst error per segment ~~~~~~~~
+        lengths = last - first
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        segment = np.repeat(np.arange(len(middle)), lengths)
+        sample  = first[segment] + np.arange(lengths.sum()) - offsets[segment]
+        a, b    = first[segment], last[segment]
+        line    = flat[a] + (flat[b] - flat[a]) * (times[sample] - times[a]) / (times[b] - times[a])
+        error   = np.maximum.reduceat(np.abs(line - flat[sample]), offsets)
+
+        removable = error <= tolerance + 1e-12
+        keep[kept[middle[removable]]] = False
+        settled[kept[middle[~removable]]] = True
+        for neighbours in (first[removable], last[removable]): # they have a new segment to try
+            settled[neighbours] = pinned[neighbours]
+
+    keep = keep.reshape(count, length)
+    keep[flat_curves, 1:] = False
+    return keep.reshape(values.shape)
@@ -0,0 +1,197 @@
+""" =================================================================
+| lightpreset.py -- Python/MayaMedic/nodes/lightpreset.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+Light presets: the state of every Arnold light captured in one pass and
+re-applied in one undo chunk, writing only the attributes that differ.
+
+Presets are stored column by column (one list per attribute), which keeps
+the file small and lets a preset be read or compared one attribute at a
+time. A path ending in `.gz` is compressed.
+"""
+
+import gzip
+import json
+import time
+from typing import *
+
+import utility.general as gen
+from . import node as nd
+from . import plugs
+from .arnold import AiLight
+
+FORMAT  = "mayamedic.lightpreset"
+VERSION = 1
+
+ATTRIBUTES: Tuple[str, ...] = tuple(name for name, value in vars(AiLight).items() if isinstance(value, nd.Attribute))
+"every `AiLight` attribute: intensity, exposure, normalize, color, samples, ..."
+
+
+
+class PresetApplied(NamedTuple):
+    writes:     int
+    "`setAttr` calls issued"
+    lights:     List[str]
+    "lights that had at least one attribute changed"
+    missing:    List[str]
+    "lights of the preset that are not in the scene, left out"
+    seconds:    float
+
+
+
+class LightPreset:
+    '''
+    Values of `attributes` for a list of lights.
+
+    Examples:
+    ---------
+    >>> LightPreset.capture("day").save("presets/day.json")
+    >>> night = LightPreset.load("presets/night.json")
+    >>> night.diff()                     # what applying it would change
+    {'keyLightShape': {'intensity': 0.5, 'color': [0.4, 0.5, 1.0]}}
+    >>> night.apply()                    # one undo chunk
+    PresetApplied(writes=2, lights=['keyLightShape'], missing=[], seconds=0.01)
+    '''
+    def __init__(self, lights: Sequence[str], columns: Dict[str, Sequence[Any]], name: str = "") -> None:
+        '''
+        Params:
+        -------
+        - `lights`:     light shapes
+        - `columns`:    attribute -> one value per light
+        '''
+        for attr, values in columns.items():
+            if len(values) != len(lights):
+                raise ValueError("Expected one {} value per light: {} lights, {} values".format(attr, len(lights), len(values)))
+        self.name       = name
+        self.lights     = list(lights)
+        self.columns    = {attr: list(values) for attr, values in columns.items()}
+
+    def __len__(self) -> int:
+        return len(self.lights)
+
+    def __repr__(self) -> str:
+        return f"LightPreset({self.name!r}, {len(self)} lights, {list(self.columns)})"
+
+
+    @property
+    def attributes(self) -> List[str]:
+        return list(self.columns)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        "One `{attribute: value}` dict per light, the layout `AiLight.set_many` takes"
+        return [dict(zip(self.columns, values)) for values in zip(*self.columns.values())] if self.columns \
+            else [{} for _ in self.lights]
+
+
+    # =============================
+    # Scene
+    # =============================
+    @classmethod
+    def capture(cls,
+        name:       str = "",
+        lights:     Sequence[str] | None = None,
+        attributes: Sequence[str] = ATTRIBUTES,
+    ) -> "LightPreset":
+        '''
+        Read `attributes` of `lights` (every Arnold light by default) in one pass.
+        '''
+        if lights is None:
+            lights = [shape for shapes, _ in AiLight.getAllAiLights().values() for shape in shapes]
+        values = AiLight.get_many(lights, attributes)
+        return cls(lights, {attr: [_plain(row[attr]) for row in values] for attr in attributes}, name)
+
+
+    def diff(self) -> Dict[str, Dict[str, Any]]:
+        '''
+        Attributes whose scene value differs from the preset.
+
+        Returns:
+        --------
+        - light -> `{attribute: preset value}`, only lights with differences
+        '''
+        return self._diff(self._present())[0]
+
+
+    def apply(self, undoable: bool = True) -> PresetApplied:
+        '''
+        Write the preset values that differ from the scene, all in one undo
+        chunk. Lights not in the scene are skipped and reported in `missing`.
+
+        Params:
+        -------
+        - `undoable`:   `False` keeps the writes out of the undo queue
+        '''
+        start   = time.perf_counter()
+        present = self._present()
+        changes, missing = self._diff(present)
+
+        writes = 0
+        if changes:
+            with gen.transaction(f"Apply light preset {self.name}".strip(), suspend_undo=not undoable, suspend_refresh=True):
+                writes = AiLight.set_many(list(changes), list(changes.values()), only_changed=False)
+        return PresetApplied(writes, list(changes), missing, time.perf_counter() - start)
+
+
+    def _present(self) -> Set[str]:
+        "Preset lights found in the scene"
+        scene = {shape for shapes, _ in AiLight.getAllAiLights().values() for shape in shapes}
+        return {light for light in self.lights if light in scene}
+
+
+    def _diff(self, present: Set[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        indices = [i for i, light in enumerate(self.lights) if light in present]
+        lights  = [self.lights[i] for i in indices]
+        current = AiLight.get_many(lights, self.attributes)
+
+        changes: Dict[str, Dict[str, Any]] = {}
+        for attr, column in self.columns.items():
+            for light, i, values in zip(lights, indices, current):
+                if not plugs.same_value(values[attr], column[i]):
+                    changes.setdefault(light, {})[attr] = column[i]
+        return changes, [light for light in self.lights if light not in present]
+
+
+    # =============================
+    # File
+    # =============================
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format":   FORMAT,
+            "version":  VERSION,
+            "name":     self.name,
+            "lights":   self.lights,
+            "columns":  self.columns,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LightPreset":
+        if data.get("format") != FORMAT or data.get("version", 0) > VERSION:
+            raise ValueError("Not a light preset this version can read: {} {}".format(data.get("format"), data.get("version")))
+        return cls(data["lights"], data["columns"], data.get("name", ""))
+
+
+    def save(self, path: str) -> str:
+        with _open(path, "wt") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "LightPreset":
+        with _open(path, "rt") as f:
+            return cls.from_dict(json.load(f))
+
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"): return gzip.open(path, mode, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _plain(value: Any) -> Any:
+    "`[(r, g, b)]` from `getAttr` -> `[r, g, b]`, the rest unchanged"
+    if isinstance(value, list) and len(value) == 1 and isinstance(value[0], tuple): value = value[0]
+    return list(value) if isinstance(value, tuple) else value
@@ -5,10 +5,19 @@
 | Copyright © 2023 jacktogon. All rights reserved.
 ================================================================= """
 
+import weakref
+from contextlib import contextmanager
 from typing import *
 from enum import Enum, auto
 
 import maya.cmds as cmds
+try:
+    import maya.api.OpenMaya as om
+except ImportError: # outside of a Maya session
+    om = None
+
+import utility.general as gen
+from . import plugs
 
 LJUST = 15
 
@@ -68,17 +77,79 @@ class NodeNames(__AutoName):
 
 
 
+class Attribute:
+    '''
+    An attribute of the node's shape, declared once on a `MayaNode` subclass.
+    
+    Reads are cached until Maya reports the plug dirty (with OpenMaya;
+    without it every read goes to Maya). Writes go straight to Maya, except
+    inside `node.batch()` where they are buffered until `flush()`, and drop
+    the cached value: the next read returns what `getAttr` gives.
+    
+    Examples:
+    ---------
+    >>> class AiLight(MayaNode):
+    ...     intensity = Attribute()
+    ...     has_shadows = Attribute("castShadows", doc="Shadows on or off")
+    '''
+    def __init__(self, attr: str | None = None, doc: str | None = None) -> None:
+        '''
+        Params:
+        -------
+        - `attr`: attribute on the shape, defaults to the python name
+        '''
+        self.attr    = attr
+        self.name    = attr
+        self.__doc__ = doc
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.attr = self.attr or name
+        if self.attr != name: # keep `get_many` / `set_many` aliases in one place
+            if "_ATTRIBUTE_ALIASES" not in owner.__dict__:
+                owner._ATTRIBUTE_ALIASES = dict(owner._ATTRIBUTE_ALIASES)
+            owner._ATTRIBUTE_ALIASES[name] = self.attr
+    
+    def __get__(self, node: "MayaNode | None", owner: type) -> Any:
+        if node is None: return self
+        return node._read(self.attr)
+    
+    def __set__(self, node: "MayaNode", value: Any) -> None:
+        node._write(self.attr, value)
+    
+    def __repr__(self) -> str:
+        return f"Attribute({self.attr!r})"
+
+
+
+
+
 class MayaNode:
     '''Maya Base Node'''
     
+    _ATTRIBUTE_ALIASES: Dict[str, str] = {}
+    "python property name -> attribute on the shape, when they differ (see `get_many`)"
+    
     def __init__(self, name:str, transform: str, shape: str, verbose=False) -> None:
         self.transform   = transform
         self.shape       = shape
         
+        self._values:   Dict[str, Any] = {}
+        "attribute -> last value read or written, dropped when the plug gets dirty"
+        self._pending:  Dict[str, Any] = {}
+        "attribute -> value waiting for `flush`"
+        self._plugs:    Dict[str, Any] = {}
+        self._batch_depth   = 0
+        self._callback_ids: List[int] = []
+        
         if verbose:
             print(f"[CREATED] Node: {name:<{LJUST}} | Transform: {self.transform:<{LJUST}} | Shape: {self.shape:<{LJUST}}")
     
     
+    def __del__(self):
+        if getattr(self, "_callback_ids", None): self.close()
+    
+    
     def hide(self) -> None:
         cmds.hide(self.transform)
         
@@ -98,4 +169,228 @@ class MayaNode:
         
         
     def disconnectAttr(self):
-        raise NotImplementedError()
\ No newline at end of file
+        raise NotImplementedError()
+    
+    
+    # =============================
+    # Attributes
+    # =============================
+    @contextmanager
+    def batch(self):
+        '''
+        Buffer attribute writes and send them together when the block ends.
+        Reads inside the block see the buffered values. Nothing is written
+        if the block raises.
+        
+        Examples:
+        ---------
+        >>> with light.batch():
+        ...     light.intensity = 4
+        ...     light.exposure  = 2
+        ...     light.normalize = False
+        '''
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            if self._batch_depth == 1: self._pending.clear()
+            raise
+        finally:
+            self._batch_depth -= 1
+        if self._batch_depth == 0: self.flush()
+    
+    
+    def flush(self) -> int:
+        "Write the buffered attributes, skipping values Maya already has. Returns the number of `setAttr` calls"
+        return MayaNode.flush_many([self])
+    
+    
+    def invalidate(self, *attributes: str) -> None:
+        "Forget the cached value of `attributes`, or of every attribute"
+        if not attributes: self._values.clear()
+        for attr in attributes: self._values.pop(attr, None)
+    
+    
+    def close(self) -> None:
+        "Stop watching the node. Reads keep working, uncached"
+        if om is not None and self._callback_ids:
+            om.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+        self._values.clear()
+    
+    
+    @staticmethod
+    @contextmanager
+    def batch_many(nodes: Sequence["MayaNode"]):
+        '''
+        `batch` over many nodes at once: every write is sent in one undo chunk
+        when the block ends.
+        
+        Examples:
+        ---------
+        >>> with MayaNode.batch_many(lights):
+        ...     for light in lights: light.exposure += 1
+        '''
+        for node in nodes: node._batch_depth += 1
+        try:
+            yield nodes
+        except BaseException:
+            for node in nodes:
+                if node._batch_depth == 1: node._pending.clear()
+            raise
+        finally:
+            for node in nodes: node._batch_depth -= 1
+        MayaNode.flush_many([node for node in nodes if node._batch_depth == 0])
+    
+    
+    @staticmethod
+    def flush_many(nodes: Iterable["MayaNode"]) -> int:
+        "Write the buffered attributes of many nodes in one undo chunk"
+        writes: List[Tuple[MayaNode, str, Any]] = []
+        for node in nodes:
+            pending, node._pending = node._pending, {}
+            writes.extend((node, attr, value) for attr, value in pending.items()
+                          if not (attr in node._values and plugs.same_value(node._values[attr], value)))
+        if not writes: return 0
+        
+        with gen.transaction("flush"):
+            for node, attr, value in writes:
+                plugs.set_value(f"{node.shape}.{attr}", value)
+        # the next read asks Maya: it may store the value in another shape or type than was given
+        for node, attr, _ in writes: node._values.pop(attr, None)
+        return len(writes)
+    
+    
+    def _read(self, attr: str) -> Any:
+        if attr in self._pending: return self._pending[attr]
+        if attr in self._values:  return self._values[attr]
+        
+        path = f"{self.shape}.{attr}"
+        if attr not in self._plugs:
+            self._plugs[attr] = plugs.resolve_plugs([path])[0]
+        value = plugs.get_value(path, self._plugs[attr])
+        if self._watch(): self._values[attr] = value
+        return value
+    
+    
+    def _write(self, attr: str, value: Any) -> None:
+        if self._batch_depth:
+            self._pending[attr] = value
+            return
+        plugs.set_value(f"{self.shape}.{attr}", value)
+        self._values.pop(attr, None) # re-read lazily, in the shape `getAttr` gives
+    
+    
+    def _watch(self) -> bool:
+        "Register the callbacks that invalidate the cache; `False` when values cannot be cached"
+        if self._callback_ids: return True
+        if om is None: return False
+        
+        try:
+            mobject = om.MSelectionList().add(self.shape).getDependNode(0)
+        except RuntimeError:
+            return False
+        
+        ref = weakref.ref(self) # the callbacks must not keep the node alive
+        def on_plug(plug: "om.MPlug") -> None:
+            if (node := ref()) is None: return
+            while True: # `colorR` dirty means `color` is dirty too
+                node._values.pop(plug.partialName(useLongNames=True), None)
+                if not plug.isChild: break
+                plug = plug.parent()
+        
+        self._callback_ids = [
+            om.MNodeMessage.addNodeDirtyPlugCallback(mobject, lambda mobject, plug, *args: on_plug(plug)),
+            om.MNodeMessage.addAttributeChangedCallback(mobject, lambda message, plug, *args: on_plug(plug)),
+            om.MNodeMessage.addNodeAboutToDeleteCallback(mobject, lambda *args: (node := ref()) and node.close()),
+        ]
+        return True
+    
+    
+    # =============================
+    # Bulk attributes
+    # =============================
+    @classmethod
+    def _plug_paths(cls, 
+        nodes:      Sequence[Union["MayaNode", str]], 
+        attributes: Sequence[str]
+    ) -> List[str]:
+        "`shape.attr` for every node/attribute pair, row-major"
+        shapes = [node.shape if isinstance(node, MayaNode) else node for node in nodes]
+        attrs  = [cls._ATTRIBUTE_ALIASES.get(attr, attr) for attr in attributes]
+        return [f"{shape}.{attr}" for shape in shapes for attr in attrs]
+    
+    
+    @classmethod
+    def get_many(cls, 
+        nodes:      Sequence[Union["MayaNode", str]], 
+        attributes: Sequence[str]
+    ) -> List[Dict[str, Any]]:
+        '''
+        Read several attributes from many nodes. Plugs are resolved once and
+        read through OpenMaya; `cmds.getAttr` is only used as a fallback.
+        
+        Params:
+        -------
+        - `nodes`:      node instances or shape names
+        - `attributes`: property names (e.g. `"has_depthOfField"`) or raw attribute names
+        
+        Returns:
+        --------
+        - One `{attribute: value}` dict per node, in the order given.
+        
+        Examples:
+        ---------
+        >>> AiLight.get_many(cmds.ls(type="aiAreaLight"), ["intensity", "exposure"])
+        [{'intensity': 1.0, 'exposure': 0.0}, ...]
+        '''
+        paths  = cls._plug_paths(nodes, attributes)
+        values = [plugs.get_value(path, plug) for path, plug in zip(paths, plugs.resolve_plugs(paths))]
+        
+        n = len(attributes)
+        return [dict(zip(attributes, values[i*n:(i+1)*n])) for i in range(len(nodes))]
+    
+    
+    @classmethod
+    def set_many(cls, 
+        nodes:          Sequence[Union["MayaNode", str]], 
+        values:         Union[Dict[str, Any], Sequence[Dict[str, Any]]],
+        only_changed:   bool = True,
+    ) -> int:
+        '''
+        Write attributes on many nodes inside a single undo chunk.
+        
+        Params:
+        -------
+        - `nodes`:          node instances or shape names
+        - `values`:         one `{attribute: value}` dict applied to every node, or one dict per node
+        - `only_changed`:   compare against the current value (read through the plug) 
+                            and skip writes that would not change anything
+        
+        Returns:
+        --------
+        - Number of `setAttr` calls issued.
+        
+        Examples:
+        ---------
+        >>> AiLight.set_many(lights, {"exposure": 2.0, "normalize": False})
+        >>> Camera.set_many(cams, [{"fStop": 2.8}, {"fStop": 5.6}])
+        '''
+        if isinstance(values, dict): values = [values] * len(nodes)
+        if len(values) != len(nodes):
+            raise ValueError("Expected one value dict per node: {} nodes, {} dicts".format(len(nodes), len(values)))
+        
+        writes: List[Tuple[str, Any]] = []
+        for node, node_values in zip(nodes, values):
+            paths = cls._plug_paths([node], list(node_values))
+            writes.extend(zip(paths, node_values.values()))
+        
+        if only_changed:
+            resolved = plugs.resolve_plugs([path for path, _ in writes])
+            writes   = [(path, value) for (path, value), plug in zip(writes, resolved)
+                        if not plugs.same_value(plugs.get_value(path, plug), value)]
+        
+        if writes:
+            with gen.transaction("set_many"):
+                for path, value in writes: plugs.set_value(path, value)
+        return len(writes)
\ No newline at end of file
@@ -0,0 +1,116 @@
+""" =================================================================
+| plugs.py -- Python/MayaMedic/nodes/plugs.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+Resolve `node.attr` strings to OpenMaya 2.0 plugs once and read them
+without going through the command layer. Anything the plug reader does
+not understand falls back to `cmds.getAttr`.
+"""
+
+import math
+from typing import *
+
+import maya.cmds as cmds
+try:
+    import maya.api.OpenMaya as om
+except ImportError: # outside of a Maya session
+    om = None
+
+
+
+def resolve_plugs(paths: Sequence[str]) -> List[Optional["om.MPlug"]]:
+    '''
+    Resolve plug paths in one pass.
+
+    Returns:
+    --------
+    - `List` of `MPlug`, with `None` for paths that could not be resolved
+      (or for every path when OpenMaya is unavailable).
+    '''
+    if om is None: return [None] * len(paths)
+
+    plugs = []
+    selection = om.MSelectionList()
+    for path in paths:
+        try:
+            selection.clear()
+            selection.add(path)
+            plugs.append(selection.getPlug(0))
+        except (RuntimeError, TypeError):
+            plugs.append(None)
+    return plugs
+
+
+def read_plug(plug: "om.MPlug") -> Any:
+    '''
+    Read a plug the same way `cmds.getAttr` would return it.
+    Compound plugs come back as `[(x, y, z)]`.
+
+    Raises:
+    -------
+    - `TypeError`: the attribute type is not handled here.
+    '''
+    if plug.isCompound:
+        return [tuple(read_plug(plug.child(i)) for i in range(plug.numChildren()))]
+
+    attr = plug.attribute()
+    if attr.hasFn(om.MFn.kNumericAttribute):
+        ntype = om.MFnNumericAttribute(attr).numericType()
+        if ntype == om.MFnNumericData.kBoolean:
+            return plug.asBool()
+        if ntype in (om.MFnNumericData.kByte, om.MFnNumericData.kChar, om.MFnNumericData.kShort,
+                     om.MFnNumericData.kInt, om.MFnNumericData.kInt64):
+            return plug.asInt()
+        if ntype in (om.MFnNumericData.kFloat, om.MFnNumericData.kDouble):
+            return plug.asDouble()
+
+    elif attr.hasFn(om.MFn.kEnumAttribute):
+        return plug.asShort()
+
+    elif attr.hasFn(om.MFn.kUnitAttribute):
+        utype = om.MFnUnitAttribute(attr).unitType()
+        if utype == om.MFnUnitAttribute.kDistance:
+            return plug.asMDistance().asUnits(om.MDistance.uiUnit())
+        if utype == om.MFnUnitAttribute.kAngle:
+            return plug.asMAngle().asUnits(om.MAngle.uiUnit())
+        if utype == om.MFnUnitAttribute.kTime:
+            return plug.asMTime().asUnits(om.MTime.uiUnit())
+
+    raise TypeError("Unsupported plug type: {}".format(plug.name()))
+
+
+def get_value(path: str, plug: Optional["om.MPlug"]=None) -> Any:
+    "Read through the plug when possible, `cmds.getAttr` otherwise"
+    if plug is not None:
+        try:                return read_plug(plug)
+        except TypeError:   pass
+    return cmds.getAttr(path)
+
+
+def set_value(path: str, value: Any) -> None:
+    "`cmds.setAttr` that accepts whatever `get_value` returned"
+    if isinstance(value, list) and len(value) == 1 and isinstance(value[0], tuple):
+        value = value[0]
+
+    if   isinstance(value, str):            cmds.setAttr(path, value, type="string")
+    elif isinstance(value, (tuple, list)):  cmds.setAttr(path, *value)
+    else:                                   cmds.setAttr(path, value)
+
+
+def same_value(a: Any, b: Any, rel_tol: float=1e-6) -> bool:
+    '''
+    Compare two attribute values. Float attributes are stored in single
+    precision, so an exact comparison would report false changes.
+    '''
+    if isinstance(a, list) and len(a) == 1 and isinstance(a[0], tuple): a = a[0]
+    if isinstance(b, list) and len(b) == 1 and isinstance(b[0], tuple): b = b[0]
+
+    if isinstance(a, (tuple, list)) and isinstance(b, (tuple, list)):
+        return len(a) == len(b) and all(same_value(x, y, rel_tol) for x, y in zip(a, b))
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return math.isclose(a, b, rel_tol=rel_tol, abs_tol=1e-9)
+    return a == b
@@ -0,0 +1,286 @@
+""" =================================================================
+| batch.py -- Python/MayaMedic/utility/batch.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+Apply MayaMedic fix-ups to many scene files in parallel.
+
+Every scene is opened in its own fresh interpreter (`mayapy` running
+`maya.standalone`), at most `--workers` at a time. A worker that fails,
+crashes or times out is retried; each scene gets a JSON log.
+
+    mayapy -m utility.batch shots/*.ma --op units=cm --op arnold --op exposure --workers 8
+    python -m utility.batch shots.txt  --op units=cm --backend stub      # no Maya, nothing saved
+
+`shots.txt` lists one scene per line. Operations run in the order given:
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import *
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKENDS = ("maya", "stub")
+
+
+
+# =========================================================================
+# Operations (run inside the worker)
+# =========================================================================
+def _op_units(unit: str | None = None) -> str:
+    import utility.configuration as configuration
+    configuration.set_scene_units(unit or "cm")
+    return unit or "cm"
+
+
+def _op_arnold(_: str | None = None) -> str:
+    import nodes.arnold as arnold
+    arnold.setRendererToArnold()
+    return "arnold"
+
+
+def _op_exposure(_: str | None = None) -> int:
+    '''
+    Fold every Arnold light's exposure into its intensity
+    (`intensity * 2 ** exposure`, exposure 0): same brightness, comparable values
+    '''
+    from nodes.arnold import AiLight
+    shapes = [shape for lights, _ in AiLight.getAllAiLights().values() for shape in lights]
+    values = AiLight.get_many(shapes, ["intensity", "exposure"])
+    return AiLight.set_many(shapes, [
+        {"intensity": v["intensity"] * 2 ** v["exposure"], "exposure": 0.0} for v in values
+    ])
+
+
+OPERATIONS: Dict[str, Tuple[Callable[[str | None], Any], str]] = {
+    "units":    (_op_units,    "scene linear unit, `units=cm` (default cm)"),
+    "arnold":   (_op_arnold,   "set the renderer to Arnold"),
+    "exposure": (_op_exposure, "fold light exposure into intensity"),
+}
+"name -> (function taking the optional `name=argument`, help)"
+__doc__ += "".join(f"\n    {name:<10}{text}" for name, (_, text) in OPERATIONS.items()) + "\n"
+
+
+def parse_operation(spec: str) -> Tuple[str, str | None]:
+    "`'units=cm'` -> `('units', 'cm')`"
+    name, _, arg = spec.partition("=")
+    if name not in OPERATIONS:
+        raise ValueError("Unknown operation: {}, available: {}".format(name, ", ".join(OPERATIONS)))
+    return name, arg or None
+
+
+
+# =========================================================================
+# Worker
+# =========================================================================
+def _start_backend(backend: str) -> Any:
+    if backend == "stub":
+        import headless
+        headless.install(force=True)
+    else:
+        import maya.standalone
+        maya.standalone.initialize(name="python")
+    import maya.cmds as cmds
+    cmds.loadPlugin("mtoa", quiet=True)
+    return cmds
+
+
+def run_scene(scene: str, operations: Sequence[Tuple[str, str | None]], backend: str = "maya", save: bool = True) -> Dict[str, Any]:
+    '''
+    Open `scene`, run `operations` in order, save. Meant to run in a fresh
+    interpreter: see `run_batch`.
+
+    Returns:
+    --------
+    - the scene log: status, and per operation its result and duration
+    '''
+    log: Dict[str, Any] = {"scene": scene, "backend": backend, "status": "failed", "operations": []}
+    start = time.perf_counter()
+    try:
+        cmds = _start_backend(backend)
+        cmds.file(scene, open=True, force=True)
+        for name, arg in operations:
+            op_start = time.perf_counter()
+            result = OPERATIONS[name][0](arg)
+            log["operations"].append({"name": name, "arg": arg, "result": result,
+                                      "seconds": round(time.perf_counter() - op_start, 4)})
+        if save: cmds.file(save=True, force=True)
+        log["status"] = "ok"
+    except Exception as e:
+        log["error"] = f"{type(e).__name__}: {e}"
+    log["seconds"] = round(time.perf_counter() - start, 4)
+    return log
+
+
+def _worker_main(args: argparse.Namespace) -> int:
+    log = run_scene(args.worker, [parse_operation(op) for op in args.op], args.backend, save=not args.no_save)
+    print(json.dumps(log))
+    return 0 if log["status"] == "ok" else 1
+
+
+
+# =========================================================================
+# Pool
+# =========================================================================
+def log_path(log_dir: str, scene: str, root: str) -> str:
+    '''
+    One log per scene, named after its path relative to `root`, folders
+    joined by `__`: `root/seq010/anim/scene.ma` -> `seq010__anim__scene.ma.json`
+    '''
+    relative = os.path.relpath(os.path.abspath(scene), root)
+    return os.path.join(log_dir, relative.replace(os.sep, "__") + ".json")
+
+
+def common_root(scenes: Sequence[str]) -> str:
+    "Deepest folder holding every scene"
+    return os.path.commonpath([os.path.dirname(os.path.abspath(scene)) for scene in scenes]) if scenes else os.getcwd()
+
+
+def _run_attempts(scene: str, command: List[str], retries: int, timeout: float | None) -> Dict[str, Any]:
+    attempts: List[Dict[str, Any]] = []
+    for attempt in range(1, retries + 2):
+        try:
+            done = subprocess.run(command + ["--worker", scene], cwd=ROOT, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            attempts.append({"attempt": attempt, "error": f"timed out after {timeout}s"})
+            continue
+
+        lines = done.stdout.strip().splitlines()
+        try:
+            log = json.loads(lines[-1]) if lines else None
+        except json.JSONDecodeError:
+            log = None
+        if log is not None and done.returncode == 0:
+            log["attempts"] = attempts + [{"attempt": attempt, "returncode": 0}]
+            return log
+        attempts.append({
+            "attempt":      attempt,
+            "returncode":   done.returncode,
+            "error":        (log or {}).get("error") or done.stderr.strip()[-2000:] or "worker died without a log",
+        })
+
+    return {"scene": scene, "status": "failed", "error": attempts[-1]["error"], "attempts": attempts}
+
+
+def run_batch(
+    scenes:     Sequence[str],
+    operations: Sequence[str],
+    log_dir:    str,
+    workers:    int = max(1, (os.cpu_count() or 2) // 2),
+    retries:    int = 1,
+    timeout:    float | None = None,
+    backend:    str = "maya",
+    python:     str = sys.executable,
+    save:       bool = True,
+    verbose:    bool = True,
+) -> List[Dict[str, Any]]:
+    '''
+    Run `operations` (`"units=cm"`, `"arnold"`, ...) over `scenes`, one
+    fresh interpreter per scene and at most `workers` at once.
+
+    Params:
+    -------
+    - `retries`:    extra attempts for a scene whose worker failed, crashed or timed out
+    - `timeout`:    seconds before a worker is killed, `None` to wait forever
+    - `python`:     interpreter for the workers, `mayapy` for the `maya` backend
+    - `backend`:    `"maya"` (`maya.standalone`) or `"stub"` (the `headless` stand-in)
+
+    Returns:
+    --------
+    - one log per scene, in the order of `scenes`; also written to `log_dir`,
+      see `log_path`
+
+    Examples:
+    ---------
+    >>> run_batch(glob.glob("shots/*.ma"), ["units=cm", "arnold"], "logs", workers=8,
+    ...           python="C:/Program Files/Autodesk/Maya2024/bin/mayapy.exe")
+    '''
+    for spec in operations: parse_operation(spec) # fail before starting anything
+    if backend not in BACKENDS:
+        raise ValueError("Backend must be one of {}: {}".format(BACKENDS, backend))
+    os.makedirs(log_dir, exist_ok=True)
+
+    command = [python, "-m", "utility.batch", "--backend", backend] + \
+              [arg for spec in operations for arg in ("--op", spec)] + ([] if save else ["--no-save"])
+    logs: Dict[str, Dict[str, Any]] = {}
+    root  = common_root(scenes)
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool: # threads only wait on the worker processes
+        futures = {pool.submit(_run_attempts, scene, command, retries, timeout): scene for scene in scenes}
+        for future in as_completed(futures):
+            scene = futures[future]
+            logs[scene] = log = future.result()
+            with open(log_path(log_dir, scene, root), "w", encoding="utf-8") as f:
+                json.dump(log, f, indent=2)
+            if verbose:
+                print(f"[{log['status'].upper():<6}] {scene} ({len(log['attempts'])} attempt(s))"
+                      + (f": {log['error']}" if log["status"] != "ok" else ""))
+
+    ordered = [logs[scene] for scene in scenes]
+    summary = {
+        "operations":   list(operations),
+        "backend":      backend,
+        "workers":      workers,
+        "seconds":      round(time.perf_counter() - start, 3),
+        "ok":           [log["scene"] for log in ordered if log["status"] == "ok"],
+        "failed":       [log["scene"] for log in ordered if log["status"] != "ok"],
+    }
+    with open(os.path.join(log_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    if verbose:
+        print(f"{len(summary['ok'])} ok, {len(summary['failed'])} failed in {summary['seconds']}s, logs in {log_dir}")
+    return ordered
+
+
+
+def read_scene_list(items: Sequence[str]) -> List[str]:
+    "Scene paths from the command line; a `.txt` argument is a list of scenes, one per line"
+    scenes = []
+    for item in items:
+        if item.endswith(".txt"):
+            with open(item, encoding="utf-8") as f:
+                scenes.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+        else:
+            scenes.append(item)
+    return list(dict.fromkeys(os.path.abspath(scene) for scene in scenes))
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenes", nargs="*", help="scene files, or .txt files listing them")
+    parser.add_argument("--op", action="append", default=[], help="operation, repeatable: units=cm, arnold, exposure")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--retries", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per scene")
+    parser.add_argument("--backend", choices=BACKENDS, default="maya")
+    parser.add_argument("--python",  default=sys.executable, help="interpreter for the workers (mayapy)")
+    parser.add_argument("--log-dir", default="batch_logs")
+    parser.add_argument("--no-save", action="store_true", help="run the operations but do not save the scenes")
+    parser.add_argument("--worker",  default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker: return _worker_main(args)
+    if not args.op:     parser.error("give at least one --op")
+    if not args.scenes: parser.error("give at least one scene")
+    try:
+        for spec in args.op: parse_operation(spec)
+    except ValueError as e:
+        parser.error(str(e))
+
+    logs = run_batch(read_scene_list(args.scenes), args.op, args.log_dir, args.workers, args.retries,
+                     args.timeout, args.backend, args.python, save=not args.no_save)
+    return 0 if all(log["status"] == "ok" for log in logs) else 1
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
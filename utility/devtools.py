@@ -0,0 +1,110 @@
+""" =================================================================
+| devtools.py -- Python/MayaMedic/utility/devtools.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+Development vs. production import mode.
+
+MayaMedic modules never reload each other at import time. In production
+(the default) nothing is ever reloaded. While developing, set the
+environment variable `MAYAMEDIC_MODE=dev` (or call `set_mode("dev")`) and
+use `reload_all()` to reload every loaded MayaMedic module in dependency
+order, e.g. from a shelf button.
+"""
+
+import ast
+import importlib
+import importlib.util
+import os
+import sys
+from graphlib import TopologicalSorter
+from typing import *
+
+PACKAGES = ("nodes", "components", "utility", "interface")
+"top level packages of MayaMedic"
+MODES = ("dev", "prod")
+
+# kept when this module is reloaded by hand, so `set_mode` survives it
+_mode = globals().get("_mode") or os.environ.get("MAYAMEDIC_MODE", "prod").lower()
+if _mode not in MODES:
+    raise ValueError("MAYAMEDIC_MODE must be one of {}: {}".format(MODES, _mode))
+
+
+
+def set_mode(mode: str) -> None:
+    global _mode
+    if mode not in MODES:
+        raise ValueError("Mode must be one of {}: {}".format(MODES, mode))
+    _mode = mode
+
+def get_mode() -> str:
+    return _mode
+
+def is_dev() -> bool:
+    return _mode == "dev"
+
+
+
+def loaded_modules() -> Dict[str, Any]:
+    "Every MayaMedic module currently in `sys.modules`"
+    return {name: module for name, module in list(sys.modules.items())
+            if module is not None and name.split(".")[0] in PACKAGES}
+
+
+def dependencies(name: str, module: Any, loaded: Collection[str]) -> Set[str]:
+    "Loaded MayaMedic modules `module` imports, read from its source"
+    path = getattr(module, "__file__", None)
+    if not path or not path.endswith(".py"): return set()
+
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+
+    package = name if path.endswith("__init__.py") else name.rpartition(".")[0]
+    found = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            found.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = importlib.util.resolve_name("." * node.level + (node.module or ""), package) if node.level else node.module
+            for alias in node.names:
+                found.add(f"{base}.{alias.name}" if f"{base}.{alias.name}" in loaded else base)
+
+    # a module never waits for its own package (the package imports it)
+    return {dep for dep in found if dep in loaded and dep != name and not name.startswith(dep + ".")}
+
+
+def dependency_order() -> List[str]:
+    "Loaded MayaMedic modules, each one after everything it imports"
+    loaded = loaded_modules()
+    graph  = {name: dependencies(name, module, loaded) for name, module in loaded.items()}
+    return list(TopologicalSorter(graph).static_order())
+
+
+def reload_all(verbose=False) -> List[str]:
+    '''
+    Reload every loaded MayaMedic module in dependency order, so a module is
+    always reloaded after the modules it takes names from. This module is
+    left alone: it holds the mode and is running the reload.
+
+    Returns:
+    --------
+    - the reloaded module names, in order
+
+    Examples:
+    ---------
+    >>> import utility.devtools as dev
+    >>> dev.reload_all(verbose=True)
+    '''
+    order = [name for name in dependency_order() if name != __name__]
+    for name in order:
+        importlib.reload(sys.modules[name])
+        if verbose: print(f"[RELOADED] {name}")
+    return order
+
+
+def reload_if_dev() -> List[str]:
+    "`reload_all` in dev mode, nothing in production. Call it from tool entry points"
+    return reload_all() if is_dev() else []
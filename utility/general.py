@@ -9,6 +9,9 @@
 Visit: https://help.autodesk.com/view/MAYAUL/2024/ENU/?guid=__CommandsPython_index_html
 """
 
+import functools
+from typing import *
+
 import maya.cmds as cmds
 
 
@@ -57,4 +60,101 @@ def objExists(name_path: str) -> bool:
     >>> objExists("|topLevelParent|...|parent|objectName")
     >>> objExists("name-*")
     """
-    return cmds.objExists(name_path)
\ No newline at end of file
+    return cmds.objExists(name_path)
+
+class Transaction:
+    """
+    One undo step for everything issued inside, usable as a context manager
+    or a decorator. Build it with `transaction`.
+
+    Transactions nest: only the outermost one opens an undo chunk, and an
+    inner one only suspends what is not suspended already.
+    """
+    _depth = 0
+    "transactions currently open"
+    _refresh_suspended = False
+
+    def __init__(self, name: str | None = None, suspend_undo: bool = False, suspend_refresh: bool = False) -> None:
+        self.name            = name
+        self.suspend_undo    = suspend_undo
+        self.suspend_refresh = suspend_refresh
+        self._opened_chunk   = False
+        self._undo_was_on    = False
+        self._refresh_owner  = False
+
+    def __enter__(self) -> "Transaction":
+        if Transaction._depth == 0:
+            cmds.undoInfo(openChunk=True, chunkName=self.name or "MayaMedic")
+            self._opened_chunk = True
+        Transaction._depth += 1 # only once the chunk is open: `__exit__` undoes both
+
+        try:
+            if self.suspend_undo and cmds.undoInfo(query=True, state=True):
+                cmds.undoInfo(stateWithoutFlush=False)
+                self._undo_was_on = True
+            if self.suspend_refresh and not Transaction._refresh_suspended:
+                cmds.refresh(suspend=True)
+                Transaction._refresh_suspended = self._refresh_owner = True
+        except BaseException:
+            self.__exit__() # a failed `with` never calls it: restore what was changed, close the chunk
+            raise
+        return self
+
+    def __exit__(self, *exc) -> None:
+        try:
+            if self._refresh_owner:
+                cmds.refresh(suspend=False)
+                Transaction._refresh_suspended = self._refresh_owner = False
+            if self._undo_was_on:
+                cmds.undoInfo(stateWithoutFlush=True)
+                self._undo_was_on = False
+        finally:
+            Transaction._depth -= 1
+            if self._opened_chunk:
+                self._opened_chunk = False
+                cmds.undoInfo(closeChunk=True)
+
+    def __call__(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def transacted(*args, **kwargs):
+            # a fresh transaction per call, so recursive and concurrent calls do not share state
+            with Transaction(self.name or func.__qualname__, self.suspend_undo, self.suspend_refresh):
+                return func(*args, **kwargs)
+        return transacted
+
+
+def transaction(
+    name:               Union[str, Callable, None] = None,
+    suspend_undo:       bool = False,
+    suspend_refresh:    bool = False,
+) -> Union[Transaction, Callable]:
+    """
+    Group every command issued inside into one undo step
+
+    Params:
+    -------
+    - `name`:            undo chunk name, defaults to the decorated function's name
+    - `suspend_undo`:    turn the undo queue off inside (`undoInfo -swf`); the work
+                         cannot be undone, use it for big batches on scenes you can reload
+    - `suspend_refresh`: stop viewport redraws inside (`refresh -suspend`)
+
+    Examples:
+    ---------
+    >>> with transaction("setLights"):
+    ...     cmds.setAttr("aiAreaLightShape1.intensity", 2)
+    ...     cmds.setAttr("aiAreaLightShape2.intensity", 2)
+
+    >>> @transaction
+    ... def build_rig(): ...
+
+    >>> @transaction("import controllers", suspend_refresh=True)
+    ... def import_all(): ...
+    """
+    if callable(name): # bare `@transaction`
+        return Transaction(name.__qualname__)(name)
+    return Transaction(name, suspend_undo, suspend_refresh)
+
+
+def undo_chunk(chunk_name: str = "MayaMedic") -> Transaction:
+    "Same as `transaction(chunk_name)`"
+    return Transaction(chunk_name)
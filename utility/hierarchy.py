@@ -0,0 +1,227 @@
+""" =================================================================
+| hierarchy.py -- Python/MayaMedic/utility/hierarchy.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+from typing import *
+
+import maya.cmds as cmds
+try:
+    import maya.api.OpenMaya as om
+except ImportError: # outside of a Maya session
+    om = None
+
+
+
+class HierarchyIndex:
+    '''
+    Snapshot of the DAG built from a single `cmds.ls(dag=True, long=True)`.
+
+    Every lookup (parent, children, depth, ancestors, subtree) is answered
+    from dictionaries, without going back to the command layer. With
+    `live=True` the snapshot patches itself on DAG child added / removed
+    and rename events; otherwise call `add`, `remove`, `reparent`, `rename`
+    or `rebuild` yourself.
+
+    Instanced nodes have one entry per DAG path.
+
+    Examples:
+    ---------
+    >>> hierarchy = HierarchyIndex()
+    >>> hierarchy.parent("aiAreaLightShape1")
+    '|aiAreaLight1'
+    >>> list(hierarchy.iter_subtree("|rig"))
+    ['|rig', '|rig|spine', '|rig|spine|chest', ...]
+    '''
+    def __init__(self, live: bool = False) -> None:
+        self.version = 0
+
+        self._parent:   Dict[str, str | None]   = {}
+        self._children: Dict[str, List[str]]    = {}
+        self._by_leaf:  Dict[str, Set[str]]     = {}
+        "leaf name -> full paths, to resolve short and partial names"
+        self._roots:    List[str]               = []
+        self._callback_ids: List[int]           = []
+
+        self.rebuild()
+        if live: self._register_callbacks()
+
+    def __del__(self):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    def __contains__(self, name: str) -> bool:
+        try:                            self.resolve(name)
+        except (KeyError, ValueError):  return False
+        return True
+
+
+    # =============================
+    # lookups
+    # =============================
+    def resolve(self, name: str) -> str:
+        '''
+        Full path of a full, partial or short name.
+
+        Raises:
+        -------
+        - `KeyError`:   nothing matches
+        - `ValueError`: the name is ambiguous
+        '''
+        if name in self._parent: return name
+
+        leaf = name.rsplit("|", 1)[-1]
+        matches = [path for path in self._by_leaf.get(leaf, ()) if path.endswith("|" + name.lstrip("|"))]
+        if not matches:
+            raise KeyError("Object does not exist in the hierarchy: {}".format(name))
+        if len(matches) > 1:
+            raise ValueError("More than one object matches name: {}".format(name))
+        return matches[0]
+
+    def parent(self, name: str) -> str | None:
+        return self._parent[self.resolve(name)]
+
+    def children(self, name: str) -> List[str]:
+        return list(self._children[self.resolve(name)])
+
+    def roots(self) -> List[str]:
+        return list(self._roots)
+
+    def depth(self, name: str) -> int:
+        "0 for nodes under the world"
+        return self.resolve(name).count("|") - 1
+
+    def ancestors(self, name: str) -> List[str]:
+        "Closest first, up to the root"
+        parts = self.resolve(name).split("|")[1:-1]
+        return ["|" + "|".join(parts[:i]) for i in range(len(parts), 0, -1)]
+
+    def iter_subtree(self, name: str, include_root: bool = True) -> Iterator[str]:
+        "Depth first, in outliner order"
+        root  = self.resolve(name)
+        stack = [root] if include_root else list(reversed(self._children[root]))
+        while stack:
+            path = stack.pop()
+            yield path
+            stack.extend(reversed(self._children[path]))
+
+
+    # =============================
+    # patching
+    # =============================
+    def rebuild(self) -> None:
+        "Rescan the whole DAG with one command"
+        self._parent, self._children, self._by_leaf, self._roots = {}, {}, {}, []
+        for path in cmds.ls(dag=True, long=True) or []:
+            self._insert(path)
+        self.version += 1
+
+    def add(self, path: str) -> None:
+        "Add a new node (its parent must already be indexed)"
+        if path not in self._parent:
+            self._insert(path)
+            self.version += 1
+
+    def remove(self, name: str) -> None:
+        "Remove a node and everything under it"
+        path = self.resolve(name)
+        for node in reversed(list(self.iter_subtree(path))):
+            self._discard(node)
+        self.version += 1
+
+    def reparent(self, name: str, new_parent: str | None) -> str:
+        "Move a subtree under `new_parent` (`None` for the world), returns the new path"
+        path  = self.resolve(name)
+        dest  = (self.resolve(new_parent) if new_parent else "") + "|" + path.rsplit("|", 1)[-1]
+        self._move(path, dest)
+        return dest
+
+    def rename(self, name: str, new_name: str) -> str:
+        "Rename a node, the paths of its whole subtree follow. Returns the new path"
+        path = self.resolve(name)
+        dest = path.rsplit("|", 1)[0] + "|" + new_name
+        self._move(path, dest)
+        return dest
+
+    def close(self) -> None:
+        "Stop following scene events"
+        if om is not None and self._callback_ids:
+            om.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+
+
+    # =============================
+    # private
+    # =============================
+    def _insert(self, path: str) -> None:
+        parent = path.rsplit("|", 1)[0] or None
+        self._parent[path]   = parent
+        self._children[path] = []
+        self._by_leaf.setdefault(path.rsplit("|", 1)[-1], set()).add(path)
+        if parent is None:                  self._roots.append(path)
+        elif parent in self._children:      self._children[parent].append(path)
+
+    def _discard(self, path: str) -> None:
+        parent = self._parent.pop(path)
+        del self._children[path]
+        self._by_leaf[path.rsplit("|", 1)[-1]].discard(path)
+        siblings = self._roots if parent is None else self._children.get(parent, [])
+        if path in siblings: siblings.remove(path)
+
+    def _move(self, path: str, dest: str) -> None:
+        parent   = self._parent[path]
+        siblings = self._roots if parent is None else self._children[parent]
+        position = siblings.index(path)
+
+        subtree = list(self.iter_subtree(path))
+        for node in reversed(subtree):
+            self._discard(node)
+        for node in subtree:
+            self._insert(dest + node[len(path):])
+
+        if self._parent[dest] == parent: # renamed in place, keep the outliner order
+            siblings.insert(position, siblings.pop())
+        self.version += 1
+
+
+    # =============================
+    # callbacks
+    # =============================
+    def _register_callbacks(self) -> None:
+        if om is None: return
+
+        self._callback_ids = [
+            om.MDagMessage.addAllDagChangesCallback(self._on_dag_changed),
+            om.MNodeMessage.addNameChangedCallback(om.MObject(), self._on_renamed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, lambda *args: self.rebuild()),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew,  lambda *args: self.rebuild()),
+        ]
+
+    def _on_dag_changed(self, message: int, child: "om.MDagPath", parent: "om.MDagPath", *args) -> None:
+        parent_path = parent.fullPathName() if parent.length() else ""
+        child_path  = parent_path + "|" + child.partialPathName().rsplit("|", 1)[-1]
+
+        if message == om.MDagMessage.kChildAdded and child_path not in self._parent:
+            self.add(child_path)
+            iterator = om.MItDag()
+            iterator.reset(child, om.MItDag.kDepthFirst)
+            iterator.next() # the child itself is already in
+            while not iterator.isDone():
+                self.add(iterator.fullPathName())
+                iterator.next()
+
+        elif message == om.MDagMessage.kChildRemoved and child_path in self._parent:
+            self.remove(child_path)
+
+    def _on_renamed(self, mobject: "om.MObject", previous_name: str, *args) -> None:
+        if not previous_name or not mobject.hasFn(om.MFn.kDagNode): return
+
+        for dag_path in om.MDagPath.getAllPathsTo(mobject):
+            new_path = dag_path.fullPathName()
+            old_path = new_path.rsplit("|", 1)[0] + "|" + previous_name
+            if old_path in self._parent and old_path != new_path:
+                self._move(old_path, new_path)
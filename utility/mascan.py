@@ -0,0 +1,350 @@
+""" =================================================================
+| mascan.py -- Python/MayaMedic/utility/mascan.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+Streaming scanner for Maya ASCII (`.ma`) scenes, for pre-flight checks
+without opening the scene in Maya.
+
+The file is read in `CHUNK` byte blocks and statement ends are found with
+`bytes.find`, so memory is bounded by `CHUNK` plus `MAX_STATEMENT` however
+big the scene is or however long its lines are. Statements are parsed one
+at a time; long ones (mesh data, huge arrays) are skipped without being
+kept. Referenced scenes are not followed.
+
+Nothing here imports Maya or the `nodes` package: the node types the
+scanner looks for are copied below.
+
+    python -m utility.mascan shot010.ma [shot020.ma ...] [--json]
+"""
+
+import json
+import re
+import sys
+import time
+from collections import Counter
+from typing import *
+
+HEADER = b"//Maya ASCII"
+CHUNK  = 1 << 20
+MAX_STATEMENT = 64 * 1024
+"statements longer than this (bytes) are reported truncated, their tail is not kept"
+
+_TOKEN = re.compile(rb'"((?:[^"\\]|\\.)*)"|([^\s;]+)')
+_FLAG  = re.compile(r"^-[a-zA-Z]")
+_BOOLEAN_FLAGS: Dict[str, Set[str]] = {
+    "createNode":   {"-s", "-ss", "-shared", "-skipSelect"},
+    "setAttr":      {"-av", "-ca", "-alteredValue", "-caching"},
+    "connectAttr":  {"-na", "-f", "-nextAvailable", "-force"},
+    "select":       {"-ne", "-r", "-add", "-noExpand", "-replace"},
+}
+"flags that take no value, per command; every other flag takes the next token"
+_TRUE = {"yes", "on", "true", "1"}
+
+NODE_TYPES: Tuple[str, ...] = (
+    "transform", "joint",
+    "mesh", "nurbsCurve", "nurbsSurface", "subdiv",
+    "directionalLight", "pointLight", "spotLight", "areaLight", "volumeLight", "ambientLight",
+    "aiAreaLight", "aiMeshLight", "aiPhotometricLight", "aiSkyDomeLight", "aiLightPortal", "aiPhysicalSky",
+    "aiStandardSurface",
+    "camera",
+    "lambert", "blinn", "phong", "surfaceShader",
+    "particle", "fluidShape", "nCloth", "nRigid",
+)
+"the members of `nodes.node.NodeNames`, reported by `MaScan.known_types`"
+LIGHT_SECTIONS: Dict[str, Tuple[str, Tuple[float, float, float]]] = {
+    "Area Lights":         ("aiAreaLight",         (0.84, 0.41, 0.33)),
+    "Mesh Lights":         ("aiMeshLight",         (0.73, 0.49, 0.95)),
+    "Photometric Lights":  ("aiPhotometricLight",  (0.26, 0.52, 0.96)),
+    "Sky Dome Lights":     ("aiSkyDomeLight",      (0.86, 0.27, 0.22)),
+}
+"`nodes.arnold.ARNOLD_LIGHT_SECTIONS`: section label -> (node type, section color)"
+
+_LIGHT_TYPES    = {light_type for light_type, _ in LIGHT_SECTIONS.values()}
+_DOF_ATTRIBUTES = {".dof", ".depthOfField"}
+
+
+
+class Statement(NamedTuple):
+    command:    str
+    args:       List[str]
+    "positional arguments, quotes removed"
+    flags:      Dict[str, str | bool]
+    node:       str | None
+    "node the statement applies to: the one created / selected, or the current one for `setAttr`"
+    line:       int
+    truncated:  bool
+    "the statement was longer than `max_length`, `args` only cover its beginning"
+
+
+
+def iter_statements(
+    path:       str,
+    commands:   Collection[str] | None = None,
+    max_length: int = MAX_STATEMENT,
+) -> Iterator[Statement]:
+    '''
+    Every MEL statement of a `.ma` file, in order.
+
+    Params:
+    -------
+    - `commands`:   only yield these commands (e.g. `{"createNode", "setAttr"}`);
+                    the others are skipped without being parsed
+    - `max_length`: longest statement kept in memory, in bytes
+
+    Raises:
+    -------
+    - `ValueError`: not a Maya ASCII file
+
+    Examples:
+    ---------
+    >>> for statement in iter_statements("shot010.ma", {"createNode"}):
+    ...     print(statement.args[0], statement.flags.get("-n"))
+    '''
+    wanted = None if commands is None else {c.encode() for c in commands}
+    always = {b"createNode", b"select"} # they move the current node
+    current: str | None = None
+
+    with open(path, "rb") as f:
+        if not f.readline().startswith(HEADER):
+            raise ValueError("Not a Maya ASCII file: {}".format(path))
+
+        for line, command, text, truncated in _raw_statements(f, lambda c: wanted is None or c in wanted or c in always, max_length):
+            statement = _parse(text, current, line, truncated)
+            if statement.command == "createNode":
+                current = statement.flags.get("-n") or statement.flags.get("-name") or current
+                statement = statement._replace(node=current)
+            elif statement.command == "select" and (statement.flags.get("-ne") or statement.flags.get("-noExpand")) and statement.args:
+                current = statement.args[0].lstrip(":")
+                statement = statement._replace(node=current)
+            if wanted is None or command in wanted:
+                yield statement
+
+
+def _raw_statements(f: BinaryIO, keep: Callable[[bytes], bool], max_length: int) -> Iterator[Tuple[int, bytes, bytes, bool]]:
+    '''
+    `(line, command, text, truncated)` of every statement `keep` accepts.
+
+    The file is read in chunks and statement ends are found with `bytes.find`
+    (a `;` outside double quotes), so skipped statements, however long, are
+    never looked at byte by byte in Python nor kept in memory.
+    '''
+    buf, pos, line, eof = f.read(CHUNK), 0, 2, False
+
+    while True:
+        # ~~~~~~~~ next statement start, skipping blank and comment lines ~~~~~~~~
+        while True:
+            newline = buf.find(b"\n", pos)
+            if newline < 0 and not eof:
+                chunk = f.read(CHUNK)
+                buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+                continue
+            end_of_line = newline if newline >= 0 else len(buf)
+            head = buf[pos:end_of_line].lstrip()
+            if head and not head.startswith(b"//"):
+                pos = end_of_line - len(head)
+                break
+            if newline < 0: return
+            pos, line = newline + 1, line + 1
+
+        command = head.split(None, 1)[0].rstrip(b";")
+        kept    = keep(command)
+        parts:  List[bytes] = []
+        room    = max_length
+        start = i = pos
+        first_line, in_quote = line, False
+
+        # ~~~~~~~~ its end: the first `;` outside quotes ~~~~~~~~
+        while True:
+            if in_quote:
+                quote = buf.find(b'"', i)
+                while quote > 0 and _escaped(buf, quote):
+                    quote = buf.find(b'"', quote + 1)
+                if quote >= 0:
+                    in_quote, i = False, quote + 1
+                    continue
+            else:
+                semicolon, quote = buf.find(b";", i), buf.find(b'"', i)
+                if quote >= 0 and (semicolon < 0 or quote < semicolon):
+                    in_quote, i = True, quote + 1
+                    continue
+                if semicolon >= 0:
+                    end = semicolon + 1
+                    break
+
+            if eof: # unterminated last statement
+                end = len(buf)
+                break
+            # carry the last byte and any backslash run before it, `_escaped` counts the whole run
+            cut = len(buf) - 1
+            while cut > start and buf[cut - 1] == 92:
+                cut -= 1
+            if kept and room > 0:
+                parts.append(buf[start:min(cut, start + room)])
+                room -= len(parts[-1])
+            line += buf.count(b"\n", start, cut)
+            chunk = f.read(CHUNK)
+            buf, start, i, eof = buf[cut:] + chunk, 0, len(buf) - cut, not chunk
+
+        truncated = end - start > room
+        if kept and room > 0:
+            parts.append(buf[start:min(end, start + room)])
+        line += buf.count(b"\n", start, end)
+        pos = end
+        if kept: yield first_line, command, b"".join(parts), truncated or room <= 0
+
+
+def _escaped(buf: bytes, quote: int) -> bool:
+    "Whether the quote at `quote` is escaped: it follows an odd number of backslashes"
+    start = quote
+    while start > 0 and buf[start - 1] == 92: # 92 is a backslash
+        start -= 1
+    return (quote - start) % 2 == 1
+
+
+def _parse(text: bytes, node: str | None, line: int, truncated: bool) -> Statement:
+    tokens = [(match[1].decode("utf-8", "replace"), True) if match[1] is not None
+              else (match[2].decode("utf-8", "replace"), False)
+              for match in _TOKEN.finditer(text)]
+    command  = tokens[0][0] if tokens else ""
+    booleans = _BOOLEAN_FLAGS.get(command, set())
+
+    args:  List[str] = []
+    flags: Dict[str, str | bool] = {}
+    i = 1
+    while i < len(tokens):
+        token, quoted = tokens[i]
+        if not quoted and _FLAG.match(token):
+            has_value = token not in booleans and i + 1 < len(tokens) and \
+                        (tokens[i + 1][1] or not _FLAG.match(tokens[i + 1][0]))
+            flags[token] = tokens[i + 1][0] if has_value else True
+            i += 2 if has_value else 1
+        else:
+            args.append(token)
+            i += 1
+    return Statement(command, args, flags, node, line, truncated)
+
+
+
+class MaScan:
+    '''
+    What a scene contains, from one pass over its `.ma` file.
+
+    Examples:
+    ---------
+    >>> summary = scan("shot010.ma")
+    >>> summary.light_sections()         # same layout as `AiLight.getAllAiLights()`
+    {'Area Lights': (['keyLightShape', 'rimLightShape'], (0.84, 0.41, 0.33))}
+    >>> summary.cameras_with_dof()
+    ['shotCamShape']
+    '''
+    def __init__(self, path: str) -> None:
+        self.path       = path
+        self.node_types = Counter()
+        "node type -> count, every type"
+        self.lights:    Dict[str, List[Tuple[str, str | None]]] = {t: [] for t in _LIGHT_TYPES}
+        "Arnold light type -> (shape, parent) in file order"
+        self.cameras:   Dict[str, bool] = {}
+        "camera shape -> depth of field on"
+        self.statements = 0
+        self.truncated  = 0
+        self.bytes      = 0
+        self.seconds    = 0.0
+
+
+    @property
+    def meshes(self) -> int:
+        return self.node_types["mesh"]
+
+    def known_types(self) -> Dict[str, int]:
+        "Counts of the node types listed in `NODE_TYPES`"
+        return {name: self.node_types[name] for name in NODE_TYPES if self.node_types[name]}
+
+    def cameras_with_dof(self) -> List[str]:
+        return [camera for camera, dof in self.cameras.items() if dof]
+
+    def light_sections(self) -> Dict[str, Tuple[List[str], Tuple[float, float, float]]]:
+        '''
+        Arnold lights grouped like `AiLight.getAllAiLights`: sections without
+        lights are left out, a shape name used twice is given as `parent|shape`.
+        '''
+        names = Counter(shape for lights in self.lights.values() for shape, _ in lights)
+        sections = {}
+        for section, (light_type, color) in LIGHT_SECTIONS.items():
+            lights = [f"{parent}|{shape}" if names[shape] > 1 and parent else shape
+                      for shape, parent in self.lights[light_type]]
+            if lights: sections[section] = lights, color
+        return sections
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path":             self.path,
+            "lights":           {section: lights for section, (lights, _) in self.light_sections().items()},
+            "light_count":      sum(len(lights) for lights in self.lights.values()),
+            "cameras":          len(self.cameras),
+            "cameras_with_dof": self.cameras_with_dof(),
+            "meshes":           self.meshes,
+            "node_types":       self.known_types(),
+            "statements":       self.statements,
+            "bytes":            self.bytes,
+            "seconds":          round(self.seconds, 3),
+        }
+
+
+
+def scan(path: str) -> MaScan:
+    "Read a `.ma` file once and summarize it"
+    summary = MaScan(path)
+    start   = time.perf_counter()
+
+    # only the head of a statement matters here, mesh data is never parsed
+    for statement in iter_statements(path, {"createNode", "setAttr"}, max_length=512):
+        summary.statements += 1
+        summary.truncated  += statement.truncated
+
+        if statement.command == "createNode":
+            if not statement.args: continue
+            node_type = statement.args[0]
+            name      = statement.flags.get("-n") or statement.flags.get("-name")
+            summary.node_types[node_type] += 1
+            if node_type in _LIGHT_TYPES and name:
+                summary.lights[node_type].append((name, statement.flags.get("-p") or statement.flags.get("-parent")))
+            elif node_type == "camera" and name:
+                summary.cameras[name] = False
+
+        elif statement.node in summary.cameras and statement.args[:1] and statement.args[0] in _DOF_ATTRIBUTES:
+            summary.cameras[statement.node] = len(statement.args) > 1 and statement.args[1].lower() in _TRUE
+
+    with open(path, "rb") as f:
+        summary.bytes = f.seek(0, 2)
+    summary.seconds = time.perf_counter() - start
+    return summary
+
+
+
+def main(argv: Sequence[str] | None = None) -> List[MaScan]:
+    import argparse
+    parser = argparse.ArgumentParser(description="Summarize Maya ASCII scenes without Maya")
+    parser.add_argument("scenes", nargs="+")
+    parser.add_argument("--json", action="store_true", help="one JSON object per scene")
+    args = parser.parse_args(argv)
+
+    results = [scan(path) for path in args.scenes]
+    for summary in results:
+        if args.json:
+            print(json.dumps(summary.to_dict()))
+            continue
+        print(f"{summary.path}  ({summary.bytes / 2**20:.1f} MB in {summary.seconds:.2f}s)")
+        for section, (lights, _) in summary.light_sections().items():
+            print(f"  {section:<20}{len(lights):>8}")
+        print(f"  {'Cameras':<20}{len(summary.cameras):>8}  ({len(summary.cameras_with_dof())} with depth of field)")
+        print(f"  {'Meshes':<20}{summary.meshes:>8}")
+    return results
+
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
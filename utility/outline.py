@@ -9,14 +9,12 @@ functions related to selection and outline
 | Copyright © 2023 jacktogon. All rights reserved.
 ================================================================= """
 
-
-import importlib
 from typing import *
 
 import maya.cmds as cmds
 
-from components import polygon
-importlib.reload(polygon)
+import components # loads its submodules on first use
+from utility import hierarchy
 
 
 class SelectionNotFoundError(Exception):
@@ -38,12 +36,20 @@ def selected_objects() -> List[str]:
 # =============================
 # selection
 # =============================
-def get_parents(obj_path: str) -> str | None:
+def get_parents(obj_path: str, index: hierarchy.HierarchyIndex | None = None) -> str | None:
     '''
+    Params:
+    -------
+    - `index`: answer from a `HierarchyIndex` snapshot instead of `listRelatives`.
+               Use it when walking up hierarchies in loops.
+    
     Examples:
     ---------
     >>> otl.get_parents('aiAreaLight1')
+    >>> index = HierarchyIndex()
+    >>> [otl.get_parents(obj, index) for obj in objects]
     '''
+    if index is not None: return index.parent(obj_path)
     parent = cmds.listRelatives(obj_path, parent=True, fullPath=True)
     return parent[0] if parent else None
 
@@ -81,24 +87,47 @@ def get_selected_components(component_type: str, selection_mask: int) -> List[st
         raise SelectionNotFoundError(component_type)
     return selected
 
-def selected_polygons() -> List[polygon.Polygons]:
+def get_selected_component_sets(component_type: str, kind: str) -> List["components.ComponentSet"]:
+    "Same as `get_selected_components`, but compact: one range-encoded set per mesh"
+    selected = components.ComponentSet.from_selection(kind)
+    if not selected:
+        raise SelectionNotFoundError(component_type)
+    return selected
+
+def selected_polygons() -> List["components.Polygons"]:
     "Get selected polygons"
     # return get_selected_components("polygons", 12)
-    return [polygon.Polygons(s) for s in get_selected_components("polygons", 12)]
+    return [components.Polygons(s) for s in get_selected_components("polygons", 12)]
 
-def selected_vertices() -> List[str]:
-    "Get selected polygon vertices"
+def selected_vertices(compact=False) -> List[str] | List["components.ComponentSet"]:
+    "Get selected polygon vertices (`compact`: one `ComponentSet` per mesh)"
+    if compact: return get_selected_component_sets("vertices", "vtx")
     return get_selected_components("vertices", 31)
 
-def selected_edges() -> List[str]:
-    "Get selected polygon edges"
+def selected_edges(compact=False) -> List[str] | List["components.ComponentSet"]:
+    "Get selected polygon edges (`compact`: one `ComponentSet` per mesh)"
+    if compact: return get_selected_component_sets("edges", "e")
     return get_selected_components("edges", 32)
 
-def selected_faces():
-    "Get selected polygon faces"
-    return [polygon.Face(s) for s in get_selected_components("faces", 34)]
+def selected_faces(compact=False) -> List["components.Face"] | List["components.ComponentSet"]:
+    '''
+    Get selected polygon faces
+    
+    Params:
+    -------
+    - `compact`: return one `ComponentSet` per mesh instead of one `Face` per
+                 face. Nothing is flattened, use it on heavy selections.
+    
+    Examples:
+    ---------
+    >>> for faces in otl.selected_faces(compact=True):
+    ...     faces.delete()
+    '''
+    if compact: return get_selected_component_sets("faces", "f")
+    return [components.Face(s) for s in get_selected_components("faces", 34)]
 
-def selected_UVs() -> List[str]:
-    "Get selected polygon UVs"
+def selected_UVs(compact=False) -> List[str] | List["components.ComponentSet"]:
+    "Get selected polygon UVs (`compact`: one `ComponentSet` per mesh)"
+    if compact: return get_selected_component_sets("UVs", "map")
     return get_selected_components("UVs", 35)
 
@@ -6,8 +6,17 @@
 ================================================================= """
 
 from typing import *
+from functools import lru_cache
 import math
 
+try:
+    import numpy as np
+except ImportError: # only the *_array functions need it
+    np = None
+
+KELVIN_RANGE = (1000, 40000)
+"kelvin values are clamped to this range"
+
 def normalize_rgb(*args) -> Tuple[float, float, float]:
     """
     Normalize RGB values to a tuple of floats ranging from 0 to 1.
@@ -70,4 +79,91 @@ def kelvin_to_rgb(kelvin: float) -> Tuple[float, float, float]:
         blue = 138.5177312231 * math.log(blue) - 305.0447927307
         blue = min(max(blue, 0), 255)
 
-    return normalize_rgb(int(red), int(green), int(blue))
\ No newline at end of file
+    return normalize_rgb(int(red), int(green), int(blue))
+
+
+# =============================
+# Arrays
+# =============================
+def normalize_rgb_array(rgb: "np.ndarray") -> "np.ndarray":
+    """
+    Array version of `normalize_rgb` for many colors at once.
+
+    Params:
+    -------
+    - `rgb`: (N, 3) array, either integers in 0-255 or floats already in 0-1
+
+    Returns:
+    --------
+    - (N, 3) float array ranging from 0 to 1.
+
+    Examples:
+    ---------
+    >>> normalize_rgb_array(np.array([[255, 0, 0], [0, 128, 255]]))
+    array([[1.        , 0.        , 0.        ],
+           [0.        , 0.50196078, 1.        ]])
+    """
+    rgb = np.asarray(rgb)
+    if rgb.ndim != 2 or rgb.shape[1] != 3:
+        raise ValueError("RGB array must have shape (N, 3), got {}".format(rgb.shape))
+
+    if np.issubdtype(rgb.dtype, np.integer):
+        if rgb.size and (rgb.min() < 0 or rgb.max() > 255):
+            raise ValueError("RGB values must be in the range of 0 to 255.")
+        return rgb / 255.0
+
+    if rgb.size and (rgb.min() < 0 or rgb.max() > 1):
+        raise ValueError("Float RGB values must be in the range of 0 to 1.")
+    return rgb.astype(float)
+
+
+def kelvin_to_rgb_array(kelvin: "np.ndarray", use_lut: bool = False) -> "np.ndarray":
+    """
+    Array version of `kelvin_to_rgb`: same formula, evaluated with masks
+    instead of branches.
+
+    Params:
+    -------
+    - `kelvin`:  temperatures of any shape, flattened to N values
+    - `use_lut`: look the values up in `kelvin_lut()` instead. Inputs are
+                 rounded to the nearest kelvin, so results only match
+                 `kelvin_to_rgb` exactly for whole kelvin values.
+
+    Returns:
+    --------
+    - (N, 3) float array of normalized RGB values.
+
+    Examples:
+    ---------
+    >>> kelvin_to_rgb_array(np.array([1900, 6500, 12000]))
+    """
+    kelvin = np.asarray(kelvin, dtype=float).ravel()
+
+    if use_lut:
+        lut = kelvin_lut()
+        return lut[np.clip(np.rint(kelvin), *KELVIN_RANGE).astype(np.intp) - KELVIN_RANGE[0]]
+
+    temp = np.clip(kelvin / 100.0, 10.0, 400.0)
+    warm = temp <= 66.0
+    # the unused side of each mask is evaluated on a safe input and discarded
+    cool = np.maximum(temp - 60.0, 1.0)
+
+    red   = np.where(warm, 255.0, np.clip(329.698727446 * cool ** -0.1332047592, 0, 255))
+    green = np.where(warm, 99.4708025861 * np.log(temp) - 161.1195681661, 288.1221695283 * cool ** -0.0755148492)
+    green = np.clip(green, 0, 255)
+    blue  = np.clip(138.5177312231 * np.log(np.maximum(temp - 10.0, 1.0)) - 305.0447927307, 0, 255)
+    blue  = np.where(temp >= 66.0, 255.0, np.where(temp <= 19.0, 0.0, blue))
+
+    # `kelvin_to_rgb` truncates to int before normalizing
+    return np.floor(np.stack((red, green, blue), axis=1)) / 255.0
+
+
+@lru_cache(maxsize=1)
+def kelvin_lut() -> "np.ndarray":
+    """
+    Normalized RGB for every whole kelvin in `KELVIN_RANGE`, computed once.
+    Row `i` holds the color of `KELVIN_RANGE[0] + i` kelvin.
+    """
+    lut = kelvin_to_rgb_array(np.arange(KELVIN_RANGE[0], KELVIN_RANGE[1] + 1))
+    lut.flags.writeable = False
+    return lut
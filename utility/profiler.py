@@ -0,0 +1,234 @@
+""" =================================================================
+| profiler.py -- Python/MayaMedic/utility/profiler.py
+|
+| Created by Jack on 12/06, 2023
+| Copyright © 2023 jacktogon. All rights reserved.
+================================================================= """
+
+"""
+Opt-in profiler for the `maya.cmds` calls made by MayaMedic.
+
+While a `CommandProfiler` runs, the `cmds` global of every loaded MayaMedic
+module is swapped for a recording proxy, and so is the `_class_command` of
+their UI classes (`cmds.columnLayout`, ... taken at import time); stopping
+it puts the real commands back. Nothing is wrapped while no profiler runs, so the cost when disabled
+is zero.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import *
+
+import maya.cmds as cmds
+
+import utility.devtools as devtools
+
+
+
+class CommandStat(NamedTuple):
+    command:    str
+    caller:     str
+    "`module.function` that issued the command, `''` when grouped by command"
+    calls:      int
+    seconds:    float
+
+    @property
+    def mean(self) -> float:
+        return self.seconds / self.calls if self.calls else 0.0
+
+
+
+class _ProfiledCmds:
+    "Stands in for `maya.cmds`: every function is timed and reported to the profiler"
+    def __init__(self, profiler: "CommandProfiler") -> None:
+        self._profiler = profiler
+        self._wrapped: Dict[str, Tuple[Any, Callable]] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        original = getattr(cmds, name)
+        if not callable(original): return original
+
+        cached = self._wrapped.get(name)
+        if cached is None or cached[0] is not original: # `cmds` was patched since, e.g. by `CommandCounter`
+            cached = self._wrapped[name] = (original, self._profiler._wrap(name, original))
+        return cached[1]
+
+
+
+class CommandProfiler:
+    '''
+    Record every `maya.cmds` call made by MayaMedic modules: call count and
+    wall time per command and per calling function, and optionally one
+    trace event per call for `chrome://tracing` / Perfetto.
+
+    Modules imported after `start` keep the real `cmds`: import the tool
+    before profiling it.
+
+    Examples:
+    ---------
+    >>> with CommandProfiler() as profiler:
+    ...     transform.create_colored_group("lights_grp", (1, 0.5, 0), *objects)
+    >>> print(profiler.report(limit=10))
+    >>> profiler.dump_trace("C:/temp/create_colored_group.json")
+    '''
+    def __init__(self, packages: Sequence[str] = devtools.PACKAGES, trace: bool = True, max_events: int = 1_000_000) -> None:
+        '''
+        Params:
+        -------
+        - `packages`:   top level packages whose modules are instrumented
+        - `trace`:      keep one event per call for `dump_trace`
+        - `max_events`: stop collecting trace events past this many calls
+        '''
+        self.packages   = tuple(packages)
+        self.trace      = trace
+        self.max_events = max_events
+
+        self.counts:    Dict[Tuple[str, str], int]   = defaultdict(int)
+        self.seconds:   Dict[Tuple[str, str], float] = defaultdict(float)
+        self.events:    List[Tuple[str, str, float, float, int]] = []
+        "(command, caller, start, duration, thread id)"
+        self.dropped    = 0
+
+        self._proxy     = _ProfiledCmds(self)
+        self._patched:  List[Any] = []
+        self._rebound:  List[Tuple[type, Any]] = []
+        "UI classes whose `_class_command` was swapped, with the original"
+        self._origin    = 0.0
+
+    def __enter__(self) -> "CommandProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+    # =============================
+    # functions
+    # =============================
+    @property
+    def running(self) -> bool:
+        return bool(self._patched or self._rebound)
+
+    def start(self) -> None:
+        if self.running: return
+        if not self._origin: self._origin = time.perf_counter()
+        for name, module in list(sys.modules.items()):
+            if module is None or name == __name__ or name.split(".")[0] not in self.packages: continue
+            if getattr(module, "cmds", None) is cmds:
+                module.cmds = self._proxy
+                self._patched.append(module)
+            self._rebind(name, module)
+
+    def stop(self) -> None:
+        for module in self._patched:
+            if module.__dict__.get("cmds") is self._proxy:
+                module.cmds = cmds
+        for cls, command in self._rebound:
+            cls._class_command = command
+        self._patched, self._rebound = [], []
+
+    def reset(self) -> None:
+        "Forget everything recorded so far"
+        self.counts.clear()
+        self.seconds.clear()
+        self.events.clear()
+        self.dropped = 0
+        self._origin = time.perf_counter()
+
+
+    def stats(self, sort: str = "seconds", by: str = "caller") -> List[CommandStat]:
+        '''
+        Params:
+        -------
+        - `sort`: `"seconds"`, `"calls"`, `"mean"`, `"command"` or `"caller"`
+        - `by`:   `"caller"` for one row per (command, caller), `"command"` for one row per command
+        '''
+        if by not in ("caller", "command"):
+            raise ValueError("by must be 'caller' or 'command': {}".format(by))
+        if sort not in CommandStat._fields + ("mean",):
+            raise ValueError("Cannot sort by: {}".format(sort))
+
+        counts, seconds = defaultdict(int), defaultdict(float)
+        for key, calls in self.counts.items():
+            group = key if by == "caller" else (key[0], "")
+            counts[group]  += calls
+            seconds[group] += self.seconds[key]
+
+        rows = [CommandStat(command, caller, counts[(command, caller)], seconds[(command, caller)])
+                for command, caller in counts]
+        return sorted(rows, key=lambda row: getattr(row, sort), reverse=sort not in ("command", "caller"))
+
+
+    def report(self, sort: str = "seconds", by: str = "caller", limit: int | None = 25) -> str:
+        "`stats` as a text table"
+        rows  = self.stats(sort, by)
+        total = sum(row.seconds for row in rows)
+        lines = [f"{'command':<24}{'caller':<48}{'calls':>9}{'total ms':>12}{'mean us':>11}{'%':>7}"]
+        for row in rows[:limit]:
+            share = row.seconds / total * 100 if total else 0.0
+            lines.append(f"{row.command:<24}{row.caller:<48}{row.calls:>9}{row.seconds * 1e3:>12.3f}{row.mean * 1e6:>11.1f}{share:>7.1f}")
+        if limit is not None and len(rows) > limit:
+            lines.append(f"... {len(rows) - limit} more rows")
+        lines.append(f"{len(rows)} rows, {sum(row.calls for row in rows)} calls, {total * 1e3:.3f} ms in cmds")
+        return "\n".join(lines)
+
+
+    def dump_trace(self, path: str) -> str:
+        "Write the calls as Chrome trace events (`chrome://tracing`, ui.perfetto.dev). Returns `path`"
+        pid = os.getpid()
+        events = [
+            {
+                "name": command, "cat": "cmds", "ph": "X", "pid": pid, "tid": tid,
+                "ts":   (start - self._origin) * 1e6, "dur": duration * 1e6,
+                "args": {"caller": caller},
+            }
+            for command, caller, start, duration, tid in self.events
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "otherData": {"dropped_events": self.dropped}}, f)
+        return path
+
+
+    # =============================
+    # private
+    # =============================
+    def _rebind(self, name: str, module: Any) -> None:
+        "Swap the `_class_command` of the classes defined in `module`, when it is a `cmds` command"
+        for cls in list(vars(module).values()):
+            if not isinstance(cls, type) or cls.__module__ != name: continue
+            command = cls.__dict__.get("_class_command")
+            if command is None or getattr(cmds, getattr(command, "__name__", ""), None) is not command: continue
+            self._rebound.append((cls, command))
+            # a plain function would bind as a method, the real commands do not
+            cls._class_command = staticmethod(getattr(self._proxy, command.__name__))
+
+
+    def _wrap(self, name: str, original: Callable) -> Callable:
+        counts, seconds, events = self.counts, self.seconds, self.events
+        clock, getframe, get_ident = time.perf_counter, sys._getframe, threading.get_ident
+
+        def profiled(*args, **kwargs):
+            frame  = getframe(1)
+            code   = frame.f_code
+            caller = f"{frame.f_globals.get('__name__', '?')}.{getattr(code, 'co_qualname', code.co_name)}"
+            start  = clock()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                key = (name, caller)
+                counts[key]  += 1
+                seconds[key] += elapsed
+                if self.trace:
+                    if len(events) < self.max_events: events.append((name, caller, start, elapsed, get_ident()))
+                    else:                             self.dropped += 1
+
+        profiled.__name__ = name
+        profiled.__doc__  = original.__doc__
+        return profiled
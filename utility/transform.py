@@ -11,9 +11,11 @@ from typing import *
 
 import maya.cmds as cmds
 
+import utility.general as gen
 from utility.parser import normalize_rgb
 from nodes.camera import Camera
 
+@gen.transaction
 def create_colored_group(
     group_name: str, 
     nRGB:       Tuple[float, float, float],
@@ -33,18 +35,58 @@ def create_colored_group(
     >>> create_colored_group("myGroup", (1, 0, 0), "cube1", "sphere1")
     'myGroup'
     """
+    nRGB = normalize_rgb(*nRGB)
+    
     # Create a new empty group
     group = cmds.group(em=True, name=group_name)
     
-    # Add objects to the group
+    # Add objects to the group, one command for all of them
     if objects:
-        for obj in objects: cmds.parent(obj, group)
-            
-    nRGB = normalize_rgb(*nRGB)
+        cmds.parent(list(objects), group)
     
     # Set the group color
     cmds.setAttr(group + ".useOutlinerColor", True)
     cmds.setAttr(group + ".outlinerColor",    nRGB[0], nRGB[1], nRGB[2])
     return group
 
+
+def create_colored_groups(
+    groups: Dict[str, Tuple[Tuple[float, float, float], Sequence[str]]]
+) -> Dict[str, str]:
+    """
+    Create many colored groups in one undo chunk
+    
+    Every color is validated before anything is created. Each group gets
+    its objects with a single `parent` call, and the outliner colors are
+    written after all groups exist.
+
+    Params:
+    -------
+    - `groups`: `{group_name: (nRGB, objects)}`
+
+    Returns:
+    --------
+    - `{group_name: created group}`, names can differ if already taken
+
+    Example:
+    --------
+    >>> create_colored_groups({
+    ...     "props_GRP":  ((0.30, 0.88, 0.71), props),
+    ...     "lights_GRP": ((1, 0.79, 0.23),    lights),
+    ... })
+    {'props_GRP': 'props_GRP', 'lights_GRP': 'lights_GRP'}
+    """
+    colors = {name: normalize_rgb(*nRGB) for name, (nRGB, _) in groups.items()}
+    
+    created = {}
+    with gen.transaction("create_colored_groups", suspend_refresh=True):
+        for name, (_, objects) in groups.items():
+            created[name] = group = cmds.group(em=True, name=name)
+            if objects: cmds.parent(list(objects), group)
+        
+        for name, group in created.items():
+            cmds.setAttr(group + ".useOutlinerColor", True)
+            cmds.setAttr(group + ".outlinerColor", *colors[name])
+    return created
+
     
\ No newline at end of file